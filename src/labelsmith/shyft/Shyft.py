@@ -1,6 +1,8 @@
 import multiprocessing
 import tkinter as tk
 import logging
+from labelsmith.shyft.core.data_manager import data_manager
+from labelsmith.shyft.gui.dialogs import unlock_data
 from labelsmith.shyft.gui.main_window import ShyftGUI
 from labelsmith.shyft.utils.system_utils import get_modifier_key, modkey_backspace, modkey_shift_backspace
 from labelsmith.shyft.core.nltk_manager import initialize_nltk
@@ -11,6 +13,14 @@ logger = configure_logging()
 
 def run_tkinter_app():
     root = tk.Tk()
+    if data_manager.locked:
+        # Encrypted storage: ask before building any window that shows shifts.
+        root.withdraw()
+        if not unlock_data(root):
+            logger.info("Unlock cancelled; quitting.")
+            root.destroy()
+            return
+        root.deiconify()
     app = ShyftGUI(root)
     modkey = get_modifier_key()
 
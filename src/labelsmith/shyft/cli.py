@@ -0,0 +1,262 @@
+# shyft/cli.py
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+from labelsmith.shyft.constants import APP_DATA_DIR, BACKUP_DIR, DATA_FILE_PATH, PARTITIONS_DIR
+from labelsmith.shyft.utils.log_config import configure_logging
+
+
+def _unlocked_data_manager():
+    """The shared DataManager, unlocked first if storage is encrypted; None if that fails."""
+    from labelsmith.shyft.core.data_manager import data_manager
+    from labelsmith.shyft.core.encrypted_storage import DecryptionError, prompt_passphrase
+
+    if data_manager.locked:
+        try:
+            data_manager.unlock(prompt_passphrase())
+        except DecryptionError as e:
+            print(f"Unlock failed: {e}", file=sys.stderr)
+            data_manager.close()
+            return None
+    return data_manager
+
+
+def cmd_migrate(args) -> int:
+    from labelsmith.shyft.core.migrations import migrate_file, migrate_partitions
+
+    reports = []
+    if args.path.exists():
+        reports.append(migrate_file(args.path, dry_run=args.dry_run, backup=not args.no_backup))
+    if args.partitions:
+        reports.extend(migrate_partitions(PARTITIONS_DIR, dry_run=args.dry_run))
+    if not reports:
+        print(f"No data found at {args.path}.")
+        return 1
+    for report in reports:
+        if report.changed:
+            print(report.format())
+        else:
+            print(f"{report.path}: already at the current schema ({report.records} records).")
+    return 0
+
+
+def cmd_import(args) -> int:
+    from labelsmith.shyft.core.bulk_import import import_shifts
+
+    data_manager = _unlocked_data_manager()
+    if data_manager is None:
+        return 1
+
+    try:
+        report = import_shifts(
+            args.file, data_manager, file_format=args.format, dry_run=args.dry_run, strict=args.strict
+        )
+    except (OSError, ValueError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        data_manager.close()
+    print(report.format())
+    if args.report is not None:
+        report.write_errors(args.report)
+        print(f"Error report written to {args.report}")
+    if args.strict and report.errors:
+        print("Nothing imported: --strict was given and some rows are invalid.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_export(args) -> int:
+    from labelsmith.shyft.core.export import export_shifts
+    from labelsmith.shyft.utils.file_utils import atomic_open
+
+    data_manager = _unlocked_data_manager()
+    if data_manager is None:
+        return 1
+
+    filters = {"start": args.start, "end": args.end, "model": args.model, "project": args.project}
+    try:
+        if args.output is None or str(args.output) == "-":
+            count = export_shifts(sys.stdout, data_manager, args.format, tasks=args.tasks, **filters)
+        else:
+            with atomic_open(args.output, "w", newline="") as out:
+                count = export_shifts(out, data_manager, args.format, tasks=args.tasks, **filters)
+    except OSError as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        data_manager.close()
+    print(f"Exported {count} rows.", file=sys.stderr)
+    return 0
+
+
+def cmd_backup(args) -> int:
+    from labelsmith.shyft.core.backup import BackupRepository
+
+    try:
+        report = BackupRepository(args.repo).backup(APP_DATA_DIR)
+    except OSError as e:
+        print(f"Backup failed: {e}", file=sys.stderr)
+        return 1
+    print(report.format())
+    return 0
+
+
+def cmd_snapshots(args) -> int:
+    from labelsmith.shyft.core.backup import BackupRepository
+
+    repository = BackupRepository(args.repo)
+    snapshot_ids = repository.snapshots()
+    if not snapshot_ids:
+        print(f"No snapshots in {args.repo}.")
+    for snapshot_id in snapshot_ids:
+        files = repository.load_snapshot(snapshot_id)["files"]
+        size = sum(entry["size"] for entry in files.values())
+        print(f"{snapshot_id}  {len(files)} files  {size} bytes")
+    return 0
+
+
+def cmd_restore(args) -> int:
+    from labelsmith.shyft.core.backup import BackupRepository
+
+    try:
+        snapshot_id = BackupRepository(args.repo).restore(args.when, args.target, snapshot_id=args.snapshot)
+    except (OSError, LookupError, ValueError) as e:
+        print(f"Restore failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Restored snapshot {snapshot_id} to {args.target}.")
+    return 0
+
+
+def cmd_verify(args) -> int:
+    from labelsmith.shyft.core.backup import BackupRepository
+
+    repository = BackupRepository(args.repo)
+    snapshot_ids = None
+    if not args.all:
+        latest = repository.find_snapshot()
+        snapshot_ids = [latest] if latest else []
+    report = repository.verify(snapshot_ids)
+    print(report.format())
+    return 0 if report.ok else 1
+
+
+def cmd_sync(args) -> int:
+    from labelsmith.shyft.core.sync import sync
+
+    data_manager = _unlocked_data_manager()
+    if data_manager is None:
+        return 1
+
+    try:
+        report = sync(args.share, data_manager, dry_run=args.dry_run)
+    except (OSError, ValueError) as e:
+        print(f"Sync failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        data_manager.close()
+    print(report.format())
+    return 0
+
+
+def cmd_audit(args) -> int:
+    data_manager = _unlocked_data_manager()
+    if data_manager is None:
+        return 1
+
+    try:
+        report = data_manager.audit_overlaps()
+    finally:
+        data_manager.close()
+    print(report.format())
+    return 1 if report.pairs else 0
+
+
+def cmd_check(args) -> int:
+    from labelsmith.shyft.core.integrity import verify_and_repair
+
+    data_manager = _unlocked_data_manager()
+    if data_manager is None:
+        return 1
+
+    try:
+        report = verify_and_repair(data_manager, repair=args.repair)
+    finally:
+        data_manager.close()
+    print(report.format())
+    return 1 if report.mismatches and not args.repair else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="shyft-cli", description="Shyft data maintenance commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser("migrate", help="Upgrade data files to the current schema.")
+    migrate.add_argument("--path", type=Path, default=DATA_FILE_PATH, help="Data file to migrate.")
+    migrate.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+    migrate.add_argument("--no-backup", action="store_true", help="Don't keep a copy of the original file.")
+    migrate.add_argument(
+        "--partitions", action="store_true", help="Also migrate the partitioned store's monthly files."
+    )
+    migrate.set_defaults(func=cmd_migrate)
+
+    bulk_import = subparsers.add_parser("import", help="Import shifts from a CSV or JSONL file.")
+    bulk_import.add_argument("file", type=Path, help="CSV (with a header row) or JSONL file of shifts.")
+    bulk_import.add_argument("--format", choices=("csv", "jsonl"), help="File format; inferred from the suffix.")
+    bulk_import.add_argument("--dry-run", action="store_true", help="Validate and report without importing.")
+    bulk_import.add_argument("--strict", action="store_true", help="Import nothing if any row is invalid.")
+    bulk_import.add_argument("--report", type=Path, help="Write the per-row error report to this CSV file.")
+    bulk_import.set_defaults(func=cmd_import)
+
+    export = subparsers.add_parser("export", help="Export shifts to CSV or JSONL.")
+    export.add_argument("--format", choices=("csv", "jsonl"), default="csv", help="Output format (default: csv).")
+    export.add_argument("--output", "-o", type=Path, help="File to write; stdout if omitted or '-'.")
+    export.add_argument("--start", help="Only shifts dated on or after YYYY-MM-DD.")
+    export.add_argument("--end", help="Only shifts dated on or before YYYY-MM-DD.")
+    export.add_argument("--project", help="Only shifts with this Project ID.")
+    export.add_argument("--model", help="Only shifts with this Model ID.")
+    export.add_argument("--tasks", action="store_true", help="Write one row per task duration.")
+    export.set_defaults(func=cmd_export)
+
+    backup = subparsers.add_parser("backup", help="Snapshot the data directory into the backup repository.")
+    backup.set_defaults(func=cmd_backup)
+
+    snapshots = subparsers.add_parser("snapshots", help="List backup snapshots.")
+    snapshots.set_defaults(func=cmd_snapshots)
+
+    restore = subparsers.add_parser("restore", help="Restore the data directory from a backup snapshot.")
+    restore.add_argument("when", nargs="?", help="Restore the newest snapshot at or before this ISO date/time.")
+    restore.add_argument("--snapshot", help="Restore this snapshot ID exactly.")
+    restore.add_argument("--target", type=Path, default=APP_DATA_DIR, help="Directory to restore into.")
+    restore.set_defaults(func=cmd_restore)
+
+    verify = subparsers.add_parser("verify", help="Check backup snapshots against their stored chunks.")
+    verify.add_argument("--all", action="store_true", help="Check every snapshot, not just the latest.")
+    verify.set_defaults(func=cmd_verify)
+
+    sync = subparsers.add_parser("sync", help="Exchange changed shifts and logs with a shared folder.")
+    sync.add_argument("share", type=Path, help="Shared directory, e.g. a mounted network folder.")
+    sync.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+    sync.set_defaults(func=cmd_sync)
+
+    audit = subparsers.add_parser("audit", help="Report shifts whose times overlap.")
+    audit.set_defaults(func=cmd_audit)
+
+    check = subparsers.add_parser("check", help="Verify Duration and Gross pay against In/Out and rate.")
+    check.add_argument("--repair", action="store_true", help="Overwrite mismatched fields with recomputed values.")
+    check.set_defaults(func=cmd_check)
+
+    for command in (backup, snapshots, restore, verify):
+        command.add_argument("--repo", type=Path, default=BACKUP_DIR, help="Backup repository directory.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_logging()
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
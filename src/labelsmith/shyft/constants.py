@@ -10,4 +10,16 @@ APP_AUTHOR = "kosmolebryce"
 APP_DATA_DIR = Path(appdirs.user_data_dir(APP_NAME, APP_AUTHOR), "Shyft")
 CONFIG_FILE = APP_DATA_DIR / "config.ini"
 DATA_FILE_PATH = APP_DATA_DIR / "data.json"
-LOGS_DIR = APP_DATA_DIR / "logs"
\ No newline at end of file
+JOURNAL_FILE_PATH = APP_DATA_DIR / "data.journal"
+SQLITE_DB_PATH = APP_DATA_DIR / "data.sqlite3"
+ENCRYPTED_DB_PATH = APP_DATA_DIR / "data.encrypted.sqlite3"
+PARTITIONS_DIR = APP_DATA_DIR / "partitions"
+LOCK_FILE_PATH = APP_DATA_DIR / "data.lock"
+GENERATION_FILE_PATH = APP_DATA_DIR / "data.generation"
+LOGS_DIR = APP_DATA_DIR / "logs"
+SYNC_STATE_DIR = APP_DATA_DIR / "sync"
+# Derived from the data; safe to delete.
+COLUMN_CACHE_DIR = APP_DATA_DIR / "columns"
+PLOT_CACHE_DIR = APP_DATA_DIR / "plots"
+# Kept beside APP_DATA_DIR, not in it, so backups never back up themselves.
+BACKUP_DIR = Path(appdirs.user_data_dir(APP_NAME, APP_AUTHOR), "Shyft Backups")
@@ -3,12 +3,44 @@ from . import (
     config_manager,
     data_manager,
     nltk_manager,
-    autologger
+    autologger,
+    storage,
+    sqlite_storage,
+    encrypted_storage,
+    indexes,
+    partitions,
+    shift,
+    migrations,
+    generation,
+    snapshot,
+    bulk_import,
+    export,
+    backup,
+    sync,
+    overlaps,
+    aggregates,
+    integrity
     )
 
 __all__ = [
     "config_manager",
     "data_manager",
     "nltk_manager",
-    "autologger"
+    "autologger",
+    "storage",
+    "sqlite_storage",
+    "encrypted_storage",
+    "indexes",
+    "partitions",
+    "shift",
+    "migrations",
+    "generation",
+    "snapshot",
+    "bulk_import",
+    "export",
+    "backup",
+    "sync",
+    "overlaps",
+    "aggregates",
+    "integrity"
     ]
\ No newline at end of file
@@ -0,0 +1,159 @@
+# shyft/core/aggregates.py
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (Date, Project ID, Model ID)
+CellKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class Totals:
+    """Shift count, seconds, cents and tasks for one group of shifts."""
+
+    __slots__ = ("shifts", "duration_s", "gross_pay_cents", "tasks")
+
+    def __init__(self, shifts: int = 0, duration_s: int = 0, gross_pay_cents: int = 0, tasks: int = 0):
+        self.shifts = shifts
+        self.duration_s = duration_s
+        self.gross_pay_cents = gross_pay_cents
+        self.tasks = tasks
+
+    @property
+    def hours(self) -> float:
+        return self.duration_s / 3600
+
+    @property
+    def gross_pay(self) -> float:
+        return self.gross_pay_cents / 100
+
+    def add(self, shift, sign: int = 1) -> None:
+        self.shifts += sign
+        self.duration_s += sign * (shift.duration_s or 0)
+        self.gross_pay_cents += sign * (shift.gross_pay_cents or 0)
+        self.tasks += sign * (shift.tasks_completed or 0)
+
+    def merge(self, other: "Totals") -> None:
+        self.shifts += other.shifts
+        self.duration_s += other.duration_s
+        self.gross_pay_cents += other.gross_pay_cents
+        self.tasks += other.tasks
+
+    def copy(self) -> "Totals":
+        return Totals(self.shifts, self.duration_s, self.gross_pay_cents, self.tasks)
+
+    def __repr__(self):
+        return (
+            f"Totals(shifts={self.shifts}, duration_s={self.duration_s}, "
+            f"gross_pay_cents={self.gross_pay_cents}, tasks={self.tasks})"
+        )
+
+
+@lru_cache(maxsize=8192)
+def iso_week(value: Optional[str]) -> str:
+    """Return the ISO week ("2024-W07") of a YYYY-MM-DD date, or "" if it doesn't parse."""
+    try:
+        year, week, _ = datetime.strptime(value, "%Y-%m-%d").isocalendar()
+    except (TypeError, ValueError):
+        return ""
+    return f"{year}-W{week:02d}"
+
+
+class AggregateCube:
+    """
+    Running totals per (Date, Project ID, Model ID), kept current by
+    DataManager like ShiftIndex. Each mutation touches one or two cells, and
+    the rollups below read the cells rather than the shifts, so the Totals
+    dialog costs O(days x projects x models) however long the history is.
+    All sums are integer seconds and cents, so they never drift.
+    """
+
+    def __init__(self):
+        self.cells: Dict[CellKey, Totals] = {}
+        self.total = Totals()
+
+    @staticmethod
+    def _key(shift) -> CellKey:
+        return (shift.date, shift.project_id, shift.model_id)
+
+    def _apply(self, shift, sign: int) -> None:
+        key = self._key(shift)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = Totals()
+        cell.add(shift, sign)
+        if cell.shifts == 0:
+            del self.cells[key]
+        self.total.add(shift, sign)
+
+    def reset(self, shifts) -> None:
+        self.cells = {}
+        self.total = Totals()
+        for shift in shifts.values():
+            self._apply(shift, 1)
+
+    def put(self, shift_id: str, old, new) -> None:
+        if old is not None:
+            self._apply(old, -1)
+        self._apply(new, 1)
+
+    def delete(self, shift_id: str, old) -> None:
+        self._apply(old, -1)
+
+    def cell_rows(self) -> List[list]:
+        """
+        The cells as JSON-friendly rows, [Date, Project ID, Model ID, shifts,
+        duration_s, gross_pay_cents, tasks], as the partition manifest stores them.
+        """
+        return [
+            [*key, cell.shifts, cell.duration_s, cell.gross_pay_cents, cell.tasks]
+            for key, cell in self.cells.items()
+        ]
+
+    def merged(self, rows: Iterable[list], summary: dict) -> "AggregateCube":
+        """
+        Return a copy of this cube with shifts that aren't in memory added.
+
+        Args:
+            rows (Iterable[list]): Their cells, in the `cell_rows` layout.
+            summary (dict): Their count, duration_s, gross_pay_cents and
+                tasks, added to the total.
+
+        Returns:
+            AggregateCube: A new cube; this one is left as it is.
+        """
+        cube = AggregateCube()
+        cube.cells = {key: cell.copy() for key, cell in self.cells.items()}
+        for date, project_id, model_id, *values in rows:
+            key = (date, project_id, model_id)
+            cell = cube.cells.get(key)
+            if cell is None:
+                cell = cube.cells[key] = Totals()
+            cell.merge(Totals(*values))
+        cube.total = self.total.copy()
+        cube.total.merge(
+            Totals(summary["count"], summary["duration_s"], summary["gross_pay_cents"], summary["tasks"])
+        )
+        return cube
+
+    def _rollup(self, group) -> Dict[str, Totals]:
+        groups: Dict[str, Totals] = {}
+        for key, cell in self.cells.items():
+            name = group(key)
+            totals = groups.get(name)
+            if totals is None:
+                totals = groups[name] = Totals()
+            totals.merge(cell)
+        return dict(sorted(groups.items(), key=lambda item: "" if item[0] is None else str(item[0])))
+
+    def by_project(self) -> Dict[str, Totals]:
+        return self._rollup(lambda key: key[1])
+
+    def by_model(self) -> Dict[str, Totals]:
+        return self._rollup(lambda key: key[2])
+
+    def by_day(self) -> Dict[str, Totals]:
+        return self._rollup(lambda key: key[0])
+
+    def by_week(self) -> Dict[str, Totals]:
+        """Totals per ISO week ("2024-W07"); unparseable dates group under ""."""
+        return self._rollup(lambda key: iso_week(key[0]))
@@ -0,0 +1,357 @@
+# shyft/core/backup.py
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from labelsmith.shyft.constants import APP_DATA_DIR, BACKUP_DIR, COLUMN_CACHE_DIR, GENERATION_FILE_PATH, LOCK_FILE_PATH, PLOT_CACHE_DIR
+from labelsmith.shyft.core.generation import WriteGuard
+from labelsmith.shyft.utils.file_lock import FileLock
+from labelsmith.shyft.utils.file_utils import atomic_open, atomic_write_json
+
+logger = logging.getLogger("labelsmith")
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_ID_FORMAT = "%Y%m%dT%H%M%S.%fZ"
+
+# Content-defined chunking: a chunk ends wherever the hash of the last
+# CHUNK_WINDOW bytes has its top CHUNK_MASK_BITS bits clear (about every
+# 8 KiB), so an edit only changes the chunks around it and the rest of the
+# file dedupes against earlier snapshots.
+CHUNK_WINDOW = 48
+CHUNK_MASK_BITS = 13
+MIN_CHUNK_SIZE = 2 * 1024
+MAX_CHUNK_SIZE = 64 * 1024
+_BLOCK_SIZE = 1024 * 1024
+_HASH_BASE = 0x9E3779B97F4A7C15
+_HASH_BASE_INVERSE = pow(_HASH_BASE, -1, 1 << 64)
+
+# Per-byte values for the window hash. Derived from sha256 rather than a
+# seeded RNG so chunk boundaries never change between numpy versions.
+_BYTE_VALUES = np.frombuffer(
+    b"".join(hashlib.sha256(bytes([i])).digest()[:8] for i in range(256)), dtype="<u8"
+).astype(np.uint64)
+
+# Coordination files that mean nothing once restored.
+EXCLUDED_NAMES = frozenset({LOCK_FILE_PATH.name, GENERATION_FILE_PATH.name})
+# Caches rebuilt from the data on demand.
+EXCLUDED_DIRS = frozenset({COLUMN_CACHE_DIR.name, PLOT_CACHE_DIR.name})
+
+
+def _cut_candidates(data: bytes) -> np.ndarray:
+    """Offsets just past every byte whose window hash matches the mask."""
+    shift = np.uint64(64 - CHUNK_MASK_BITS)
+    n = len(data)
+    found = []
+    # The window hash is the polynomial sum(v[j] * B**(e - j)) over the last
+    # CHUNK_WINDOW bytes, mod 2**64. Scaling each byte by B**-j turns it into
+    # a difference of two prefix sums, so a whole block hashes in a few numpy
+    # passes instead of a Python loop per byte. Blocks keep the arrays small.
+    for end in range(CHUNK_WINDOW - 1, n, _BLOCK_SIZE):
+        start = end - CHUNK_WINDOW + 1
+        stop = min(end + _BLOCK_SIZE, n)
+        count = stop - start
+        powers = np.full(count, _HASH_BASE, dtype=np.uint64)
+        powers[0] = 1
+        powers = np.cumprod(powers, dtype=np.uint64)
+        inverse_powers = np.full(count, _HASH_BASE_INVERSE, dtype=np.uint64)
+        inverse_powers[0] = 1
+        inverse_powers = np.cumprod(inverse_powers, dtype=np.uint64)
+        values = _BYTE_VALUES[np.frombuffer(data, dtype=np.uint8, count=count, offset=start)]
+        sums = np.concatenate(([np.uint64(0)], np.cumsum(values * inverse_powers, dtype=np.uint64)))
+        window = (sums[CHUNK_WINDOW:] - sums[:-CHUNK_WINDOW]) * powers[CHUNK_WINDOW - 1 :]
+        found.append(np.flatnonzero((window >> shift) == 0) + start + CHUNK_WINDOW)
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+def chunk_boundaries(data: bytes) -> List[int]:
+    """
+    Split `data` into content-defined chunks.
+
+    Returns:
+        List[int]: The end offset of each chunk; the last is len(data).
+    """
+    n = len(data)
+    if n <= MIN_CHUNK_SIZE:
+        return [n] if n else []
+    ends = []
+    start = 0
+    for cut in _cut_candidates(data).tolist():
+        while cut - start > MAX_CHUNK_SIZE:
+            start += MAX_CHUNK_SIZE
+            ends.append(start)
+        if cut - start >= MIN_CHUNK_SIZE:
+            ends.append(cut)
+            start = cut
+    while n - start > MAX_CHUNK_SIZE:
+        start += MAX_CHUNK_SIZE
+        ends.append(start)
+    if start < n:
+        ends.append(n)
+    return ends
+
+
+def parse_when(value) -> datetime:
+    """Parse an ISO date/time or snapshot ID; naive times are local time."""
+    if isinstance(value, datetime):
+        when = value
+    else:
+        try:
+            when = datetime.strptime(value, SNAPSHOT_ID_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            when = datetime.fromisoformat(value)
+    return when if when.tzinfo else when.astimezone()
+
+
+class BackupReport:
+    """Outcome of one backup run."""
+
+    def __init__(self, snapshot_id: str):
+        self.snapshot_id = snapshot_id
+        self.files = 0
+        self.changed_files = 0
+        self.bytes = 0
+        self.new_chunks = 0
+        self.reused_chunks = 0
+        self.stored_bytes = 0
+        self.elapsed = 0.0
+
+    def format(self) -> str:
+        return (
+            f"Snapshot {self.snapshot_id}: {self.files} files ({self.bytes} bytes), "
+            f"{self.changed_files} changed; {self.new_chunks} new chunks ({self.stored_bytes} bytes stored), "
+            f"{self.reused_chunks} reused; {self.elapsed * 1000:.0f} ms."
+        )
+
+
+class VerifyReport:
+    """Outcome of checking snapshots against the chunk store."""
+
+    def __init__(self):
+        self.snapshots = 0
+        self.chunks = 0
+        # (snapshot ID, file, message)
+        self.problems: List[tuple] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+    def format(self) -> str:
+        lines = [
+            f"Checked {self.snapshots} snapshots and {self.chunks} chunks: "
+            + ("OK." if self.ok else f"{len(self.problems)} problems.")
+        ]
+        for snapshot_id, name, message in self.problems:
+            lines.append(f"  {snapshot_id} {name}: {message}")
+        return "\n".join(lines)
+
+
+class BackupRepository:
+    """
+    Local, deduplicating snapshot store for the Shyft data directory.
+
+    Layout under `root`:
+        chunks/ab/abcd...  zlib-compressed chunk, named by the sha256 of its
+                           uncompressed content
+        snapshots/<id>.json  file list of one snapshot: size, mtime and the
+                             chunk digests of every file
+
+    Files whose size and mtime match the previous snapshot reuse its chunk
+    list without being read; changed files are re-chunked and only chunks
+    the store doesn't have yet are written.
+    """
+
+    def __init__(self, root: Path = BACKUP_DIR):
+        self.root = Path(root)
+        self.chunks_dir = self.root / "chunks"
+        self.snapshots_dir = self.root / "snapshots"
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def snapshots(self) -> List[str]:
+        """Return the snapshot IDs, oldest first."""
+        try:
+            return sorted(p.stem for p in self.snapshots_dir.glob("*.json"))
+        except FileNotFoundError:
+            return []
+
+    def load_snapshot(self, snapshot_id: str) -> dict:
+        with open(self.snapshots_dir / f"{snapshot_id}.json", "r") as f:
+            return json.load(f)
+
+    def find_snapshot(self, when=None) -> Optional[str]:
+        """Return the newest snapshot taken at or before `when` (default: now)."""
+        ids = self.snapshots()
+        if when is None:
+            return ids[-1] if ids else None
+        when = parse_when(when)
+        matches = [s for s in ids if parse_when(s) <= when]
+        return matches[-1] if matches else None
+
+    def _iter_source(self, source: Path):
+        for dirpath, dirnames, filenames in os.walk(source):
+            if Path(dirpath) == Path(source):
+                dirnames[:] = [name for name in dirnames if name not in EXCLUDED_DIRS]
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name in EXCLUDED_NAMES or (name.startswith(".") and name.endswith(".tmp")):
+                    continue
+                path = Path(dirpath, name)
+                yield path.relative_to(source).as_posix(), path
+
+    def backup(self, source: Path = APP_DATA_DIR) -> BackupReport:
+        """
+        Take a snapshot of `source`.
+
+        Reads happen under the shared data lock, so a concurrent save can't
+        leave a half-written data file in the snapshot.
+
+        Returns:
+            BackupReport: What was stored.
+        """
+        started = time.perf_counter()
+        source = Path(source)
+        snapshot_id = datetime.now(timezone.utc).strftime(SNAPSHOT_ID_FORMAT)
+        report = BackupReport(snapshot_id)
+        previous_id = self.find_snapshot()
+        previous = self.load_snapshot(previous_id)["files"] if previous_id else {}
+        known = {digest for entry in previous.values() for digest in entry["chunks"]}
+        files: Dict[str, dict] = {}
+
+        with FileLock(source / LOCK_FILE_PATH.name, shared=True):
+            for name, path in self._iter_source(source):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                report.files += 1
+                report.bytes += st.st_size
+                old = previous.get(name)
+                if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                    files[name] = old
+                    report.reused_chunks += len(old["chunks"])
+                    continue
+                report.changed_files += 1
+                data = path.read_bytes()
+                chunks = []
+                start = 0
+                for end in chunk_boundaries(data):
+                    chunk = data[start:end]
+                    start = end
+                    digest = hashlib.sha256(chunk).hexdigest()
+                    chunks.append(digest)
+                    if digest in known or self._chunk_path(digest).exists():
+                        report.reused_chunks += 1
+                    else:
+                        report.stored_bytes += self._write_chunk(digest, chunk)
+                        report.new_chunks += 1
+                    known.add(digest)
+                files[name] = {
+                    "size": len(data),
+                    "mtime_ns": st.st_mtime_ns,
+                    "mode": st.st_mode & 0o777,
+                    "chunks": chunks,
+                }
+
+        atomic_write_json(
+            self.snapshots_dir / f"{snapshot_id}.json",
+            {
+                "format": SNAPSHOT_FORMAT,
+                "created": parse_when(snapshot_id).isoformat(),
+                "source": str(source),
+                "files": files,
+            },
+            indent=None,
+        )
+        report.elapsed = time.perf_counter() - started
+        logger.info(report.format())
+        return report
+
+    def _write_chunk(self, digest: str, chunk: bytes) -> int:
+        compressed = zlib.compress(chunk, 6)
+        with atomic_open(self._chunk_path(digest), "wb") as f:
+            f.write(compressed)
+        return len(compressed)
+
+    def read_chunk(self, digest: str) -> bytes:
+        """Return a chunk's content, checking it against its digest."""
+        with open(self._chunk_path(digest), "rb") as f:
+            chunk = zlib.decompress(f.read())
+        if hashlib.sha256(chunk).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt.")
+        return chunk
+
+    def restore(self, when=None, target: Path = APP_DATA_DIR, snapshot_id: Optional[str] = None) -> str:
+        """
+        Restore the newest snapshot taken at or before `when` into `target`.
+
+        Every file in the snapshot is rewritten atomically; files created
+        since are left in place. The restore holds the target's write lock
+        and publishes a new generation, so running readers reload.
+
+        Args:
+            when (str or datetime, optional): Point in time; latest if omitted.
+            target (Path, optional): Directory to restore into.
+            snapshot_id (str, optional): Restore this snapshot exactly.
+
+        Returns:
+            str: The restored snapshot's ID.
+        """
+        snapshot_id = snapshot_id or self.find_snapshot(when)
+        if snapshot_id is None:
+            raise LookupError(f"No snapshot taken at or before {when}.")
+        files = self.load_snapshot(snapshot_id)["files"]
+        target = Path(target)
+        guard = WriteGuard(target / LOCK_FILE_PATH.name, target / GENERATION_FILE_PATH.name)
+        with guard.writing():
+            for name, entry in files.items():
+                path = target / name
+                with atomic_open(path, "wb") as f:
+                    for digest in entry["chunks"]:
+                        f.write(self.read_chunk(digest))
+                os.chmod(path, entry.get("mode", 0o644))
+        logger.info(f"Restored snapshot {snapshot_id} ({len(files)} files) to {target}.")
+        return snapshot_id
+
+    def verify(self, snapshot_ids: Optional[List[str]] = None) -> VerifyReport:
+        """
+        Check that every chunk the snapshots reference exists and matches its
+        digest, and that each file's chunks add up to its recorded size.
+        Each chunk is read once however many snapshots share it.
+        """
+        report = VerifyReport()
+        sizes: Dict[str, Optional[int]] = {}
+        for snapshot_id in snapshot_ids if snapshot_ids is not None else self.snapshots():
+            report.snapshots += 1
+            try:
+                files = self.load_snapshot(snapshot_id)["files"]
+            except (OSError, ValueError, KeyError) as e:
+                report.problems.append((snapshot_id, "", f"unreadable snapshot ({e})"))
+                continue
+            for name, entry in files.items():
+                total = 0
+                for digest in entry["chunks"]:
+                    if digest not in sizes:
+                        try:
+                            sizes[digest] = len(self.read_chunk(digest))
+                        except FileNotFoundError:
+                            sizes[digest] = None
+                            report.problems.append((snapshot_id, name, f"missing chunk {digest}"))
+                        except (OSError, ValueError, zlib.error) as e:
+                            sizes[digest] = None
+                            report.problems.append((snapshot_id, name, f"bad chunk {digest} ({e})"))
+                    if sizes[digest] is None:
+                        total = None
+                    elif total is not None:
+                        total += sizes[digest]
+                if total is not None and total != entry["size"]:
+                    report.problems.append((snapshot_id, name, f"size {total} != {entry['size']}"))
+        report.chunks = len(sizes)
+        return report
@@ -0,0 +1,261 @@
+# shyft/core/bulk_import.py
+import csv
+import json
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from labelsmith.shyft.core.shift import (
+    DATE,
+    HOURLY_RATE,
+    MODEL_ID,
+    PROJECT_ID,
+    TASKS_COMPLETED,
+    TIME_IN,
+    TIME_OUT,
+    Shift,
+)
+
+logger = logging.getLogger("labelsmith")
+
+# The fields the Manual Entry form asks for; every imported row needs all of them.
+IMPORT_FIELDS = (DATE, MODEL_ID, PROJECT_ID, TIME_IN, TIME_OUT, HOURLY_RATE, TASKS_COMPLETED)
+DEFAULT_BATCH_SIZE = 10_000
+CLOCK_PATTERN = r"^(\d{2}):(\d{2})$"
+
+
+class ImportReport:
+    """Outcome of a bulk import: counts, allocated IDs and per-row errors."""
+
+    def __init__(self, path: Path, dry_run: bool):
+        self.path = Path(path)
+        self.dry_run = dry_run
+        self.rows = 0
+        self.imported = 0
+        self.first_id: Optional[str] = None
+        self.last_id: Optional[str] = None
+        # (line number, field, message); a row can have several.
+        self.errors: List[Tuple[int, str, str]] = []
+
+    @property
+    def rejected(self) -> int:
+        return len({line for line, _, _ in self.errors})
+
+    def write_errors(self, path: Path) -> None:
+        """Write the per-row error report as CSV (line, field, error)."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["line", "field", "error"])
+            writer.writerows(self.errors)
+
+    def format(self, max_errors: int = 20) -> str:
+        verb = "Would import" if self.dry_run else "Imported"
+        lines = [f"{self.path}: {verb} {self.imported} of {self.rows} rows ({self.rejected} rejected)."]
+        if self.imported and self.first_id is not None:
+            lines.append(f"  Shift IDs {self.first_id}-{self.last_id}")
+        for line, field, message in self.errors[:max_errors]:
+            lines.append(f"  line {line}: {field + ' ' if field else ''}{message}")
+        if len(self.errors) > max_errors:
+            lines.append(f"  ... and {len(self.errors) - max_errors} more errors")
+        return "\n".join(lines)
+
+
+def _iter_csv(path: Path) -> Iterator[Tuple[int, object]]:
+    with open(path, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def _iter_jsonl(path: Path) -> Iterator[Tuple[int, object]]:
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, e
+
+
+ROW_READERS = {"csv": _iter_csv, "jsonl": _iter_jsonl}
+
+
+def detect_format(path: Path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Can't tell the format of {path}; use a .csv or .jsonl file or pass the format explicitly.")
+
+
+def _clock_minutes(values: pd.Series) -> pd.Series:
+    parts = values.str.extract(CLOCK_PATTERN).astype(float)
+    hours, minutes = parts[0], parts[1]
+    return (hours * 60 + minutes).where((hours < 24) & (minutes < 60))
+
+
+def validate_batch(lines: List[int], rows: List[dict]) -> Tuple[List[Shift], List[Tuple[int, str, str]]]:
+    """
+    Validate a batch of raw rows column-wise and build Shift records.
+
+    Applies the Manual Entry rules (all fields filled, HH:MM times, numeric
+    rate and task count) to whole columns at once, then derives the duration
+    across midnight and the gross pay in integer seconds and cents.
+
+    Args:
+        lines (List[int]): Source line number of each row, for the report.
+        rows (List[dict]): Field name -> raw value mappings.
+
+    Returns:
+        Tuple: Shifts for the valid rows, in order, and (line, field,
+        message) errors for the rest.
+    """
+    frame = pd.DataFrame.from_records(rows, columns=list(IMPORT_FIELDS))
+    text = frame.apply(lambda column: column.fillna("").astype(str).str.strip())
+    line_numbers = np.asarray(lines)
+    bad = np.zeros(len(frame), dtype=bool)
+    errors: List[Tuple[int, str, str]] = []
+
+    def reject(mask, field: str, message: str) -> None:
+        nonlocal bad
+        mask = np.asarray(mask, dtype=bool)
+        errors.extend((int(line), field, message) for line in line_numbers[mask])
+        bad |= mask
+
+    missing = (text == "").to_numpy()
+    for i, field in enumerate(IMPORT_FIELDS):
+        reject(missing[:, i], field, "is required")
+
+    dates = pd.to_datetime(text[DATE], format="%Y-%m-%d", errors="coerce")
+    reject(dates.isna() & (text[DATE] != ""), DATE, "must be a YYYY-MM-DD date")
+
+    clock = {}
+    for field in (TIME_IN, TIME_OUT):
+        clock[field] = _clock_minutes(text[field])
+        reject(clock[field].isna() & (text[field] != ""), field, "must be a time in HH:MM format")
+
+    rate = pd.to_numeric(text[HOURLY_RATE], errors="coerce")
+    reject(
+        ~(np.isfinite(rate) & (rate >= 0)) & (text[HOURLY_RATE] != ""),
+        HOURLY_RATE,
+        "must be a non-negative number",
+    )
+
+    tasks = pd.to_numeric(text[TASKS_COMPLETED], errors="coerce")
+    reject(
+        ~(np.isfinite(tasks) & (tasks >= 0) & (tasks == tasks.round())) & (text[TASKS_COMPLETED] != ""),
+        TASKS_COMPLETED,
+        "must be a non-negative whole number",
+    )
+
+    good = ~bad
+    time_in = clock[TIME_IN][good].astype(np.int64).to_numpy()
+    time_out = clock[TIME_OUT][good].astype(np.int64).to_numpy()
+    # Shifts that end at or before they start ran past midnight.
+    duration_s = ((time_out - time_in) % 1440) * 60
+    rate_cents = np.rint(rate[good].to_numpy() * 100).astype(np.int64)
+    gross_pay_cents = np.rint(rate_cents * duration_s / 3600).astype(np.int64)
+
+    shifts = [
+        Shift(
+            date=date,
+            model_id=model_id,
+            project_id=project_id,
+            time_in=int(t_in),
+            time_out=int(t_out),
+            duration_s=int(seconds),
+            hourly_rate_cents=int(cents),
+            gross_pay_cents=int(gross),
+            tasks_completed=int(n_tasks),
+        )
+        for date, model_id, project_id, t_in, t_out, seconds, cents, gross, n_tasks in zip(
+            dates[good].dt.strftime("%Y-%m-%d"),
+            text[MODEL_ID][good].str.upper(),
+            text[PROJECT_ID][good].str.upper(),
+            time_in,
+            time_out,
+            duration_s,
+            rate_cents,
+            gross_pay_cents,
+            tasks[good].astype(np.int64),
+        )
+    ]
+    return shifts, errors
+
+
+def import_shifts(
+    path: Path,
+    data_manager,
+    file_format: Optional[str] = None,
+    dry_run: bool = False,
+    strict: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    """
+    Import shifts from a CSV or JSONL file in a single commit.
+
+    The file is streamed and validated in batches of `batch_size` rows. Valid
+    rows get consecutive shift IDs after the current maximum and are added
+    to the data manager in one call, which persists them with one write.
+    Rows that fail validation are listed in the report and skipped.
+
+    Args:
+        path (Path): The file to import. CSV needs a header row with the
+            Manual Entry field names; JSONL needs one object per line.
+        data_manager (DataManager): Where the shifts go.
+        file_format (str, optional): "csv" or "jsonl"; inferred from the
+            suffix if omitted.
+        dry_run (bool, optional): Validate and report without importing.
+        strict (bool, optional): Import nothing if any row is invalid.
+        batch_size (int, optional): Rows validated per batch.
+
+    Returns:
+        ImportReport: Row counts, allocated IDs and per-row errors.
+    """
+    path = Path(path)
+    file_format = file_format or detect_format(path)
+    if file_format not in ROW_READERS:
+        raise ValueError(f"Unsupported import format: {file_format}")
+    report = ImportReport(path, dry_run)
+    rows = ROW_READERS[file_format](path)
+    next_id = data_manager.get_max_shift_id() + 1
+    new_shifts: Dict[str, Shift] = {}
+
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        report.rows += len(batch)
+        lines, records = [], []
+        for line, record in batch:
+            if isinstance(record, json.JSONDecodeError):
+                report.errors.append((line, "", f"is not valid JSON ({record.msg})"))
+            elif not isinstance(record, dict):
+                report.errors.append((line, "", "is not a JSON object"))
+            else:
+                lines.append(line)
+                records.append(record)
+        if not records:
+            continue
+        shifts, errors = validate_batch(lines, records)
+        report.errors.extend(errors)
+        for shift in shifts:
+            new_shifts[f"{next_id:04d}"] = shift
+            next_id += 1
+
+    report.errors.sort()
+    if strict and report.errors:
+        report.imported = 0
+        return report
+    report.imported = len(new_shifts)
+    if new_shifts:
+        ids = list(new_shifts)
+        report.first_id, report.last_id = ids[0], ids[-1]
+    if not dry_run and new_shifts:
+        data_manager.add_shifts(new_shifts)
+        logger.info(f"Imported {len(new_shifts)} shifts from {path} ({report.rejected} rows rejected).")
+    return report
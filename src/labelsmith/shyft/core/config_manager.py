@@ -17,6 +17,18 @@ def load_config():
         config['Settings'] = {}
     if 'tax_rate' not in config['Settings']:
         config['Settings']['tax_rate'] = '0.27'
+
+    # Add default storage settings if they don't exist
+    if 'Storage' not in config:
+        config['Storage'] = {}
+    if 'backend' not in config['Storage']:
+        config['Storage']['backend'] = 'json'
+    if 'journal_compact_bytes' not in config['Storage']:
+        config['Storage']['journal_compact_bytes'] = str(1024 * 1024)
+    if 'write_behind' not in config['Storage']:
+        config['Storage']['write_behind'] = 'false'
+    if 'write_behind_delay' not in config['Storage']:
+        config['Storage']['write_behind_delay'] = '0.5'
     
     return config
 
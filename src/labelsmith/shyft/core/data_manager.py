@@ -1,73 +1,502 @@
+import heapq
 import json
 import logging
 import os
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta
+from itertools import groupby
 from labelsmith.shyft.constants import (
     APP_NAME, APP_AUTHOR, APP_DATA_DIR, 
     CONFIG_FILE, DATA_FILE_PATH, LOGS_DIR
     )
+from labelsmith.shyft.core.aggregates import AggregateCube
+from labelsmith.shyft.core.config_manager import load_config
+from labelsmith.shyft.core.encrypted_storage import DecryptionError
+from labelsmith.shyft.core.generation import WriteGuard
+from labelsmith.shyft.core.indexes import ShiftIdIndex, ShiftIndex
+from labelsmith.shyft.core.overlaps import OverlapIndex, audit_overlaps
+from labelsmith.shyft.core.shift import Shift
+from labelsmith.shyft.core.snapshot import ShiftSnapshot
+from labelsmith.shyft.core.storage import create_storage
 from pathlib import Path
 
 logger = logging.getLogger("labelsmith")
 
+
+def _no_snapshot():
+    # Stands in for a dead weak reference before any snapshot is taken.
+    return None
+
+
 class DataManager:
-    def __init__(self):
+    def __init__(self, storage=None):
         self.data = {"data": {}}
-        self.load_data()
+        if storage is None:
+            # Writes take the cross-process lock and publish a new generation.
+            storage = create_storage(load_config(), guard=WriteGuard())
+        self.storage = storage
+        self.index = ShiftIndex()
+        self.ids = ShiftIdIndex()
+        self.overlaps = OverlapIndex()
+        self._aggregates = AggregateCube()
+        self._observers = [self.index, self.ids, self.overlaps, self._aggregates]
+        # Bumped on every change to the shift table; snapshots compare against it.
+        self.generation = 0
+        # Weak reference to the last snapshot handed out (see _writable_shifts).
+        self._snapshot = _no_snapshot
+        self._lock = threading.RLock()
+        # False while partitioned storage still has sealed months on disk.
+        self._history_loaded = True
+        # True while encrypted storage waits for its passphrase (see unlock).
+        self.locked = False
+        try:
+            self.load_data()
+        except DecryptionError:
+            # Logged and left locked; the front end asks for the passphrase.
+            pass
         
     def load_data(self):
+        if getattr(self.storage, "locked", False):
+            # Never prompt from here: this runs at import, possibly in the GUI
+            # process. The front end asks for the passphrase and calls unlock().
+            self.locked = True
+            logger.info(f"{self.storage.name.capitalize()} storage is locked; waiting for the passphrase.")
+            return
         try:
-            if DATA_FILE_PATH.exists():
-                with open(DATA_FILE_PATH, "r") as f:
-                    self.data = json.load(f)
-            logger.info(f"Loaded data: {self.data}")
+            started = time.perf_counter()
+            shifts = self.storage.load()
+            # Convert to Shift records in place so each raw dict is freed as we go.
+            for shift_id, record in shifts.items():
+                shifts[shift_id] = Shift.from_dict(record)
+            cold = getattr(self.storage, "cold_partitions", lambda: [])()
+            with self._lock:
+                self.data = {"data": shifts}
+                self.generation += 1
+                self._history_loaded = not cold
+                self.locked = False
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                f"Loaded {len(self.data['data'])} shifts ({self.storage.stored_bytes()} bytes) "
+                f"from {self.storage.name} storage in {elapsed_ms:.1f} ms"
+                + (f"; {len(cold)} sealed months left on disk." if cold else ".")
+            )
+            self._notify("reset", self.data["data"])
+        except DecryptionError as e:
+            # Stay locked with nothing loaded rather than carry on with an
+            # empty table that a later save would write back.
+            with self._lock:
+                self.data = {"data": {}}
+                self.generation += 1
+                self.locked = True
+            logger.error(f"Failed to decrypt data: {e}")
+            self._notify("reset", self.data["data"])
+            raise
         except json.JSONDecodeError as e:
             logger.error(f"Error decoding JSON: {e}")
         except Exception as e:
             logger.error(f"Failed to load data file: {e}")
 
+    def unlock(self, passphrase):
+        """
+        Unlock encrypted storage with `passphrase` and load the shifts.
+
+        Raises:
+            DecryptionError: The passphrase is wrong or the data can't be
+                decrypted; the manager stays locked and may be retried.
+        """
+        self.storage.unlock(passphrase)
+        self.load_data()
+
+    @property
+    def history_loaded(self):
+        return self._history_loaded
+
+    def load_history(self):
+        """
+        Read the sealed months that partitioned storage left on disk at load.
+
+        Everything that needs the whole table calls this first, so it runs at
+        most once, and only when something actually reaches past the
+        writable months. A no-op for every other backend.
+        """
+        with self._lock:
+            if self._history_loaded:
+                return
+            started = time.perf_counter()
+            cold = self.storage.load_cold()
+            shifts = self._writable_shifts()
+            for shift_id, record in cold.items():
+                shifts[shift_id] = Shift.from_dict(record)
+            self.generation += 1
+            self._history_loaded = True
+            self._notify("reset", shifts)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Loaded {len(cold)} shifts from sealed months in {elapsed_ms:.1f} ms.")
+
+    def _loaded_around(self, date):
+        # Whether the shifts dated from the day before `date` to the day after
+        # (the ones an overlap check can hit) are all in memory.
+        if self._history_loaded:
+            return True
+        try:
+            day = datetime.strptime(str(date), "%Y-%m-%d")
+        except ValueError:
+            return self.storage.is_loaded(date)
+        return all(
+            self.storage.is_loaded((day + timedelta(days=offset)).strftime("%Y-%m-%d"))
+            for offset in (-1, 0, 1)
+        )
+
+    def _is_new_id(self, shift_id):
+        # A numeric ID above every sealed one can't replace an unloaded shift.
+        cold_max = self.storage.cold_max_shift_id()
+        return cold_max is not None and shift_id.isdigit() and int(shift_id) > cold_max
+
+    @property
+    def aggregates(self):
+        """
+        The AggregateCube over every shift. While partitioned storage still
+        has sealed months on disk, their cells come from its manifest instead
+        of reading them.
+        """
+        with self._lock:
+            if self._history_loaded:
+                return self._aggregates
+            rows = self.storage.cold_cells()
+            if rows is not None:
+                return self._aggregates.merged(rows, self.storage.cold_summary())
+        # A manifest written before per-cell aggregates: read the months.
+        self.load_history()
+        return self._aggregates
+
     def save_data(self):
+        if self.locked:
+            raise DecryptionError("The data is locked; unlock it before saving.")
+        self.load_history()
         try:
-            with open(DATA_FILE_PATH, "w") as f:
-                json.dump(self.data, f, indent=4)
+            self.storage.save(self.data["data"])
             logger.debug("Data saved successfully.")
         except Exception as e:
             logger.error(f"Failed to save data: {e}")
             raise
 
-    def get_shifts(self):
+    def _persist_put(self, shift_id):
+        try:
+            self.storage.put(self.data["data"], shift_id)
+            logger.debug(f"Shift {shift_id} saved successfully.")
+        except Exception as e:
+            logger.error(f"Failed to save shift {shift_id}: {e}")
+            raise
+
+    def _persist_delete(self, shift_id):
+        try:
+            self.storage.delete(self.data["data"], shift_id)
+            logger.debug(f"Shift {shift_id} removed from storage.")
+        except Exception as e:
+            logger.error(f"Failed to remove shift {shift_id} from storage: {e}")
+            raise
+
+    def flush(self):
+        try:
+            self.storage.flush()
+            logger.debug("Pending data flushed to storage.")
+        except Exception as e:
+            logger.error(f"Failed to flush data: {e}")
+            raise
+
+    def close(self):
+        self.storage.close()
+
+    def add_observer(self, observer):
+        """Register an object with reset/put/delete hooks to follow mutations."""
+        self.load_history()
+        self._observers.append(observer)
+        observer.reset(self.data["data"])
+
+    def remove_observer(self, observer):
+        self._observers.remove(observer)
+
+    def _notify(self, event, *args):
+        for observer in self._observers:
+            getattr(observer, event)(*args)
+
+    def get_shifts(self, history=True):
+        """
+        Return the live shift table. Only the GUI thread should use this; see snapshot().
+
+        With `history=False`, sealed months not loaded yet are left out
+        instead of being read first.
+        """
+        if history:
+            self.load_history()
         return self.data["data"]
 
+    def snapshot(self) -> ShiftSnapshot:
+        """
+        Take an O(1) read-only view of the shifts at the current generation.
+
+        The view shares the live table; the next mutation copies the table
+        first instead of changing it in place, so the snapshot never changes
+        underneath a reader on another thread. Only a snapshot that is still
+        referenced costs that copy, once; see _writable_shifts.
+        """
+        self.load_history()
+        with self._lock:
+            return self._shared_table()
+
+    def _shared_table(self) -> ShiftSnapshot:
+        # Share the loaded table with a reader; the next mutation copies it
+        # first (see _writable_shifts). Call with self._lock held.
+        snapshot = self._snapshot()
+        if snapshot is None or snapshot.generation != self.generation:
+            snapshot = ShiftSnapshot(self.data["data"], self.generation, self)
+            self._snapshot = weakref.ref(snapshot)
+        return snapshot
+
+    def _writable_shifts(self):
+        if self.locked:
+            raise DecryptionError("The data is locked; unlock it before making changes.")
+        # Copy-on-write: detach from a table that a snapshot still shares.
+        # The whole dict is copied, not just the entry being written: the
+        # table stays a plain dict for the storage backends and the GUI. The
+        # manager only holds its snapshot weakly, so once the readers have
+        # dropped it, writes go straight to the table again; the copy costs
+        # O(n) at most once per snapshot, never once per write.
+        shifts = self.data["data"]
+        snapshot = self._snapshot()
+        if snapshot is not None and snapshot._shifts is shifts:
+            shifts = dict(shifts)
+            self.data["data"] = shifts
+        self._snapshot = _no_snapshot
+        return shifts
+
+    def query(self, start=None, end=None, model=None, project=None):
+        """
+        Return (shift ID, shift) pairs matching the filters, in Date/ID order.
+
+        Dates are inclusive bounds given as YYYY-MM-DD strings or date objects.
+        Lookups go through the secondary indexes instead of scanning every shift;
+        a backend that indexes on disk (SQLite) answers from its own indexes.
+        Sealed months that partitioned storage hasn't loaded are read from
+        disk, and only those overlapping [start, end].
+        Safe to call from any thread: the result reflects a single generation.
+        """
+        storage_query = getattr(self.storage, "query", None)
+        if storage_query is not None:
+            with self._lock:
+                return storage_query(start, end, model, project)
+        return list(self.iter_query(start, end, model, project))
+
+    def iter_query(self, start=None, end=None, model=None, project=None):
+        """
+        Like query(), but yield the matches one at a time, for readers such
+        as export that shouldn't hold every match in memory at once.
+
+        Only the matching IDs are collected up front; each shift is looked
+        up as it is yielded, from the table as it was when iteration started
+        (writes made meanwhile copy it first), and unloaded sealed months
+        are read one at a time.
+        """
+        storage_query = getattr(self.storage, "iter_query", None)
+        if storage_query is not None:
+            yield from storage_query(start, end, model, project)
+            return
+        with self._lock:
+            shifts = self._shared_table()
+            matches = ((shift_id, shifts[shift_id]) for shift_id in self.index.query(start, end, model, project))
+            if not self._history_loaded:
+                cold = self._iter_cold(self.storage.read_range(start, end, include_loaded=False), model, project)
+                matches = heapq.merge(matches, cold, key=lambda match: ShiftIndex.sort_key(*match))
+        yield from matches
+
+    @staticmethod
+    def _iter_cold(records, model, project):
+        # read_range goes month by month; order each month by Date/ID so the
+        # stream merges with the index order.
+        for _, month in groupby(records, key=lambda record: str(record[1].get("Date") or "")[:7]):
+            matches = []
+            for shift_id, record in month:
+                shift = Shift.from_dict(record)
+                if (model is None or shift.model_id == model) and (project is None or shift.project_id == project):
+                    matches.append((shift_id, shift))
+            matches.sort(key=lambda match: ShiftIndex.sort_key(*match))
+            yield from matches
+
     def add_shift(self, shift_id, shift_data):
-        self.data["data"][shift_id] = shift_data
-        self.save_data()
+        shift_data = Shift.from_dict(shift_data)
+        with self._lock:
+            # A new shift in a loaded month (the usual case: today) doesn't
+            # need the sealed history; anything else might replace or rewrite it.
+            if not self._history_loaded and not (
+                self._is_new_id(shift_id) and self.storage.is_loaded(shift_data.date)
+            ):
+                self.load_history()
+            shifts = self._writable_shifts()
+            old = shifts.get(shift_id)
+            shifts[shift_id] = shift_data
+            self.generation += 1
+            self._notify("put", shift_id, old, shift_data)
+            self._persist_put(shift_id)
 
-    def update_shift(self, shift_id, shift_data):
-        if shift_id in self.data["data"]:
-            self.data["data"][shift_id] = shift_data
+    def add_shifts(self, shifts):
+        """
+        Add many shifts as one change: one generation, one index rebuild and
+        one full save, instead of a write per shift.
+
+        Args:
+            shifts (dict): Shift ID -> shift record.
+        """
+        shifts = {shift_id: Shift.from_dict(shift) for shift_id, shift in shifts.items()}
+        self.load_history()
+        with self._lock:
+            table = self._writable_shifts()
+            table.update(shifts)
+            self.generation += 1
+            self._notify("reset", table)
             self.save_data()
-        else:
-            raise KeyError(f"Shift with ID {shift_id} not found.")
+
+    def update_shift(self, shift_id, shift_data):
+        shift_data = Shift.from_dict(shift_data)
+        self.load_history()
+        with self._lock:
+            # Checked under the lock: another thread may delete it first.
+            if shift_id not in self.data["data"]:
+                raise KeyError(f"Shift with ID {shift_id} not found.")
+            shifts = self._writable_shifts()
+            old = shifts[shift_id]
+            shifts[shift_id] = shift_data
+            self.generation += 1
+            self._notify("put", shift_id, old, shift_data)
+            self._persist_put(shift_id)
 
     def delete_shift(self, shift_id):
-        if shift_id in self.data["data"]:
-            del self.data["data"][shift_id]
+        self.load_history()
+        with self._lock:
+            if shift_id not in self.data["data"]:
+                raise KeyError(f"Shift with ID {shift_id} not found.")
+            old = self._writable_shifts().pop(shift_id)
+            self.generation += 1
+            self._notify("delete", shift_id, old)
+            self._persist_delete(shift_id)
+
+        # Delete the corresponding Markdown file
+        md_file_path = Path(LOGS_DIR) / f"{shift_id}.md"
+        try:
+            if md_file_path.exists():
+                os.remove(md_file_path)
+                logger.info(f"Deleted Markdown file for shift {shift_id}.")
+            else:
+                logger.warning(f"Markdown file for shift {shift_id} not found.")
+        except Exception as e:
+            logger.error(f"Failed to delete Markdown file for shift {shift_id}: {e}.")
+
+    def update_shifts(self, updates):
+        """
+        Replace many shifts as one change: one generation, one save and one
+        set of observer updates, instead of a write per shift.
+
+        Args:
+            updates (dict): Shift ID -> new shift record. Every ID must exist.
+        """
+        updates = {shift_id: Shift.from_dict(shift) for shift_id, shift in updates.items()}
+        self.load_history()
+        with self._lock:
+            missing = [shift_id for shift_id in updates if shift_id not in self.data["data"]]
+            if missing:
+                raise KeyError(f"Shifts not found: {', '.join(missing)}")
+            shifts = self._writable_shifts()
+            for shift_id, shift in updates.items():
+                old = shifts[shift_id]
+                shifts[shift_id] = shift
+                self._notify("put", shift_id, old, shift)
+            self.generation += 1
             self.save_data()
-            
-            # Delete the corresponding Markdown file
-            md_file_path = Path(LOGS_DIR) / f"{shift_id}.md"
-            try:
-                if md_file_path.exists():
-                    os.remove(md_file_path)
-                    logger.info(f"Deleted Markdown file for shift {shift_id}.")
-                else:
-                    logger.warning(f"Markdown file for shift {shift_id} not found.")
-            except Exception as e:
-                logger.error(f"Failed to delete Markdown file for shift {shift_id}: {e}.")
-        else:
-            raise KeyError(f"Shift with ID {shift_id} not found.")
+        logger.info(f"Updated {len(updates)} shifts.")
+
+    def delete_shifts(self, shift_ids):
+        """
+        Delete many shifts as one change: one generation, one save, and one
+        pass over LOGS_DIR to remove their Markdown logs.
+
+        Args:
+            shift_ids (Iterable[str]): IDs to delete. Every ID must exist.
+        """
+        shift_ids = list(dict.fromkeys(shift_ids))
+        self.load_history()
+        with self._lock:
+            missing = [shift_id for shift_id in shift_ids if shift_id not in self.data["data"]]
+            if missing:
+                raise KeyError(f"Shifts not found: {', '.join(missing)}")
+            shifts = self._writable_shifts()
+            for shift_id in shift_ids:
+                old = shifts.pop(shift_id)
+                self._notify("delete", shift_id, old)
+            self.generation += 1
+            self.save_data()
+        logger.info(f"Deleted {len(shift_ids)} shifts.")
+        self._remove_markdown_logs(shift_ids)
+
+    def _remove_markdown_logs(self, shift_ids):
+        # One directory scan instead of an exists() + remove() per shift.
+        names = {f"{shift_id}.md" for shift_id in shift_ids}
+        removed = 0
+        try:
+            with os.scandir(LOGS_DIR) as entries:
+                for entry in entries:
+                    if entry.name in names:
+                        try:
+                            os.remove(entry.path)
+                            removed += 1
+                        except OSError as e:
+                            logger.error(f"Failed to delete Markdown file {entry.name}: {e}.")
+        except FileNotFoundError:
+            pass
+        logger.info(f"Deleted {removed} Markdown files for {len(names)} shifts.")
 
     def get_max_shift_id(self):
-        return max([int(x) for x in self.data["data"].keys()], default=0)
+        with self._lock:
+            if not self._history_loaded:
+                # The manifest records each sealed month's largest ID.
+                cold_max = self.storage.cold_max_shift_id()
+                if cold_max is not None:
+                    return max(self.ids.max_id, cold_max)
+                self.load_history()
+            return self.ids.max_id
+
+    def shift_ids(self, descending=False, history=True):
+        """
+        Return every shift ID in numeric order, from the ID index rather than a sort.
+
+        `history=False` lists only the loaded shifts, as get_shifts does.
+        """
+        if history:
+            self.load_history()
+        with self._lock:
+            return self.ids.ordered(descending)
+
+    def find_overlaps(self, date, time_in, time_out, exclude=None):
+        """
+        Return the IDs of shifts that overlap the given Date/In/Out.
+
+        Out at or before In means the shift ran past midnight. Pass the ID of
+        the shift being edited as `exclude` so it doesn't match itself.
+        """
+        with self._lock:
+            if not self._loaded_around(date):
+                self.load_history()
+            return self.overlaps.find(date, time_in, time_out, exclude=exclude)
+
+    def audit_overlaps(self):
+        """Check the whole history for overlapping shifts; returns an OverlapReport."""
+        return audit_overlaps(self.snapshot())
+
+    def neighbor_shift_ids(self, shift_id):
+        """Return the (previous, next) shift IDs around `shift_id`; either may be None."""
+        self.load_history()
+        with self._lock:
+            return self.ids.neighbors(shift_id)
 
 # Initialize the DataManager
 data_manager = DataManager()
\ No newline at end of file
@@ -0,0 +1,264 @@
+# shyft/core/encrypted_storage.py
+import getpass
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from labelsmith.shyft.constants import COLUMN_CACHE_DIR, DATA_FILE_PATH, ENCRYPTED_DB_PATH, PLOT_CACHE_DIR
+from labelsmith.shyft.core.generation import NO_GUARD
+from labelsmith.shyft.core.shift import Shift, encode_shift
+from labelsmith.shyft.core.sqlite_storage import shift_id_num
+from labelsmith.shyft.utils.file_utils import shred_file
+from labelsmith.shyft.utils.json_stream import iter_shift_records
+
+logger = logging.getLogger("labelsmith")
+
+PASSPHRASE_ENV = "SHYFT_PASSPHRASE"
+# Encrypted on creation and checked on open, so a wrong passphrase fails
+# before any record is touched.
+VERIFIER = b"labelsmith-shyft"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shifts (
+    id TEXT PRIMARY KEY,
+    id_num INTEGER NOT NULL,
+    token BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_shifts_id_num ON shifts (id_num);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value BLOB
+);
+"""
+
+
+class DecryptionError(Exception):
+    """The passphrase is missing or wrong, or a record failed to decrypt."""
+
+
+def env_passphrase() -> Optional[str]:
+    """The passphrase from $SHYFT_PASSPHRASE, or None if it isn't set."""
+    return os.environ.get(PASSPHRASE_ENV) or None
+
+
+def prompt_passphrase() -> str:
+    """Read the passphrase from $SHYFT_PASSPHRASE, or ask on the terminal."""
+    return env_passphrase() or getpass.getpass("Shyft data passphrase: ")
+
+
+class EncryptedStorage:
+    """
+    Keeps each shift as its own Fernet token in a local SQLite database.
+
+    The key is derived from the passphrase once per session, with a random
+    salt stored in the database. Adding or editing a shift encrypts and
+    writes just that row; a full save re-encrypts only the shifts whose
+    record changed since they were last written. Only the shift ID is stored
+    in the clear. On first use the existing `data.json` is imported and then
+    shredded.
+
+    The store starts locked unless `passphrase` supplies one (by default
+    from $SHYFT_PASSPHRASE); call `unlock` with the user's passphrase before
+    loading. Nothing is read or written while locked.
+    """
+
+    name = "encrypted"
+    # Keeps the shifts confidential on disk, so callers must not cache them in the clear.
+    encrypted = True
+
+    def __init__(
+        self,
+        path: Path = ENCRYPTED_DB_PATH,
+        import_path: Optional[Path] = DATA_FILE_PATH,
+        passphrase: Optional[Callable[[], str]] = None,
+        guard=None,
+    ):
+        self.path = Path(path)
+        self.import_path = Path(import_path) if import_path is not None else None
+        self.passphrase = passphrase or env_passphrase
+        self.guard = guard or NO_GUARD
+        self._lock = threading.RLock()
+        self._conn = None
+        self._cipher = None
+        # Shift ID -> (Shift last written, its token); Shift records are never
+        # mutated, so identity tells us whether a row needs re-encrypting.
+        self._written: Dict[str, Tuple[Shift, bytes]] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    @property
+    def locked(self) -> bool:
+        """True until a passphrase has been accepted or one is available without asking."""
+        return self._cipher is None and not self.passphrase()
+
+    def unlock(self, passphrase: str) -> None:
+        """
+        Derive the key from `passphrase` and check it against the stored
+        verifier. A new database adopts the passphrase.
+
+        Raises:
+            DecryptionError: The passphrase is empty or wrong; the store stays locked.
+        """
+        # Imported here so the plain backends never load the crypto stack.
+        from cryptography.fernet import InvalidToken
+        from labelsmith.utils.crypt import KDF_ITERATIONS, RecordCipher
+
+        if not passphrase:
+            raise DecryptionError(f"{self.path} is locked; a passphrase is required.")
+        with self._lock:
+            salt = self._get_meta("salt")
+            verifier = self._get_meta("verifier")
+            iterations = int(self._get_meta("kdf_iterations") or KDF_ITERATIONS)
+            if salt is None:
+                salt = RecordCipher.new_salt()
+            cipher = RecordCipher(passphrase, salt, iterations)
+            if verifier is None:
+                with self.guard.writing(), self.conn:
+                    self._set_meta("salt", salt)
+                    self._set_meta("kdf_iterations", str(iterations))
+                    self._set_meta("verifier", cipher.encrypt(VERIFIER))
+            else:
+                try:
+                    cipher.decrypt(verifier)
+                except InvalidToken:
+                    raise DecryptionError(f"Wrong passphrase for {self.path}.") from None
+            self._cipher = cipher
+
+    @property
+    def cipher(self):
+        if self._cipher is None:
+            self.unlock(self.passphrase())
+        return self._cipher
+
+    def _encrypt(self, shift_id: str, shift: Shift) -> Tuple:
+        payload = json.dumps(shift, separators=(",", ":"), default=encode_shift).encode()
+        return (shift_id, shift_id_num(shift_id), self.cipher.encrypt(payload))
+
+    def load(self) -> Dict[str, Shift]:
+        with self._lock:
+            # Derive the key (or reject the passphrase) before importing anything.
+            cipher = self.cipher
+            # The import takes the write lock, so it runs before the read lock.
+            if self.import_path is not None and self._get_meta("imported_from") is None:
+                self.import_json(self.import_path)
+            with self.guard.reading():
+                rows = self.conn.execute("SELECT id, token FROM shifts ORDER BY id_num").fetchall()
+            from cryptography.fernet import InvalidToken
+
+            shifts = {}
+            written = {}
+            for shift_id, token in rows:
+                try:
+                    shift = Shift.from_dict(json.loads(cipher.decrypt(token)))
+                except InvalidToken:
+                    # Never hand back a partial table that a save would then persist.
+                    raise DecryptionError(f"Shift {shift_id} in {self.path} failed to decrypt.") from None
+                shifts[shift_id] = shift
+                written[shift_id] = (shift, token)
+            self._written = written
+        return shifts
+
+    def save(self, shifts: Dict[str, dict]) -> None:
+        with self._lock:
+            gone = [(shift_id,) for shift_id in self._written if shift_id not in shifts]
+            changed = {
+                shift_id: Shift.from_dict(shift)
+                for shift_id, shift in shifts.items()
+                if self._written.get(shift_id, (None,))[0] is not shift
+            }
+            rows = [self._encrypt(shift_id, shift) for shift_id, shift in changed.items()]
+            with self.guard.writing(), self.conn:
+                self.conn.executemany("DELETE FROM shifts WHERE id = ?", gone)
+                self.conn.executemany("INSERT OR REPLACE INTO shifts VALUES (?, ?, ?)", rows)
+            # Only once the transaction committed, as in SQLiteStorage.
+            for (shift_id,) in gone:
+                del self._written[shift_id]
+            for (shift_id, _, token) in rows:
+                self._written[shift_id] = (changed[shift_id], token)
+        logger.debug(f"Encrypted {len(changed)} changed shifts; removed {len(gone)}.")
+
+    def put(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        with self._lock:
+            shift = Shift.from_dict(shifts[shift_id])
+            row = self._encrypt(shift_id, shift)
+            with self.guard.writing(), self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO shifts VALUES (?, ?, ?)", row)
+            self._written[shift_id] = (shift, row[2])
+
+    def delete(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        with self._lock:
+            with self.guard.writing(), self.conn:
+                self.conn.execute("DELETE FROM shifts WHERE id = ?", (shift_id,))
+            self._written.pop(shift_id, None)
+
+    def import_json(self, json_path: Path) -> int:
+        """
+        One-shot import of an existing plaintext `data.json`, encrypting each
+        record. Runs in one transaction and is recorded in `meta`; once it
+        has committed, the plaintext file is shredded.
+
+        Args:
+            json_path (Path): The JSON data file to import.
+
+        Returns:
+            int: The number of shifts imported.
+        """
+        json_path = Path(json_path)
+        with self._lock:
+            if not json_path.exists():
+                with self.guard.writing(), self.conn:
+                    self._set_meta("imported_from", "")
+                return 0
+            with self.guard.writing(), self.conn:
+                cursor = self.conn.executemany(
+                    "INSERT OR REPLACE INTO shifts VALUES (?, ?, ?)",
+                    (
+                        self._encrypt(shift_id, Shift.from_dict(shift))
+                        for shift_id, shift in iter_shift_records(json_path)
+                    ),
+                )
+                self._set_meta("imported_from", str(json_path))
+        logger.info(f"Encrypted {cursor.rowcount} shifts from {json_path} into {self.path}.")
+        # The column and plot caches next to it were built from the same plaintext.
+        stale = [json_path]
+        for cache_dir in (COLUMN_CACHE_DIR.name, PLOT_CACHE_DIR.name):
+            directory = json_path.with_name(cache_dir)
+            if directory.is_dir():
+                stale.extend(path for path in directory.rglob("*") if path.is_file())
+        for path in stale:
+            try:
+                shred_file(path)
+            except OSError as e:
+                logger.error(f"Could not remove the plaintext {path}; delete it by hand: {e}")
+        logger.info(f"Shredded {json_path} and {len(stale) - 1} cached plaintext files.")
+        return cursor.rowcount
+
+    def _get_meta(self, key: str):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def stored_bytes(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
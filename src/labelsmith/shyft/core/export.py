@@ -0,0 +1,127 @@
+# shyft/core/export.py
+import csv
+import json
+from typing import Iterator, Optional, TextIO
+from labelsmith.shyft.core.shift import (
+    DATE,
+    DURATION,
+    GROSS_PAY,
+    HOURLY_RATE,
+    MODEL_ID,
+    PROJECT_ID,
+    TASK_DURATIONS_SECONDS,
+    TASKS_COMPLETED,
+    TIME_IN,
+    TIME_OUT,
+    format_clock,
+)
+
+SHIFT_ID = "Shift ID"
+TASK_NUMBER = "Task"
+TASK_DURATION_SECONDS = "Task duration (s)"
+TASK_DURATION_HHMM = "Task duration (hh:mm)"
+
+# CSV columns, in the order the main window shows them. The Manual Entry
+# fields are all present, so an export can be fed back to `shyft-cli import`.
+SHIFT_COLUMNS = (
+    SHIFT_ID,
+    DATE,
+    MODEL_ID,
+    PROJECT_ID,
+    TIME_IN,
+    TIME_OUT,
+    DURATION,
+    TASKS_COMPLETED,
+    HOURLY_RATE,
+    GROSS_PAY,
+)
+TASK_COLUMNS = (TASK_NUMBER, TASK_DURATION_SECONDS, TASK_DURATION_HHMM)
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+def iter_export_rows(
+    data_manager,
+    file_format: str = "csv",
+    start=None,
+    end=None,
+    model: Optional[str] = None,
+    project: Optional[str] = None,
+    tasks: bool = False,
+) -> Iterator[dict]:
+    """
+    Yield export rows for the shifts matching the filters, in Date/ID order.
+
+    CSV rows use the display layout (two-decimal hours and money) and JSONL
+    rows the schema v2 record (integer seconds and cents), each with its
+    shift ID. With `tasks`, a shift yields one row per entry in its task
+    durations instead (or a single row with empty task columns if it has
+    none). Rows are built one at a time, so memory doesn't grow with the
+    size of the export.
+
+    Args:
+        data_manager (DataManager): The source of shifts.
+        file_format (str, optional): "csv" or "jsonl". Defaults to "csv".
+        start (str or date, optional): Inclusive lower bound on Date.
+        end (str or date, optional): Inclusive upper bound on Date.
+        model (str, optional): Exact Model ID to match.
+        project (str, optional): Exact Project ID to match.
+        tasks (bool, optional): Flatten task durations into rows.
+
+    Yields:
+        dict: One export row.
+    """
+    for shift_id, shift in data_manager.iter_query(start=start, end=end, model=model, project=project):
+        if file_format == "jsonl":
+            row = {SHIFT_ID: shift_id, **shift.to_record()}
+        else:
+            row = {column: shift.get(column, "") for column in SHIFT_COLUMNS[1:]}
+            row[SHIFT_ID] = shift_id
+        if not tasks:
+            yield row
+            continue
+        row.pop(TASK_DURATIONS_SECONDS, None)
+        durations = shift.task_durations or ()
+        if not durations:
+            yield {**row, TASK_NUMBER: "", TASK_DURATION_SECONDS: "", TASK_DURATION_HHMM: ""}
+            continue
+        for number, seconds in enumerate(durations, start=1):
+            yield {
+                **row,
+                TASK_NUMBER: number,
+                TASK_DURATION_SECONDS: seconds,
+                TASK_DURATION_HHMM: format_clock(seconds // 60),
+            }
+
+
+def export_shifts(out: TextIO, data_manager, file_format: str = "csv", tasks: bool = False, **filters) -> int:
+    """
+    Stream shifts to an open text file as CSV or JSONL.
+
+    Args:
+        out (TextIO): Destination, e.g. an open file or sys.stdout. CSV
+            output should be opened with newline="".
+        data_manager (DataManager): The source of shifts.
+        file_format (str, optional): "csv" or "jsonl". Defaults to "csv".
+        tasks (bool, optional): One row per task instead of per shift.
+        **filters: start, end, model and project, as for iter_export_rows.
+
+    Returns:
+        int: The number of rows written.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    rows = iter_export_rows(data_manager, file_format, tasks=tasks, **filters)
+    count = 0
+    if file_format == "csv":
+        columns = SHIFT_COLUMNS + TASK_COLUMNS if tasks else SHIFT_COLUMNS
+        writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(row, separators=(",", ":")))
+            out.write("\n")
+            count += 1
+    return count
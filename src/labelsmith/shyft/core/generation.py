@@ -0,0 +1,139 @@
+# shyft/core/generation.py
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Optional, Tuple
+from labelsmith.shyft.constants import DATA_FILE_PATH, GENERATION_FILE_PATH, LOCK_FILE_PATH
+from labelsmith.shyft.utils.file_lock import FileLock
+from labelsmith.shyft.utils.file_utils import atomic_write_json
+
+
+def read_generation(path: Path = GENERATION_FILE_PATH) -> int:
+    """Read the committed generation number, or 0 if none has been written."""
+    try:
+        with open(path, "r") as f:
+            return int(json.load(f)["generation"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0
+
+
+def _stat_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class WriteGuard:
+    """
+    Serializes writes to the data files across processes and publishes a
+    generation number after each one.
+
+    Storage backends wrap every write in `writing()`, which holds an
+    exclusive advisory lock on `data.lock` and, once the write succeeded,
+    bumps the generation in `data.generation`. Readers in other processes
+    take the shared lock with `reading()` and use a ChangeWatcher to decide
+    whether they need to reload at all.
+    """
+
+    def __init__(
+        self,
+        lock_path: Path = LOCK_FILE_PATH,
+        generation_path: Path = GENERATION_FILE_PATH,
+        timeout: Optional[float] = 10.0,
+    ):
+        self.write_lock = FileLock(lock_path, timeout=timeout)
+        self.read_lock = FileLock(lock_path, shared=True, timeout=timeout)
+        self.generation_path = Path(generation_path)
+        self.generation = read_generation(self.generation_path)
+        self._local = threading.local()
+
+    @contextmanager
+    def writing(self):
+        with self.write_lock:
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            # Nested writes (e.g. a journal append that triggers compaction)
+            # publish once, from the outermost block.
+            if depth == 0:
+                self._publish()
+
+    def reading(self):
+        # A thread already writing holds the exclusive lock; taking the shared
+        # one on a second descriptor would wait on ourselves.
+        if getattr(self._local, "depth", 0):
+            return nullcontext()
+        return self.read_lock
+
+    def _publish(self) -> None:
+        # Re-read under the lock: another process may have written since.
+        self.generation = read_generation(self.generation_path) + 1
+        atomic_write_json(
+            self.generation_path,
+            {"generation": self.generation, "pid": os.getpid(), "written_at": time.time()},
+            indent=None,
+        )
+
+
+class _NoGuard:
+    generation = 0
+
+    def writing(self):
+        return nullcontext()
+
+    def reading(self):
+        return nullcontext()
+
+
+# Used by storage backends constructed without a guard (tests, one-off tools).
+NO_GUARD = _NoGuard()
+
+
+class ChangeWatcher:
+    """
+    Cheap polling for changes made by other processes.
+
+    `poll()` stats `data.generation` and the data file; only if either stat
+    (mtime, size, inode) moved does it read the generation number. It returns
+    True when the generation advanced since the last poll (or construction).
+    Where no generation file exists yet, e.g. data written by an older
+    build, a change to the data file's stat counts instead.
+
+    Construct the watcher before the initial load so a write that lands in
+    between is reported by the first poll.
+    """
+
+    def __init__(self, generation_path: Path = GENERATION_FILE_PATH, data_path: Optional[Path] = DATA_FILE_PATH):
+        self.generation_path = Path(generation_path)
+        self.data_path = Path(data_path) if data_path is not None else None
+        self._stamp = self._current_stamp()
+        self.generation = read_generation(self.generation_path)
+
+    def _current_stamp(self):
+        return (
+            _stat_stamp(self.generation_path),
+            _stat_stamp(self.data_path) if self.data_path is not None else None,
+        )
+
+    def poll(self) -> bool:
+        stamp = self._current_stamp()
+        if stamp == self._stamp:
+            return False
+        previous, self._stamp = self._stamp, stamp
+        if stamp[0] is None:
+            return stamp[1] != previous[1]
+        if stamp[0] == previous[0]:
+            return False
+        generation = read_generation(self.generation_path)
+        if generation == self.generation:
+            return False
+        self.generation = generation
+        return True
@@ -0,0 +1,186 @@
+# shyft/core/indexes.py
+import bisect
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger("labelsmith")
+
+
+def _date_key(value) -> str:
+    if value is None:
+        return ""
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+class ShiftIndex:
+    """
+    In-memory secondary indexes over the shift table.
+
+    Keeps a sorted (Date, ID) list plus Model ID and Project ID buckets, all
+    updated incrementally by DataManager as shifts are added, updated and
+    deleted. Dates are ISO strings, so lexical order is chronological order.
+    """
+
+    def __init__(self):
+        self.by_date: List[Tuple[str, int, str]] = []
+        self.by_model: Dict[str, Set[str]] = {}
+        self.by_project: Dict[str, Set[str]] = {}
+        self._keys: Dict[str, Tuple[str, int, str]] = {}
+
+    @staticmethod
+    def sort_key(shift_id: str, shift) -> Tuple[str, int, str]:
+        try:
+            id_num = int(shift_id)
+        except ValueError:
+            id_num = -1
+        return (_date_key(shift.date), id_num, shift_id)
+
+    def reset(self, shifts) -> None:
+        self._keys = {shift_id: self.sort_key(shift_id, shift) for shift_id, shift in shifts.items()}
+        self.by_date = sorted(self._keys.values())
+        self.by_model = {}
+        self.by_project = {}
+        for shift_id, shift in shifts.items():
+            self._add_to_buckets(shift_id, shift)
+
+    def put(self, shift_id: str, old, new) -> None:
+        if old is not None:
+            self.delete(shift_id, old)
+        key = self.sort_key(shift_id, new)
+        bisect.insort(self.by_date, key)
+        self._keys[shift_id] = key
+        self._add_to_buckets(shift_id, new)
+
+    def delete(self, shift_id: str, old) -> None:
+        key = self._keys.pop(shift_id, None)
+        if key is not None:
+            i = bisect.bisect_left(self.by_date, key)
+            if i < len(self.by_date) and self.by_date[i] == key:
+                del self.by_date[i]
+        self._remove_from_bucket(self.by_model, old.model_id, shift_id)
+        self._remove_from_bucket(self.by_project, old.project_id, shift_id)
+
+    def _add_to_buckets(self, shift_id: str, shift) -> None:
+        self.by_model.setdefault(shift.model_id, set()).add(shift_id)
+        self.by_project.setdefault(shift.project_id, set()).add(shift_id)
+
+    @staticmethod
+    def _remove_from_bucket(buckets: Dict[str, Set[str]], value, shift_id: str) -> None:
+        bucket = buckets.get(value)
+        if bucket is not None:
+            bucket.discard(shift_id)
+            if not bucket:
+                del buckets[value]
+
+    def query(
+        self,
+        start=None,
+        end=None,
+        model: Optional[str] = None,
+        project: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Find the IDs of shifts matching all of the given filters.
+
+        Args:
+            start (str or date, optional): Inclusive lower bound on Date.
+            end (str or date, optional): Inclusive upper bound on Date.
+            model (str, optional): Exact Model ID to match.
+            project (str, optional): Exact Project ID to match.
+
+        Returns:
+            List[str]: Matching shift IDs ordered by Date, then ID.
+        """
+        buckets = []
+        if model is not None:
+            buckets.append(self.by_model.get(model, set()))
+        if project is not None:
+            buckets.append(self.by_project.get(project, set()))
+        members = set.intersection(*buckets) if buckets else None
+
+        start_key = None if start is None else _date_key(start)
+        end_key = None if end is None else _date_key(end)
+        lo = 0 if start_key is None else bisect.bisect_left(self.by_date, (start_key,))
+        # (date, inf) sorts after every (date, id, ...) key, so the whole end date is included.
+        hi = len(self.by_date) if end_key is None else bisect.bisect_right(self.by_date, (end_key, float("inf")))
+
+        if members is not None and len(members) < hi - lo:
+            # The Model/Project bucket is the smaller candidate set; sort it
+            # instead of walking the date range.
+            keys = sorted(self._keys[shift_id] for shift_id in members)
+            return [
+                key[2]
+                for key in keys
+                if (start_key is None or key[0] >= start_key) and (end_key is None or key[0] <= end_key)
+            ]
+        return [
+            key[2] for key in self.by_date[lo:hi] if members is None or key[2] in members
+        ]
+
+
+class ShiftIdIndex:
+    """
+    Shift IDs kept in numeric order, with the largest number cached.
+
+    Follows the shift table like ShiftIndex, so the main view can list
+    shifts in ID order and new-ID allocation can read the maximum without
+    sorting or scanning every key. Non-numeric IDs sort first, as -1.
+    """
+
+    def __init__(self):
+        self._ids: List[Tuple[int, str]] = []
+        self.max_id = 0
+
+    @staticmethod
+    def _key(shift_id: str) -> Tuple[int, str]:
+        try:
+            return (int(shift_id), shift_id)
+        except ValueError:
+            return (-1, shift_id)
+
+    def _refresh_max(self) -> None:
+        self.max_id = max(self._ids[-1][0], 0) if self._ids else 0
+
+    def reset(self, shifts) -> None:
+        self._ids = sorted(self._key(shift_id) for shift_id in shifts)
+        self._refresh_max()
+
+    def put(self, shift_id: str, old, new) -> None:
+        if old is not None:
+            return
+        key = self._key(shift_id)
+        bisect.insort(self._ids, key)
+        self.max_id = max(self.max_id, key[0])
+
+    def delete(self, shift_id: str, old) -> None:
+        key = self._key(shift_id)
+        i = bisect.bisect_left(self._ids, key)
+        if i < len(self._ids) and self._ids[i] == key:
+            del self._ids[i]
+            if key[0] == self.max_id:
+                self._refresh_max()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def ordered(self, descending: bool = False) -> List[str]:
+        """Return every shift ID in numeric order."""
+        ids = reversed(self._ids) if descending else self._ids
+        return [shift_id for _, shift_id in ids]
+
+    def neighbors(self, shift_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Find the IDs just before and after a shift in numeric order.
+
+        Returns:
+            Tuple: (previous ID, next ID); either is None at the ends. The
+            shift itself need not exist.
+        """
+        key = self._key(shift_id)
+        i = bisect.bisect_left(self._ids, key)
+        j = i + 1 if i < len(self._ids) and self._ids[i] == key else i
+        previous = self._ids[i - 1][1] if i > 0 else None
+        following = self._ids[j][1] if j < len(self._ids) else None
+        return previous, following
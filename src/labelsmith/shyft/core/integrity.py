@@ -0,0 +1,122 @@
+# shyft/core/integrity.py
+import logging
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from labelsmith.shyft.core.shift import DURATION, GROSS_PAY, format_cents
+from labelsmith.utils.columnar import shift_columns
+
+logger = logging.getLogger("labelsmith")
+
+# In and Out are stored to the minute, so a duration measured to the second
+# (as the autologger does) can differ from Out - In by up to a minute, and
+# shifts saved before schema v2 kept two-decimal hours, i.e. durations
+# rounded to the nearest 36 seconds. Neither is drift.
+DURATION_TOLERANCE_S = 60 + 18
+# Rounding to the cent, plus the pay for DURATION_TOLERANCE_S at the shift's rate.
+GROSS_PAY_TOLERANCE_CENTS = 1
+
+# The Shift attributes the check reads.
+_COLUMNS = ("time_in", "time_out", "duration_s", "hourly_rate_cents", "gross_pay_cents")
+
+
+class IntegrityReport:
+    """Shifts whose stored Duration or Gross pay disagree with their inputs."""
+
+    def __init__(self, checked: int, skipped: int):
+        self.checked = checked
+        self.skipped = skipped
+        # (shift ID, field, stored or None if missing, expected); seconds or cents.
+        self.mismatches: List[Tuple[str, str, Optional[int], int]] = []
+        self.repaired = 0
+
+    @property
+    def shift_ids(self) -> List[str]:
+        return sorted({shift_id for shift_id, _, _, _ in self.mismatches})
+
+    def format(self, max_rows: int = 20) -> str:
+        lines = [
+            f"Checked {self.checked} shifts ({self.skipped} without In/Out or rate skipped): "
+            f"{len(self.mismatches)} mismatched fields in {len(self.shift_ids)} shifts"
+            + (f", {self.repaired} shifts repaired." if self.repaired else ".")
+        ]
+        for shift_id, field, stored, expected in self.mismatches[:max_rows]:
+            show = (lambda v: f"{v / 3600:.2f}") if field == DURATION else format_cents
+            lines.append(
+                f"  {shift_id} {field}: {'missing' if stored is None else show(stored)} should be {show(expected)}"
+            )
+        if len(self.mismatches) > max_rows:
+            lines.append(f"  ... and {len(self.mismatches) - max_rows} more")
+        return "\n".join(lines)
+
+
+def verify_shifts(shifts) -> Tuple[IntegrityReport, Dict[str, Dict[str, int]]]:
+    """
+    Recompute every shift's duration and gross pay from its In/Out times and
+    hourly rate, column-wise, and compare with the stored values.
+
+    In and Out are the source of truth: an Out at or before In wraps past
+    midnight as in calculate_duration, and pay is rate x recomputed
+    duration, rounded to the cent. Shifts logged by the autologger (those
+    with task durations) are the exception: their Duration is the timer's
+    elapsed time, which leaves out pauses, so it is kept and only their pay
+    is checked against it. Shifts missing In, Out or rate are skipped.
+
+    Args:
+        shifts (Mapping): Shift ID -> Shift.
+
+    Returns:
+        Tuple: The report, and shift ID -> {attribute: corrected value} for
+        the shifts that need repair.
+    """
+    ids, columns = shift_columns(shifts, _COLUMNS)
+    usable = ~(np.isnan(columns["time_in"]) | np.isnan(columns["time_out"]) | np.isnan(columns["hourly_rate_cents"]))
+    report = IntegrityReport(checked=int(usable.sum()), skipped=int((~usable).sum()))
+
+    timed = np.fromiter((shift.task_durations is not None for shift in shifts.values()), dtype=bool, count=len(ids))
+    timed &= ~np.isnan(columns["duration_s"])
+
+    expected_duration = np.where(
+        timed, columns["duration_s"], np.mod(columns["time_out"] - columns["time_in"], 1440) * 60
+    )
+    expected_gross = np.rint(columns["hourly_rate_cents"] * expected_duration / 3600)
+    gross_tolerance = GROSS_PAY_TOLERANCE_CENTS + columns["hourly_rate_cents"] * DURATION_TOLERANCE_S / 3600
+    # NaN (a missing stored value) compares unequal, so it counts as a mismatch.
+    bad_duration = usable & ~(np.abs(columns["duration_s"] - expected_duration) <= DURATION_TOLERANCE_S)
+    bad_gross = usable & ~(np.abs(columns["gross_pay_cents"] - expected_gross) <= gross_tolerance)
+
+    fixes: Dict[str, Dict[str, int]] = {}
+    for i in np.flatnonzero(bad_duration | bad_gross).tolist():
+        shift_id = ids[i]
+        fix = fixes[shift_id] = {}
+        if bad_duration[i]:
+            fix["duration_s"] = int(expected_duration[i])
+            stored = columns["duration_s"][i]
+            report.mismatches.append((shift_id, DURATION, None if np.isnan(stored) else int(stored), fix["duration_s"]))
+        if bad_gross[i]:
+            fix["gross_pay_cents"] = int(expected_gross[i])
+            stored = columns["gross_pay_cents"][i]
+            report.mismatches.append((shift_id, GROSS_PAY, None if np.isnan(stored) else int(stored), fix["gross_pay_cents"]))
+    return report, fixes
+
+
+def verify_and_repair(data_manager, repair: bool = False) -> IntegrityReport:
+    """
+    Check every shift's derived fields and optionally fix them.
+
+    Repairs are applied as one batched update: one generation, one save.
+
+    Args:
+        data_manager (DataManager): The shifts to check.
+        repair (bool, optional): Overwrite mismatched Duration and Gross pay
+            with the recomputed values.
+
+    Returns:
+        IntegrityReport: The mismatches found (and how many shifts were fixed).
+    """
+    shifts = data_manager.snapshot()
+    report, fixes = verify_shifts(shifts)
+    if repair and fixes:
+        data_manager.update_shifts({shift_id: shifts[shift_id].replace(**fix) for shift_id, fix in fixes.items()})
+        report.repaired = len(fixes)
+        logger.info(f"Repaired derived fields on {len(fixes)} shifts.")
+    return report
@@ -0,0 +1,227 @@
+# shyft/core/migrations.py
+import gzip
+import io
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from labelsmith.shyft.constants import DATA_FILE_PATH, PARTITIONS_DIR
+from labelsmith.shyft.core.partitions import summarize_partition
+from labelsmith.shyft.core.shift import (
+    DURATION,
+    GROSS_PAY,
+    SCHEMA_VERSION,
+    Shift,
+    is_v1_record,
+    upgrade_v1_record,
+)
+from labelsmith.shyft.utils.file_utils import atomic_open, atomic_write_json
+from labelsmith.shyft.utils.json_stream import iter_shift_records
+
+logger = logging.getLogger("labelsmith")
+
+# Upgrade step from each schema version to the next, applied per record.
+MIGRATIONS: Dict[int, Callable[[dict], Tuple[dict, List[str]]]] = {
+    1: upgrade_v1_record,
+}
+
+
+def record_version(record: dict, file_version: Optional[int]) -> int:
+    """
+    Work out which schema a record is in.
+
+    Files written before versioning have no `schema_version`, and a v2 file
+    can still contain v1 records appended by an older build, so the record's
+    own fields decide.
+    """
+    if is_v1_record(record):
+        return 1
+    return file_version or SCHEMA_VERSION
+
+
+def upgrade_record(record: dict, file_version: Optional[int]) -> Tuple[dict, int, List[str]]:
+    """
+    Run a record through every migration step up to SCHEMA_VERSION.
+
+    Returns:
+        Tuple[dict, int, List[str]]: The upgraded record, the version it
+        started at and any conversion issues.
+    """
+    version = start = record_version(record, file_version)
+    issues = []
+    while version < SCHEMA_VERSION:
+        record, step_issues = MIGRATIONS[version](record)
+        issues.extend(step_issues)
+        version += 1
+    return record, start, issues
+
+
+class MigrationReport:
+    """Summary of a migration (or dry run) over one data file."""
+
+    def __init__(self, path: Path, dry_run: bool):
+        self.path = Path(path)
+        self.dry_run = dry_run
+        self.file_version: Optional[int] = None
+        self.records = 0
+        self.upgraded = 0
+        self.current = 0
+        self.issues: List[Tuple[str, str]] = []
+        # Totals as the v1 code computed them (float sums of the strings)
+        # next to the exact integer totals after conversion.
+        self.float_hours = 0.0
+        self.float_gross_pay = 0.0
+        self.duration_s = 0
+        self.gross_pay_cents = 0
+        self.backup_path: Optional[Path] = None
+
+    @property
+    def changed(self) -> bool:
+        return self.upgraded > 0 or self.file_version != SCHEMA_VERSION
+
+    def add(self, shift_id: str, original: dict, upgraded: dict, start_version: int, issues: List[str]) -> None:
+        self.records += 1
+        if start_version < SCHEMA_VERSION:
+            self.upgraded += 1
+        else:
+            self.current += 1
+        self.issues.extend((shift_id, issue) for issue in issues)
+        for key, attr in ((DURATION, "float_hours"), (GROSS_PAY, "float_gross_pay")):
+            try:
+                setattr(self, attr, getattr(self, attr) + float(original[key]))
+            except (KeyError, TypeError, ValueError):
+                pass
+        shift = Shift.from_dict(upgraded)
+        self.duration_s += shift.duration_s or 0
+        self.gross_pay_cents += shift.gross_pay_cents or 0
+
+    def format(self) -> str:
+        verb = "Would upgrade" if self.dry_run else "Upgraded"
+        lines = [
+            f"{self.path}: schema v{self.file_version or 1} -> v{SCHEMA_VERSION}",
+            f"  {verb} {self.upgraded} of {self.records} records ({self.current} already current).",
+            f"  Hours: {self.float_hours:.6f} (v1 float sum) -> {self.duration_s / 3600:.6f} ({self.duration_s} s)",
+            f"  Gross pay: {self.float_gross_pay:.6f} (v1 float sum) -> "
+            f"{self.gross_pay_cents / 100:.2f} ({self.gross_pay_cents} cents)",
+        ]
+        if self.backup_path is not None:
+            lines.append(f"  Backup written to {self.backup_path}")
+        if self.issues:
+            lines.append(f"  {len(self.issues)} value(s) kept unconverted:")
+            lines.extend(f"    shift {shift_id}: {issue}" for shift_id, issue in self.issues)
+        return "\n".join(lines)
+
+
+class _Unchanged(Exception):
+    pass
+
+
+def _write_header(f) -> None:
+    f.write('{\n    "schema_version": %d,\n    "data": {' % SCHEMA_VERSION)
+
+
+def _write_record(f, shift_id: str, record: dict, first: bool) -> None:
+    # Same layout json.dump(..., indent=4) gives the whole file.
+    body = json.dumps(record, indent=4).replace("\n", "\n        ")
+    f.write(("\n" if first else ",\n") + f"        {json.dumps(shift_id)}: {body}")
+
+
+def _write_footer(f, empty: bool) -> None:
+    f.write("}\n}" if empty else "\n    }\n}")
+
+
+def migrate_file(path: Path = DATA_FILE_PATH, dry_run: bool = False, backup: bool = True) -> MigrationReport:
+    """
+    Upgrade a data file to the current schema in one streaming pass.
+
+    Records are read one at a time and written straight to a temporary file
+    that atomically replaces the original, so memory stays bounded by one
+    record regardless of file size. Before replacing, the original is copied
+    to `<name>.v<version>.bak`. With `dry_run` nothing is written and the
+    report describes what the migration would do.
+
+    Args:
+        path (Path, optional): The data file (`.json` or `.json.gz`).
+        dry_run (bool, optional): Only report. Defaults to False.
+        backup (bool, optional): Keep a copy of the original. Defaults to True.
+
+    Returns:
+        MigrationReport: Record counts, totals before/after and any values
+        that could not be converted. A file that is already current is left
+        untouched (`report.changed` is False).
+    """
+    path = Path(path)
+    report = MigrationReport(path, dry_run)
+    header: Dict[str, object] = {}
+
+    def upgraded_records():
+        for shift_id, record in iter_shift_records(path, header=header):
+            new_record, start_version, issues = upgrade_record(record, header.get("schema_version"))
+            report.add(shift_id, record, new_record, start_version, issues)
+            yield shift_id, new_record
+
+    if dry_run:
+        for _ in upgraded_records():
+            pass
+        report.file_version = header.get("schema_version")
+        return report
+
+    compressed = path.suffix == ".gz"
+    try:
+        with atomic_open(path, "wb" if compressed else "w") as raw:
+            if compressed:
+                f = io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode="wb", mtime=0), encoding="utf-8")
+            else:
+                f = raw
+            _write_header(f)
+            empty = True
+            for shift_id, record in upgraded_records():
+                _write_record(f, shift_id, record, empty)
+                empty = False
+            _write_footer(f, empty)
+            report.file_version = header.get("schema_version")
+            if compressed:
+                f.close()
+            if not report.changed:
+                # Already current; discard the temporary copy.
+                raise _Unchanged
+            if backup:
+                report.backup_path = path.with_name(f"{path.name}.v{report.file_version or 1}.bak")
+                shutil.copy2(path, report.backup_path)
+    except _Unchanged:
+        return report
+    logger.info(f"Migrated {path} to schema v{SCHEMA_VERSION}: {report.upgraded} of {report.records} records upgraded.")
+    return report
+
+
+def migrate_partitions(directory: Path = PARTITIONS_DIR, dry_run: bool = False) -> List[MigrationReport]:
+    """
+    Upgrade every partition listed in a partitioned store's manifest,
+    including sealed ones, and refresh their manifest aggregates.
+
+    Args:
+        directory (Path, optional): The partitions directory.
+        dry_run (bool, optional): Only report. Defaults to False.
+
+    Returns:
+        List[MigrationReport]: One report per partition file.
+    """
+    manifest_path = Path(directory) / "manifest.json"
+    if not manifest_path.exists():
+        return []
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    reports = []
+    for key, entry in sorted(manifest["partitions"].items()):
+        path = Path(directory) / entry["file"]
+        report = migrate_file(path, dry_run=dry_run, backup=False)
+        reports.append(report)
+        if report.changed and not dry_run:
+            entry.update(summarize_partition(record for _, record in iter_shift_records(path)))
+            for stale in ("hours", "gross_pay"):
+                entry.pop(stale, None)
+    if not dry_run and any(report.changed for report in reports):
+        atomic_write_json(manifest_path, manifest)
+    return reports
+
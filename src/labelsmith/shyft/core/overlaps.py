@@ -0,0 +1,283 @@
+# shyft/core/overlaps.py
+import heapq
+import random
+from functools import lru_cache
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from labelsmith.shyft.core.shift import parse_clock
+
+MINUTES_PER_DAY = 1440
+
+# (start, end, shift ID), in minutes since 0001-01-01; end is exclusive.
+Interval = Tuple[int, int, str]
+
+
+@lru_cache(maxsize=8192)
+def _day_number(value: str) -> Optional[int]:
+    # Shifts share dates, so rebuilding the index parses each date once.
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().toordinal()
+    except ValueError:
+        return None
+
+
+def shift_interval(shift_date, time_in, time_out) -> Optional[Tuple[int, int]]:
+    """
+    Place a shift on an absolute minute timeline.
+
+    Like calculate_duration, an Out time at or before the In time means the
+    shift ran past midnight into the next day. Equal times give an empty
+    interval, which overlaps nothing.
+
+    Args:
+        shift_date (str or date): The shift's Date (YYYY-MM-DD).
+        time_in (str or int): In time, "HH:MM" or minutes since midnight.
+        time_out (str or int): Out time, "HH:MM" or minutes since midnight.
+
+    Returns:
+        Tuple[int, int]: (start, end) in minutes, or None if a field is
+        missing or malformed.
+    """
+    if isinstance(time_in, str):
+        time_in = parse_clock(time_in)
+    if isinstance(time_out, str):
+        time_out = parse_clock(time_out)
+    if shift_date is None or time_in is None or time_out is None:
+        return None
+    day = shift_date.toordinal() if isinstance(shift_date, date) else _day_number(str(shift_date))
+    if day is None:
+        return None
+    start = day * MINUTES_PER_DAY + time_in
+    return start, start + (time_out - time_in) % MINUTES_PER_DAY
+
+
+class _Node:
+    __slots__ = ("key", "priority", "left", "right", "max_end")
+
+    def __init__(self, key: Interval, priority: float):
+        self.key = key
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_end = key[1]
+
+
+def _update(node: _Node) -> _Node:
+    node.max_end = node.key[1]
+    if node.left is not None and node.left.max_end > node.max_end:
+        node.max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > node.max_end:
+        node.max_end = node.right.max_end
+    return node
+
+
+def _split(node: Optional[_Node], key: Interval):
+    """Split into (keys < key, keys >= key)."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        return _update(node), right
+    left, node.left = _split(node.left, key)
+    return left, _update(node)
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+
+class IntervalTree:
+    """
+    Treap of half-open intervals ordered by (start, end, ID), with each node
+    carrying the largest end in its subtree. Insert and delete are expected
+    O(log n); a stabbing query is O(log n + k) for k hits, because subtrees
+    whose max end is at or before the query start are skipped.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.root: Optional[_Node] = None
+        self._random = random.Random(seed)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def build(self, keys: List[Interval]) -> None:
+        """Replace the contents with `keys` in O(n log n), building bottom-up."""
+        keys = sorted(keys)
+        # Cartesian tree over the sorted keys: one stack pass, no rotations.
+        stack: List[_Node] = []
+        for key in keys:
+            node = _Node(key, self._random.random())
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        self.root = stack[0] if stack else None
+        self._size = len(keys)
+        # Fill in max_end children-first.
+        order = []
+        pending = [self.root]
+        while pending:
+            node = pending.pop()
+            if node is not None:
+                order.append(node)
+                pending.append(node.left)
+                pending.append(node.right)
+        for node in reversed(order):
+            _update(node)
+
+    def insert(self, key: Interval) -> None:
+        left, right = _split(self.root, key)
+        self.root = _merge(_merge(left, _Node(key, self._random.random())), right)
+        self._size += 1
+
+    def remove(self, key: Interval) -> bool:
+        left, rest = _split(self.root, key)
+        # The smallest key above ours: same interval, any later ID.
+        found, right = _split(rest, (key[0], key[1], key[2] + "\0"))
+        self.root = _merge(left, right)
+        if found is None:
+            return False
+        self._size -= 1
+        return True
+
+    def overlapping(self, start: int, end: int) -> List[Interval]:
+        """Return the intervals that share at least one minute with [start, end)."""
+        hits: List[Interval] = []
+        if start >= end:
+            return hits
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_end <= start:
+                continue
+            stack.append(node.left)
+            # Keys to the right start at or after this one; none can reach
+            # back into the query once this one starts past its end.
+            if node.key[0] < end:
+                if node.key[1] > start and node.key[0] < node.key[1]:
+                    hits.append(node.key)
+                stack.append(node.right)
+        return hits
+
+
+class OverlapIndex:
+    """
+    Interval index over the shift table, kept current by DataManager like
+    ShiftIndex, so a new or edited shift can be checked against every other
+    shift in O(log n).
+    """
+
+    def __init__(self):
+        self.tree = IntervalTree()
+        self._keys: Dict[str, Interval] = {}
+
+    @staticmethod
+    def _key(shift_id: str, shift) -> Optional[Interval]:
+        span = shift_interval(shift.date, shift.time_in, shift.time_out)
+        return None if span is None else (span[0], span[1], shift_id)
+
+    def reset(self, shifts) -> None:
+        self._keys = {}
+        for shift_id, shift in shifts.items():
+            key = self._key(shift_id, shift)
+            if key is not None:
+                self._keys[shift_id] = key
+        self.tree = IntervalTree()
+        self.tree.build(list(self._keys.values()))
+
+    def _add(self, shift_id: str, shift) -> None:
+        key = self._key(shift_id, shift)
+        if key is not None:
+            self.tree.insert(key)
+            self._keys[shift_id] = key
+
+    def put(self, shift_id: str, old, new) -> None:
+        self.delete(shift_id, old)
+        self._add(shift_id, new)
+
+    def delete(self, shift_id: str, old) -> None:
+        key = self._keys.pop(shift_id, None)
+        if key is not None:
+            self.tree.remove(key)
+
+    def find(self, shift_date, time_in, time_out, exclude: Optional[str] = None) -> List[str]:
+        """
+        Return the IDs of shifts overlapping the given Date/In/Out, sorted.
+
+        Args:
+            shift_date (str or date): The Date (YYYY-MM-DD).
+            time_in (str): In time (HH:MM).
+            time_out (str): Out time (HH:MM); at or before In means the
+                shift ended the next day.
+            exclude (str, optional): A shift ID to ignore, e.g. the shift
+                being edited.
+        """
+        span = shift_interval(shift_date, time_in, time_out)
+        if span is None:
+            return []
+        return sorted(key[2] for key in self.tree.overlapping(*span) if key[2] != exclude)
+
+
+class OverlapReport:
+    """Result of a full-history overlap audit."""
+
+    def __init__(self, shifts: int):
+        self.shifts = shifts
+        # (earlier shift ID, later shift ID, overlap in minutes)
+        self.pairs: List[Tuple[str, str, int]] = []
+
+    @property
+    def conflicting_ids(self) -> List[str]:
+        return sorted({shift_id for a, b, _ in self.pairs for shift_id in (a, b)})
+
+    def format(self, max_pairs: int = 20) -> str:
+        if not self.pairs:
+            return f"Checked {self.shifts} shifts: no overlaps."
+        lines = [
+            f"Checked {self.shifts} shifts: {len(self.pairs)} overlapping pairs "
+            f"involving {len(self.conflicting_ids)} shifts."
+        ]
+        for a, b, minutes in self.pairs[:max_pairs]:
+            lines.append(f"  {a} and {b} overlap by {minutes // 60}:{minutes % 60:02d}")
+        if len(self.pairs) > max_pairs:
+            lines.append(f"  ... and {len(self.pairs) - max_pairs} more pairs")
+        return "\n".join(lines)
+
+
+def audit_overlaps(shifts) -> OverlapReport:
+    """
+    Find every pair of overlapping shifts with a sweep over start times:
+    O(n log n) plus the number of pairs reported.
+
+    Args:
+        shifts (Mapping): Shift ID -> shift.
+
+    Returns:
+        OverlapReport: The overlapping pairs, in start-time order.
+    """
+    report = OverlapReport(len(shifts))
+    intervals = sorted(
+        key for key in (OverlapIndex._key(shift_id, shift) for shift_id, shift in shifts.items())
+        if key is not None and key[0] < key[1]
+    )
+    active: List[Interval] = []  # heap of (end, start, ID) for shifts still running
+    for start, end, shift_id in intervals:
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for other_end, _, other_id in sorted(active, key=lambda item: (item[1], item[2])):
+            report.pairs.append((other_id, shift_id, min(end, other_end) - start))
+        heapq.heappush(active, (end, start, shift_id))
+    return report
@@ -0,0 +1,356 @@
+# shyft/core/partitions.py
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from labelsmith.shyft.constants import DATA_FILE_PATH, PARTITIONS_DIR
+from labelsmith.shyft.core.aggregates import AggregateCube
+from labelsmith.shyft.core.generation import NO_GUARD
+from labelsmith.shyft.core.shift import SCHEMA_VERSION, Shift, encode_shift
+from labelsmith.shyft.utils.file_utils import atomic_open, atomic_write_json
+from labelsmith.shyft.utils.json_stream import iter_shift_records
+
+logger = logging.getLogger("labelsmith")
+
+MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}")
+UNDATED = "undated"
+
+
+def _shift_id_order(shift_id: str):
+    return (0, int(shift_id), shift_id) if shift_id.isdigit() else (1, 0, shift_id)
+
+
+def summarize_partition(shifts) -> dict:
+    """
+    Compute the per-partition aggregates recorded in the manifest.
+
+    Args:
+        shifts: The shift records held by one partition.
+
+    Returns:
+        dict: Shift count, total seconds, gross pay in cents and tasks, the
+            date range, and the per (Date, Project ID, Model ID) cells that
+            let the Totals dialog count the partition without reading it.
+    """
+    summary = {"count": 0, "duration_s": 0, "gross_pay_cents": 0, "tasks": 0, "first_date": None, "last_date": None}
+    cube = AggregateCube()
+    for shift in shifts:
+        shift = Shift.from_dict(shift)
+        cube.put(None, None, shift)
+        summary["count"] += 1
+        summary["duration_s"] += shift.duration_s or 0
+        summary["gross_pay_cents"] += shift.gross_pay_cents or 0
+        summary["tasks"] += shift.tasks_completed or 0
+        date = shift.date
+        if date:
+            if summary["first_date"] is None or date < summary["first_date"]:
+                summary["first_date"] = date
+            if summary["last_date"] is None or date > summary["last_date"]:
+                summary["last_date"] = date
+    summary["cells"] = cube.cell_rows()
+    return summary
+
+
+class PartitionedStorage:
+    """
+    Persists shifts in monthly partitions with hot and cold tiers.
+
+    Shifts are grouped by the month of their Date. The current month (and any
+    shift without a usable date) lives in writable JSON partitions; months
+    that have closed are sealed into read-only gzip files. `manifest.json`
+    records each partition's file and aggregates (count, seconds, gross pay
+    cents, tasks, date range, largest shift ID), so totals and date-range
+    reads only open the partitions they need. A mutation rewrites just the
+    partition(s) holding the shift, so saves stay the size of one month
+    regardless of history.
+
+    `load()` reads only the writable partitions. Sealed months stay on disk
+    until `load_cold()` is called; until then `cold_summary()`,
+    `cold_cells()` and `cold_max_shift_id()` answer from the manifest,
+    `read_range()` streams just the months a date-range query needs, and
+    `is_loaded(date)` tells DataManager whether a shift dated `date` can be
+    written without the sealed history.
+    """
+
+    name = "partitioned"
+
+    def __init__(self, directory: Path = PARTITIONS_DIR, import_path: Optional[Path] = DATA_FILE_PATH, guard=None):
+        self.directory = Path(directory)
+        self.guard = guard or NO_GUARD
+        self.manifest_path = self.directory / "manifest.json"
+        self.import_path = Path(import_path) if import_path is not None else None
+        self.manifest = {"partitions": {}}
+        self._members: Dict[str, Set[str]] = {}
+        self._partition_of: Dict[str, str] = {}
+        # Sealed partitions listed in the manifest but not read yet.
+        self._cold: Set[str] = set()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def partition_key(shift) -> str:
+        date = str(shift.get("Date") or "")
+        return date[:7] if MONTH_PATTERN.match(date) else UNDATED
+
+    @staticmethod
+    def _is_closed(key: str) -> bool:
+        return key != UNDATED and key < datetime.now().strftime("%Y-%m")
+
+    def load(self) -> Dict[str, dict]:
+        with self._lock:
+            if not self.manifest_path.exists():
+                if self.import_path is not None and self.import_path.exists():
+                    with self.guard.writing():
+                        shifts = {
+                            shift_id: Shift.from_dict(shift)
+                            for shift_id, shift in iter_shift_records(self.import_path)
+                        }
+                        self.save(shifts)
+                    logger.info(f"Split {len(shifts)} shifts from {self.import_path} into monthly partitions.")
+                    return shifts
+                return {}
+            with self.guard.reading():
+                with open(self.manifest_path, "r") as f:
+                    self.manifest = json.load(f)
+                shifts = {}
+                self._members = {}
+                self._partition_of = {}
+                self._cold = set()
+                for key, entry in sorted(self.manifest["partitions"].items()):
+                    if entry["sealed"]:
+                        self._cold.add(key)
+                    else:
+                        self._read_partition(key, shifts)
+            self._seal_closed_partitions(shifts)
+            return shifts
+
+    def _read_partition(self, key: str, shifts: Dict[str, dict]) -> None:
+        for shift_id, shift in iter_shift_records(self.directory / self.manifest["partitions"][key]["file"]):
+            shifts[shift_id] = shift
+            self._track(shift_id, key)
+
+    def cold_partitions(self) -> List[str]:
+        """The sealed partitions `load()` left on disk, oldest first."""
+        with self._lock:
+            return sorted(self._cold)
+
+    def load_cold(self) -> Dict[str, dict]:
+        """Read every sealed partition not loaded yet and return its shifts."""
+        with self._lock, self.guard.reading():
+            shifts = {}
+            for key in sorted(self._cold):
+                self._read_partition(key, shifts)
+            self._cold = set()
+            return shifts
+
+    def is_loaded(self, date) -> bool:
+        """Whether every stored shift dated `date` was loaded (its month isn't cold)."""
+        with self._lock:
+            return self.partition_key({"Date": date}) not in self._cold
+
+    def cold_summary(self) -> dict:
+        """Count, seconds, gross pay cents and tasks of the unloaded partitions, from the manifest."""
+        with self._lock:
+            summary = {"count": 0, "duration_s": 0, "gross_pay_cents": 0, "tasks": 0}
+            for key in self._cold:
+                entry = self.manifest["partitions"][key]
+                for field in summary:
+                    summary[field] += entry[field]
+            return summary
+
+    def cold_cells(self) -> Optional[List[list]]:
+        """
+        Aggregate cells (see AggregateCube.cell_rows) of the unloaded
+        partitions, or None if a manifest entry predates the `cells` field.
+        """
+        with self._lock:
+            entries = [self.manifest["partitions"][key] for key in sorted(self._cold)]
+            if any("cells" not in entry for entry in entries):
+                return None
+            return [row for entry in entries for row in entry["cells"]]
+
+    def cold_max_shift_id(self) -> Optional[int]:
+        """
+        The largest numeric shift ID in the unloaded partitions, or None if
+        a manifest entry predates the `max_id` field and only loading can tell.
+        """
+        with self._lock:
+            entries = [self.manifest["partitions"][key] for key in self._cold]
+            if any("max_id" not in entry for entry in entries):
+                return None
+            return max((entry["max_id"] for entry in entries), default=0)
+
+    def save(self, shifts: Dict[str, dict]) -> None:
+        """Rewrite the loaded partitions from `shifts`; unloaded sealed months are kept as they are."""
+        with self._lock, self.guard.writing():
+            stale = set(self.manifest["partitions"]) - self._cold
+            self._members = {}
+            self._partition_of = {}
+            for shift_id, shift in shifts.items():
+                self._track(shift_id, self.partition_key(shift))
+            for key in self._members:
+                self._write_partition(key, shifts)
+            for key in stale - set(self._members):
+                self._drop_partition(key)
+            self._write_manifest()
+
+    def put(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        with self._lock, self.guard.writing():
+            new_key = self.partition_key(shifts[shift_id])
+            old_key = self._partition_of.get(shift_id)
+            self._check_loaded(new_key)
+            if old_key is not None and old_key != new_key:
+                self._members[old_key].discard(shift_id)
+                self._write_partition(old_key, shifts)
+            self._track(shift_id, new_key)
+            self._write_partition(new_key, shifts)
+            self._seal_closed_partitions(shifts)
+            self._write_manifest()
+
+    def delete(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        with self._lock, self.guard.writing():
+            key = self._partition_of.pop(shift_id, None)
+            if key is None:
+                return
+            self._members[key].discard(shift_id)
+            self._write_partition(key, shifts)
+            self._write_manifest()
+
+    def _check_loaded(self, key: str) -> None:
+        # Rewriting a partition we never read would drop the shifts in it.
+        if key in self._cold:
+            raise RuntimeError(f"Partition {key} is sealed and not loaded; call load_cold() first.")
+
+    def _track(self, shift_id: str, key: str) -> None:
+        self._members.setdefault(key, set()).add(shift_id)
+        self._partition_of[shift_id] = key
+
+    def _write_partition(self, key: str, shifts: Dict[str, dict]) -> None:
+        members = self._members.get(key)
+        if not members:
+            self._members.pop(key, None)
+            self._drop_partition(key)
+            return
+        records = {shift_id: shifts[shift_id] for shift_id in sorted(members, key=_shift_id_order)}
+        sealed = self._is_closed(key)
+        filename = f"{key}.json.gz" if sealed else f"{key}.json"
+        path = self.directory / filename
+        if sealed:
+            with atomic_open(path, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+                    with io.TextIOWrapper(gz, encoding="utf-8") as text:
+                        json.dump({"schema_version": SCHEMA_VERSION, "data": records}, text, default=encode_shift)
+            os.chmod(path, 0o444)
+        else:
+            atomic_write_json(path, {"schema_version": SCHEMA_VERSION, "data": records}, default=encode_shift)
+        previous = self.manifest["partitions"].get(key)
+        if previous is not None and previous["file"] != filename:
+            self._remove_file(self.directory / previous["file"])
+        self.manifest["partitions"][key] = {
+            "file": filename,
+            "sealed": sealed,
+            **summarize_partition(records.values()),
+            "max_id": max((int(shift_id) for shift_id in members if shift_id.isdigit()), default=0),
+        }
+
+    def _drop_partition(self, key: str) -> None:
+        entry = self.manifest["partitions"].pop(key, None)
+        if entry is not None:
+            self._remove_file(self.directory / entry["file"])
+
+    @staticmethod
+    def _remove_file(path: Path) -> None:
+        if path.exists():
+            os.chmod(path, 0o644)
+            os.remove(path)
+
+    def _seal_closed_partitions(self, shifts: Dict[str, dict]) -> None:
+        closed = [
+            key
+            for key, entry in self.manifest["partitions"].items()
+            if not entry["sealed"] and self._is_closed(key) and key in self._members
+        ]
+        if not closed:
+            return
+        with self.guard.writing():
+            for key in closed:
+                self._write_partition(key, shifts)
+                logger.info(f"Sealed partition {key} ({self.manifest['partitions'][key]['count']} shifts).")
+            self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        atomic_write_json(self.manifest_path, self.manifest)
+
+    def partitions_for_range(
+        self, start: Optional[str] = None, end: Optional[str] = None, include_loaded: bool = True
+    ) -> List[str]:
+        """
+        List the partition keys that can hold shifts dated within [start, end].
+
+        With `include_loaded=False`, only the sealed partitions `load()` left
+        on disk are listed.
+        """
+        start_key = str(start)[:7] if start is not None else None
+        end_key = str(end)[:7] if end is not None else None
+        with self._lock:
+            keys = self.manifest["partitions"] if include_loaded else self._cold
+            return [
+                key
+                for key in sorted(keys)
+                if key != UNDATED
+                and (start_key is None or key >= start_key)
+                and (end_key is None or key <= end_key)
+            ]
+
+    def read_range(
+        self, start: Optional[str] = None, end: Optional[str] = None, include_loaded: bool = True
+    ) -> Iterator[Tuple[str, dict]]:
+        """
+        Stream shifts dated within [start, end] from disk, opening only the
+        partitions whose month overlaps the range, one at a time, oldest
+        first. The partitions are chosen when this is called, so loading
+        them meanwhile doesn't change what the iterator returns.
+
+        Args:
+            start (str, optional): Inclusive lower bound on Date (YYYY-MM-DD).
+            end (str, optional): Inclusive upper bound on Date (YYYY-MM-DD).
+            include_loaded (bool, optional): False reads only the sealed
+                partitions not loaded yet, e.g. to complete a query over the
+                loaded shifts. Defaults to True.
+
+        Returns:
+            Iterator[Tuple[str, dict]]: Shift ID and shift record.
+        """
+        with self._lock:
+            files = [
+                self.directory / self.manifest["partitions"][key]["file"]
+                for key in self.partitions_for_range(start, end, include_loaded)
+            ]
+        return self._read_files(files, start, end)
+
+    def _read_files(self, files: List[Path], start, end) -> Iterator[Tuple[str, dict]]:
+        for path in files:
+            with self.guard.reading():
+                records = list(iter_shift_records(path))
+            for shift_id, shift in records:
+                date = str(shift.get("Date") or "")
+                if (start is None or date >= str(start)) and (end is None or date <= str(end)):
+                    yield shift_id, shift
+
+    def stored_bytes(self) -> int:
+        return sum(
+            (self.directory / entry["file"]).stat().st_size
+            for entry in self.manifest["partitions"].values()
+            if (self.directory / entry["file"]).exists()
+        )
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
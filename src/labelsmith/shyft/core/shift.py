@@ -0,0 +1,360 @@
+# shyft/core/shift.py
+import sys
+from array import array
+from collections.abc import Mapping
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional, Tuple
+
+SCHEMA_VERSION = 2
+
+DATE = "Date"
+MODEL_ID = "Model ID"
+PROJECT_ID = "Project ID"
+TIME_IN = "In (hh:mm)"
+TIME_OUT = "Out (hh:mm)"
+TASKS_COMPLETED = "Tasks completed"
+
+# Schema v1 stored money and time as two-decimal / "hh:mm" strings.
+DURATION = "Duration (hrs)"
+HOURLY_RATE = "Hourly rate"
+GROSS_PAY = "Gross pay"
+TASK_DURATIONS = "Task durations"
+TASK_DURATION = "Duration (hh:mm)"
+
+# Schema v2 stores them as integer seconds and cents.
+DURATION_SECONDS = "Duration (s)"
+HOURLY_RATE_CENTS = "Hourly rate (cents)"
+GROSS_PAY_CENTS = "Gross pay (cents)"
+TASK_DURATIONS_SECONDS = "Task durations (s)"
+
+V1_ONLY_FIELDS = (DURATION, HOURLY_RATE, GROSS_PAY, TASK_DURATIONS)
+V2_ONLY_FIELDS = (DURATION_SECONDS, HOURLY_RATE_CENTS, GROSS_PAY_CENTS, TASK_DURATIONS_SECONDS)
+
+# (v2 column, v1 column, divisor) for readers that want the v1 decimal units.
+V1_COLUMN_SCALES = (
+    (DURATION_SECONDS, DURATION, 3600),
+    (HOURLY_RATE_CENTS, HOURLY_RATE, 100),
+    (GROSS_PAY_CENTS, GROSS_PAY, 100),
+)
+
+
+def parse_clock(value) -> Optional[int]:
+    """Parse an "HH:MM" string into minutes since midnight, or None if malformed."""
+    if not isinstance(value, str) or len(value) != 5 or value[2] != ":":
+        return None
+    hours, minutes = value[:2], value[3:]
+    if not (hours.isdigit() and minutes.isdigit()):
+        return None
+    hours, minutes = int(hours), int(minutes)
+    if hours > 23 or minutes > 59:
+        return None
+    return hours * 60 + minutes
+
+
+def parse_hhmm_duration(value) -> Optional[int]:
+    """Parse an "hh:mm" duration (hours may exceed 23) into minutes, or None if malformed."""
+    if not isinstance(value, str):
+        return None
+    hours, sep, minutes = value.partition(":")
+    if not sep or not hours.isdigit() or len(minutes) != 2 or not minutes.isdigit() or int(minutes) > 59:
+        return None
+    return int(hours) * 60 + int(minutes)
+
+
+def format_clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    return f"{sign}{abs(cents) // 100}.{abs(cents) % 100:02d}"
+
+
+def parse_cents(value) -> Optional[int]:
+    """Parse a decimal amount ("130.5", 18, "18.00") into integer cents, or None."""
+    try:
+        return int((Decimal(str(value)) * 100).to_integral_value())
+    except (InvalidOperation, ValueError, OverflowError):
+        return None
+
+
+def parse_hours_to_seconds(value) -> Optional[int]:
+    """Parse a decimal hour count ("7.25") into integer seconds, or None."""
+    try:
+        return int((Decimal(str(value)) * 3600).to_integral_value())
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _parse_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_task_durations_v1(value) -> Optional[List[int]]:
+    # Task durations are stored as {"1": {"Duration (hh:mm)": "00:05"}, ...}
+    # with keys numbered from 1 in task order.
+    if not isinstance(value, dict):
+        return None
+    seconds = []
+    for position, key in enumerate(sorted(value, key=lambda k: int(k) if str(k).isdigit() else -1), start=1):
+        entry = value[key]
+        minutes = parse_hhmm_duration(entry.get(TASK_DURATION)) if isinstance(entry, dict) else None
+        if str(key) != str(position) or minutes is None or len(entry) != 1:
+            return None
+        seconds.append(minutes * 60)
+    return seconds
+
+
+_V1_CONVERSIONS = {
+    DURATION: (DURATION_SECONDS, parse_hours_to_seconds),
+    HOURLY_RATE: (HOURLY_RATE_CENTS, parse_cents),
+    GROSS_PAY: (GROSS_PAY_CENTS, parse_cents),
+    TASK_DURATIONS: (TASK_DURATIONS_SECONDS, _parse_task_durations_v1),
+}
+
+
+def is_v1_record(record) -> bool:
+    # A v2 record can still carry a v1 key whose value didn't convert.
+    return any(key in record for key in V1_ONLY_FIELDS) and not any(key in record for key in V2_ONLY_FIELDS)
+
+
+def upgrade_v1_record(record: dict) -> Tuple[dict, List[str]]:
+    """
+    Convert a schema v1 shift record to schema v2.
+
+    Money becomes integer cents, durations integer seconds and the task count
+    an integer. Values that can't be converted are kept verbatim under their
+    v1 key and reported.
+
+    Args:
+        record (dict): The v1 shift record.
+
+    Returns:
+        Tuple[dict, List[str]]: The v2 record and a list of conversion issues.
+    """
+    upgraded, issues = {}, []
+    for key, value in record.items():
+        if key in _V1_CONVERSIONS:
+            new_key, parse = _V1_CONVERSIONS[key]
+            converted = parse(value)
+            if converted is None:
+                upgraded[key] = value
+                issues.append(f"{key} = {value!r} could not be converted and was kept as-is")
+            else:
+                upgraded[new_key] = converted
+        elif key == TASKS_COMPLETED:
+            converted = _parse_int(value)
+            upgraded[key] = value if converted is None else converted
+            if converted is None:
+                issues.append(f"{key} = {value!r} is not an integer and was kept as-is")
+        else:
+            upgraded[key] = value
+    return upgraded, issues
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Shift(Mapping):
+    """
+    Compact in-memory shift record.
+
+    Durations are integer seconds and money integer cents (schema v2), clock
+    times are minutes since midnight, identifiers are interned and task
+    durations are packed into an array of seconds. The record also reads as a
+    mapping with the v1 field names ("Duration (hrs)" -> "7.25", ...), so GUI
+    code written against that layout keeps working. Records are never mutated
+    after creation; updates replace them.
+    """
+
+    __slots__ = (
+        "date",
+        "model_id",
+        "project_id",
+        "time_in",
+        "time_out",
+        "duration_s",
+        "hourly_rate_cents",
+        "gross_pay_cents",
+        "tasks_completed",
+        "task_durations",
+        "extra",
+    )
+
+    def __init__(
+        self,
+        date=None,
+        model_id=None,
+        project_id=None,
+        time_in: Optional[int] = None,
+        time_out: Optional[int] = None,
+        duration_s: Optional[int] = None,
+        hourly_rate_cents: Optional[int] = None,
+        gross_pay_cents: Optional[int] = None,
+        tasks_completed: Optional[int] = None,
+        task_durations: Optional[array] = None,
+        extra: Optional[dict] = None,
+    ):
+        self.date = _intern(date)
+        self.model_id = _intern(model_id)
+        self.project_id = _intern(project_id)
+        self.time_in = time_in
+        self.time_out = time_out
+        self.duration_s = duration_s
+        self.hourly_rate_cents = hourly_rate_cents
+        self.gross_pay_cents = gross_pay_cents
+        self.tasks_completed = tasks_completed
+        self.task_durations = task_durations
+        # Fields we don't model, and values that didn't parse, kept verbatim.
+        self.extra = extra or None
+
+    @property
+    def duration_hrs(self) -> Optional[float]:
+        return None if self.duration_s is None else self.duration_s / 3600
+
+    @property
+    def hourly_rate(self) -> Optional[float]:
+        return None if self.hourly_rate_cents is None else self.hourly_rate_cents / 100
+
+    @property
+    def gross_pay(self) -> Optional[float]:
+        return None if self.gross_pay_cents is None else self.gross_pay_cents / 100
+
+    @classmethod
+    def from_dict(cls, record) -> "Shift":
+        """Build a Shift from a record in either the v1 or v2 JSON layout."""
+        if isinstance(record, Shift):
+            return record
+        if is_v1_record(record):
+            record, _ = upgrade_v1_record(record)
+        else:
+            record = dict(record)
+        shift = cls(
+            date=record.pop(DATE, None),
+            model_id=record.pop(MODEL_ID, None),
+            project_id=record.pop(PROJECT_ID, None),
+        )
+        for key, attr, parse in (
+            (TIME_IN, "time_in", parse_clock),
+            (TIME_OUT, "time_out", parse_clock),
+            (DURATION_SECONDS, "duration_s", _parse_int),
+            (HOURLY_RATE_CENTS, "hourly_rate_cents", _parse_int),
+            (GROSS_PAY_CENTS, "gross_pay_cents", _parse_int),
+            (TASKS_COMPLETED, "tasks_completed", _parse_int),
+        ):
+            if key in record:
+                value = parse(record[key])
+                if value is not None:
+                    setattr(shift, attr, value)
+                    del record[key]
+        durations = record.get(TASK_DURATIONS_SECONDS)
+        if isinstance(durations, list) and all(isinstance(s, int) and s >= 0 for s in durations):
+            shift.task_durations = array("I", durations)
+            del record[TASK_DURATIONS_SECONDS]
+        shift.extra = record or None
+        return shift
+
+    def to_record(self) -> dict:
+        """Convert to the schema v2 JSON layout written to disk."""
+        record = {}
+        for key, value in (
+            (DATE, self.date),
+            (MODEL_ID, self.model_id),
+            (PROJECT_ID, self.project_id),
+            (TIME_IN, None if self.time_in is None else format_clock(self.time_in)),
+            (TIME_OUT, None if self.time_out is None else format_clock(self.time_out)),
+            (DURATION_SECONDS, self.duration_s),
+            (HOURLY_RATE_CENTS, self.hourly_rate_cents),
+            (GROSS_PAY_CENTS, self.gross_pay_cents),
+            (TASKS_COMPLETED, self.tasks_completed),
+            (TASK_DURATIONS_SECONDS, None if self.task_durations is None else list(self.task_durations)),
+        ):
+            if value is not None:
+                record[key] = value
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    def replace(self, **changes) -> "Shift":
+        """Return a copy with the given attributes changed, e.g. replace(project_id="P2")."""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return Shift(**fields)
+
+    def to_dict(self) -> dict:
+        """Convert to the v1 display layout (two-decimal and "hh:mm" strings)."""
+        return dict(self.items())
+
+    def _get_field(self, key):
+        if key == DATE:
+            return self.date
+        if key == MODEL_ID:
+            return self.model_id
+        if key == PROJECT_ID:
+            return self.project_id
+        if key == TIME_IN:
+            return None if self.time_in is None else format_clock(self.time_in)
+        if key == TIME_OUT:
+            return None if self.time_out is None else format_clock(self.time_out)
+        if key == DURATION:
+            return None if self.duration_s is None else f"{self.duration_s / 3600:.2f}"
+        if key == HOURLY_RATE:
+            return None if self.hourly_rate_cents is None else format_cents(self.hourly_rate_cents)
+        if key == GROSS_PAY:
+            return None if self.gross_pay_cents is None else format_cents(self.gross_pay_cents)
+        if key == TASKS_COMPLETED:
+            return None if self.tasks_completed is None else str(self.tasks_completed)
+        if key == TASK_DURATIONS:
+            if self.task_durations is None:
+                return None
+            return {
+                str(i): {TASK_DURATION: format_clock(seconds // 60)}
+                for i, seconds in enumerate(self.task_durations, start=1)
+            }
+        return None
+
+    def __getitem__(self, key):
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        value = self._get_field(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        for key in _FIELD_ORDER:
+            if self._get_field(key) is not None:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Shift({self.to_record()!r})"
+
+
+_FIELD_ORDER = (
+    DATE,
+    MODEL_ID,
+    PROJECT_ID,
+    TIME_IN,
+    TIME_OUT,
+    DURATION,
+    HOURLY_RATE,
+    GROSS_PAY,
+    TASKS_COMPLETED,
+    TASK_DURATIONS,
+)
+
+
+def encode_shift(obj):
+    """`default` hook for json.dump that writes Shift records in the v2 layout."""
+    if isinstance(obj, Shift):
+        return obj.to_record()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,46 @@
+# shyft/core/snapshot.py
+from collections.abc import Mapping
+
+
+class ShiftSnapshot(Mapping):
+    """
+    Read-only view of the shift table as of one DataManager generation.
+
+    Taking a snapshot is O(1): it shares the manager's dict and the Shift
+    records in it. The manager copies the dict before its next mutation
+    (copy-on-write), and Shift records are never mutated in place, so the
+    view stays consistent while the GUI keeps writing. Readers on other
+    threads can iterate it without locking; `is_current` tells them whether
+    newer data exists.
+
+    The manager holds its snapshot only weakly, so a snapshot is what keeps
+    the shared table from being written to: hold on to it (not just an
+    iterator over its dict) while reading.
+    """
+
+    __slots__ = ("_shifts", "generation", "_owner", "__weakref__")
+
+    def __init__(self, shifts, generation: int, owner):
+        self._shifts = shifts
+        self.generation = generation
+        self._owner = owner
+
+    @property
+    def is_current(self) -> bool:
+        return self._owner.generation == self.generation
+
+    def __getitem__(self, shift_id):
+        return self._shifts[shift_id]
+
+    def __iter__(self):
+        # A generator, so iterating keeps the snapshot (and its claim on the table) alive.
+        yield from self._shifts
+
+    def __len__(self):
+        return len(self._shifts)
+
+    def __contains__(self, shift_id):
+        return shift_id in self._shifts
+
+    def __repr__(self):
+        return f"<ShiftSnapshot generation={self.generation} shifts={len(self._shifts)}>"
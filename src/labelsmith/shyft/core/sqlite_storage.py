@@ -0,0 +1,256 @@
+# shyft/core/sqlite_storage.py
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from labelsmith.shyft.constants import DATA_FILE_PATH, SQLITE_DB_PATH
+from labelsmith.shyft.core.generation import NO_GUARD
+from labelsmith.shyft.core.shift import Shift, encode_shift
+from labelsmith.shyft.utils.json_stream import iter_shift_records
+
+logger = logging.getLogger("labelsmith")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shifts (
+    id TEXT PRIMARY KEY,
+    id_num INTEGER NOT NULL,
+    date TEXT,
+    model_id TEXT,
+    project_id TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_shifts_id_num ON shifts (id_num);
+CREATE INDEX IF NOT EXISTS idx_shifts_date ON shifts (date);
+CREATE INDEX IF NOT EXISTS idx_shifts_model_id ON shifts (model_id, date);
+CREATE INDEX IF NOT EXISTS idx_shifts_project_id ON shifts (project_id, date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Records read per statement by iter_query; under SQLite's parameter limit.
+QUERY_BATCH_SIZE = 500
+
+
+def shift_id_num(shift_id: str) -> int:
+    """The numeric sort key of a shift ID; IDs that aren't digits get -1 and sort first."""
+    return int(shift_id) if shift_id.isdigit() else -1
+
+
+class SQLiteStorage:
+    """
+    Persists shifts in a local SQLite database.
+
+    Each shift is stored as its JSON record alongside indexed Date, Model ID
+    and Project ID columns, so every write is a single transactional row
+    update and range lookups go through an index instead of a full scan.
+    A full save writes only the shifts whose record changed since they were
+    last written, and deletes the ones that are gone. On first use the
+    existing `data.json` is imported in one transaction.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path = SQLITE_DB_PATH, import_path: Optional[Path] = DATA_FILE_PATH, guard=None):
+        self.path = Path(path)
+        self.import_path = Path(import_path) if import_path is not None else None
+        self.guard = guard or NO_GUARD
+        self._lock = threading.RLock()
+        self._conn = None
+        # Shift ID -> Shift last written; Shift records are never mutated, so
+        # identity tells us whether a row needs rewriting.
+        self._written: Dict[str, Shift] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def _row(shift_id: str, shift: Shift) -> Tuple:
+        return (
+            shift_id,
+            shift_id_num(shift_id),
+            shift.date,
+            shift.model_id,
+            shift.project_id,
+            json.dumps(shift, separators=(",", ":"), default=encode_shift),
+        )
+
+    def load(self) -> Dict[str, Shift]:
+        with self._lock:
+            if self.import_path is not None and self._get_meta("imported_from") is None:
+                self.import_json(self.import_path)
+            rows = self.conn.execute("SELECT id, record FROM shifts ORDER BY id_num").fetchall()
+            shifts = {shift_id: Shift.from_dict(json.loads(record)) for shift_id, record in rows}
+            self._written = dict(shifts)
+        return shifts
+
+    def save(self, shifts: Dict[str, dict]) -> None:
+        with self._lock:
+            gone = [(shift_id,) for shift_id in self._written if shift_id not in shifts]
+            changed = {
+                shift_id: Shift.from_dict(shift)
+                for shift_id, shift in shifts.items()
+                if self._written.get(shift_id) is not shift
+            }
+            with self.guard.writing(), self.conn:
+                self.conn.executemany("DELETE FROM shifts WHERE id = ?", gone)
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO shifts VALUES (?, ?, ?, ?, ?, ?)",
+                    [self._row(shift_id, shift) for shift_id, shift in changed.items()],
+                )
+            # Only once the transaction committed: after a failed one the
+            # next save still sees these rows as unwritten.
+            for (shift_id,) in gone:
+                del self._written[shift_id]
+            self._written.update(changed)
+        logger.debug(f"Wrote {len(changed)} changed shifts; removed {len(gone)}.")
+
+    def put(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        with self._lock:
+            shift = Shift.from_dict(shifts[shift_id])
+            with self.guard.writing(), self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO shifts VALUES (?, ?, ?, ?, ?, ?)", self._row(shift_id, shift))
+            self._written[shift_id] = shift
+
+    def delete(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        with self._lock:
+            with self.guard.writing(), self.conn:
+                self.conn.execute("DELETE FROM shifts WHERE id = ?", (shift_id,))
+            self._written.pop(shift_id, None)
+
+    @staticmethod
+    def _where(start, end, model, project) -> Tuple[str, list]:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(str(start))
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(str(end))
+        if model is not None:
+            clauses.append("model_id = ?")
+            params.append(model)
+        if project is not None:
+            clauses.append("project_id = ?")
+            params.append(project)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def query(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        model: Optional[str] = None,
+        project: Optional[str] = None,
+    ) -> List[Tuple[str, Shift]]:
+        """
+        Fetch shifts matching the given filters through the table indexes.
+
+        Args:
+            start (str or date, optional): Inclusive lower bound on Date (YYYY-MM-DD).
+            end (str or date, optional): Inclusive upper bound on Date (YYYY-MM-DD).
+            model (str, optional): Exact Model ID to match.
+            project (str, optional): Exact Project ID to match.
+
+        Returns:
+            List[Tuple[str, Shift]]: (shift ID, shift) pairs ordered by date, then ID.
+        """
+        where, params = self._where(start, end, model, project)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id, record FROM shifts {where} ORDER BY date, id_num", params
+            ).fetchall()
+        return [(shift_id, Shift.from_dict(json.loads(record))) for shift_id, record in rows]
+
+    def iter_query(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        model: Optional[str] = None,
+        project: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Shift]]:
+        """
+        Like query(), but yield the matches one at a time: the matching IDs
+        are listed first, then their records are read QUERY_BATCH_SIZE at a
+        time. A shift deleted meanwhile is skipped.
+        """
+        where, params = self._where(start, end, model, project)
+        with self._lock:
+            ids = [shift_id for (shift_id,) in self.conn.execute(
+                f"SELECT id FROM shifts {where} ORDER BY date, id_num", params
+            )]
+        for i in range(0, len(ids), QUERY_BATCH_SIZE):
+            batch = ids[i:i + QUERY_BATCH_SIZE]
+            with self._lock:
+                records = dict(self.conn.execute(
+                    f"SELECT id, record FROM shifts WHERE id IN ({', '.join('?' * len(batch))})", batch
+                ))
+            for shift_id in batch:
+                if shift_id in records:
+                    yield shift_id, Shift.from_dict(json.loads(records[shift_id]))
+
+    def get_max_shift_id(self) -> int:
+        with self._lock:
+            (max_id,) = self.conn.execute("SELECT MAX(id_num) FROM shifts").fetchone()
+        return max_id or 0
+
+    def import_json(self, json_path: Path) -> int:
+        """
+        One-shot import of an existing `data.json` into the database.
+
+        The import runs in a single transaction and is recorded in the `meta`
+        table, so it never runs twice. The source file is left untouched.
+
+        Args:
+            json_path (Path): The JSON data file to import.
+
+        Returns:
+            int: The number of shifts imported.
+        """
+        json_path = Path(json_path)
+        with self._lock:
+            if not json_path.exists():
+                self._set_meta("imported_from", "")
+                return 0
+            with self.guard.writing(), self.conn:
+                cursor = self.conn.executemany(
+                    "INSERT OR REPLACE INTO shifts VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self._row(shift_id, Shift.from_dict(shift))
+                        for shift_id, shift in iter_shift_records(json_path)
+                    ),
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('imported_from', ?)", (str(json_path),)
+                )
+        logger.info(f"Imported {cursor.rowcount} shifts from {json_path} into {self.path}.")
+        return cursor.rowcount
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def stored_bytes(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,363 @@
+# shyft/core/storage.py
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from labelsmith.shyft.constants import DATA_FILE_PATH, JOURNAL_FILE_PATH
+from labelsmith.shyft.core.encrypted_storage import EncryptedStorage
+from labelsmith.shyft.core.generation import NO_GUARD
+from labelsmith.shyft.core.partitions import PartitionedStorage
+from labelsmith.shyft.core.shift import SCHEMA_VERSION, encode_shift
+from labelsmith.shyft.core.sqlite_storage import SQLiteStorage
+from labelsmith.shyft.utils.file_utils import atomic_write_json
+from labelsmith.shyft.utils.json_stream import iter_shift_records
+
+logger = logging.getLogger("labelsmith")
+
+
+class WriteBehindSaver:
+    """
+    Coalesces bursts of save requests into a single background write.
+
+    `mark_dirty` only records that the table changed. A writer thread waits
+    until no new changes have arrived for `delay` seconds (or the oldest
+    unsaved change is `max_delay` seconds old) and then serializes the latest
+    state once. `flush` writes any pending state on the calling thread.
+    """
+
+    def __init__(self, write, delay: float = 0.5, max_delay: float = 5.0):
+        self._write = write
+        self.delay = delay
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._shifts = None
+        self._dirty_since = None
+        self._last_mark = None
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def mark_dirty(self, shifts: Dict[str, dict]) -> None:
+        with self._cond:
+            now = time.monotonic()
+            self._shifts = shifts
+            if self._dirty_since is None:
+                self._dirty_since = now
+            self._last_mark = now
+            if self._thread is None or not self._thread.is_alive():
+                # Daemon thread: the app process may exit without joining it,
+                # which is why callers must flush() before quitting.
+                self._thread = threading.Thread(
+                    target=self._run, name="shyft-write-behind", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._dirty_since is None and not self._closed:
+                    self._cond.wait()
+                if self._dirty_since is None:
+                    return
+                while not self._closed and self._dirty_since is not None:
+                    deadline = min(self._last_mark + self.delay, self._dirty_since + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            try:
+                self._write_pending()
+            except Exception as e:
+                logger.error(f"Background save failed: {e}")
+
+    def _write_pending(self) -> None:
+        with self._write_lock:
+            with self._cond:
+                if self._dirty_since is None:
+                    return
+                self._dirty_since = None
+                # Shift records are replaced on update, never mutated in place,
+                # so a shallow copy is a consistent snapshot of the table.
+                snapshot = dict(self._shifts)
+            try:
+                self._write(snapshot)
+            except Exception:
+                with self._cond:
+                    if self._dirty_since is None:
+                        self._dirty_since = self._last_mark = time.monotonic()
+                raise
+
+    def flush(self) -> None:
+        self._write_pending()
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+
+class JsonStorage:
+    """
+    Persists the whole shift table as a single JSON document.
+
+    Saves are atomic: the document is written to a temporary file, fsynced and
+    moved over `data.json`. With `write_behind` enabled, mutations only mark
+    the table dirty and a background writer coalesces them into one save.
+    Writes and loads go through `guard` (see core.generation.WriteGuard) so
+    other processes can coordinate with them.
+    """
+
+    name = "json"
+
+    def __init__(
+        self,
+        path: Path = DATA_FILE_PATH,
+        write_behind: bool = False,
+        write_delay: float = 0.5,
+        guard=None,
+    ):
+        self.path = Path(path)
+        self.guard = guard or NO_GUARD
+        self._saver = WriteBehindSaver(self.save, delay=write_delay) if write_behind else None
+
+    def load(self) -> Dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        with self.guard.reading():
+            return dict(iter_shift_records(self.path))
+
+    def stored_bytes(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def save(self, shifts: Dict[str, dict]) -> None:
+        with self.guard.writing():
+            atomic_write_json(self.path, {"schema_version": SCHEMA_VERSION, "data": shifts}, default=encode_shift)
+
+    def put(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        self._schedule_save(shifts)
+
+    def delete(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        self._schedule_save(shifts)
+
+    def _schedule_save(self, shifts: Dict[str, dict]) -> None:
+        if self._saver is not None:
+            self._saver.mark_dirty(shifts)
+        else:
+            self.save(shifts)
+
+    def flush(self) -> None:
+        if self._saver is not None:
+            self._saver.flush()
+
+    def close(self) -> None:
+        if self._saver is not None:
+            self._saver.close()
+
+
+class JournalStorage(JsonStorage):
+    """
+    Persists shifts as a JSON snapshot plus an append-only journal.
+
+    Every mutation appends one small record to the journal, so the cost of a
+    write no longer depends on the size of the history. Once the journal grows
+    past `compact_threshold` bytes it is rotated aside and a background thread
+    folds the current state into a fresh snapshot. State is rebuilt at load by
+    replaying the rotated journal (if a compaction was interrupted) and then
+    the live journal over the snapshot. Replaying a record twice is harmless,
+    so a crash at any point during compaction leaves the store consistent.
+    """
+
+    name = "journal"
+
+    def __init__(
+        self,
+        path: Path = DATA_FILE_PATH,
+        journal_path: Path = JOURNAL_FILE_PATH,
+        compact_threshold: int = 1024 * 1024,
+        guard=None,
+    ):
+        super().__init__(path, guard=guard)
+        self.journal_path = Path(journal_path)
+        self.compacting_path = self.journal_path.with_name(self.journal_path.name + ".compacting")
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journal_size = 0
+        self._compactor: Optional[threading.Thread] = None
+
+    def load(self) -> Dict[str, dict]:
+        with self.guard.reading():
+            shifts = super().load()
+            replayed = 0
+            for journal_path in (self.compacting_path, self.journal_path):
+                replayed += self._replay(journal_path, shifts)
+        if replayed:
+            logger.debug(f"Replayed {replayed} journal records over snapshot {self.path}.")
+        return shifts
+
+    def stored_bytes(self) -> int:
+        return super().stored_bytes() + sum(
+            p.stat().st_size for p in (self.compacting_path, self.journal_path) if p.exists()
+        )
+
+    def _replay(self, journal_path: Path, shifts: Dict[str, dict]) -> int:
+        if not journal_path.exists():
+            return 0
+        count = 0
+        with open(journal_path, "r") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final record from a crash mid-append; everything
+                    # before it is intact.
+                    logger.warning(f"Ignoring truncated journal record at {journal_path}:{line_number}.")
+                    break
+                if record["op"] == "put":
+                    shifts[record["id"]] = record["shift"]
+                elif record["op"] == "del":
+                    shifts.pop(record["id"], None)
+                count += 1
+        return count
+
+    def save(self, shifts: Dict[str, dict]) -> None:
+        """Write a full snapshot synchronously and discard the journal."""
+        with self._lock:
+            self._wait_for_compaction()
+            self._close_journal()
+            with self.guard.writing():
+                atomic_write_json(self.path, {"schema_version": SCHEMA_VERSION, "data": shifts}, default=encode_shift)
+                for journal_path in (self.compacting_path, self.journal_path):
+                    if journal_path.exists():
+                        os.remove(journal_path)
+            self._journal_size = 0
+
+    def put(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        self._append({"op": "put", "id": shift_id, "shift": shifts[shift_id]}, shifts)
+
+    def delete(self, shifts: Dict[str, dict], shift_id: str) -> None:
+        self._append({"op": "del", "id": shift_id}, shifts)
+
+    def _append(self, record: dict, shifts: Dict[str, dict]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=encode_shift) + "\n"
+        with self._lock, self.guard.writing():
+            journal = self._open_journal()
+            journal.write(line)
+            journal.flush()
+            os.fsync(journal.fileno())
+            self._journal_size += len(line)
+            if self._journal_size >= self.compact_threshold:
+                self.compact(shifts)
+
+    def _open_journal(self):
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, "a")
+            self._journal_size = self._journal.tell()
+        return self._journal
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def compact(self, shifts: Dict[str, dict]) -> None:
+        """
+        Rotate the journal and write a new snapshot in a background thread.
+
+        Must be called with the in-memory state matching everything already
+        journaled; the state is copied here so later mutations don't leak
+        into the snapshot being written.
+        """
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._close_journal()
+            if self.compacting_path.exists():
+                # A previous compaction never finished; keep its records ahead
+                # of the live journal so replay order is preserved.
+                if self.journal_path.exists():
+                    with open(self.journal_path, "r") as src, open(self.compacting_path, "a") as dst:
+                        dst.write(src.read())
+                    os.remove(self.journal_path)
+            elif self.journal_path.exists():
+                os.replace(self.journal_path, self.compacting_path)
+            self._journal_size = 0
+            snapshot = dict(shifts)
+            self._compactor = threading.Thread(
+                target=self._write_snapshot, args=(snapshot,), name="shyft-journal-compactor"
+            )
+            self._compactor.start()
+
+    def _write_snapshot(self, snapshot: Dict[str, dict]) -> None:
+        try:
+            with self.guard.writing():
+                atomic_write_json(self.path, {"schema_version": SCHEMA_VERSION, "data": snapshot}, default=encode_shift)
+                os.remove(self.compacting_path)
+            logger.debug(f"Compacted journal into snapshot of {len(snapshot)} shifts.")
+        except Exception as e:
+            logger.error(f"Journal compaction failed: {e}")
+
+    def _wait_for_compaction(self) -> None:
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._wait_for_compaction()
+            self._close_journal()
+
+
+STORAGE_BACKENDS = {
+    JsonStorage.name: JsonStorage,
+    JournalStorage.name: JournalStorage,
+    SQLiteStorage.name: SQLiteStorage,
+    PartitionedStorage.name: PartitionedStorage,
+    EncryptedStorage.name: EncryptedStorage,
+}
+
+
+def backend_name(config) -> str:
+    """The storage backend selected in the `[Storage]` section of the config."""
+    return config.get("Storage", "backend", fallback="json")
+
+
+def create_storage(config, guard=None):
+    """
+    Build the storage backend selected in the `[Storage]` section of the config.
+
+    Args:
+        config (configparser.ConfigParser): The loaded application config.
+        guard (WriteGuard, optional): Cross-process lock and generation
+            publisher the backend wraps its reads and writes in.
+
+    Returns:
+        The configured storage backend.
+    """
+    backend = backend_name(config)
+    if backend == JournalStorage.name:
+        return JournalStorage(
+            compact_threshold=config.getint("Storage", "journal_compact_bytes", fallback=1024 * 1024),
+            guard=guard,
+        )
+    if backend == SQLiteStorage.name:
+        return SQLiteStorage(guard=guard)
+    if backend == PartitionedStorage.name:
+        return PartitionedStorage(guard=guard)
+    if backend == EncryptedStorage.name:
+        return EncryptedStorage(guard=guard)
+    if backend not in STORAGE_BACKENDS:
+        logger.warning(f"Unknown storage backend '{backend}'. Falling back to JSON storage.")
+    return JsonStorage(
+        write_behind=config.getboolean("Storage", "write_behind", fallback=False),
+        write_delay=config.getfloat("Storage", "write_behind_delay", fallback=0.5),
+        guard=guard,
+    )
@@ -0,0 +1,367 @@
+# shyft/core/sync.py
+import hashlib
+import json
+import logging
+import os
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from labelsmith.shyft.constants import LOGS_DIR, SYNC_STATE_DIR
+from labelsmith.shyft.core.shift import Shift
+from labelsmith.shyft.utils.file_lock import FileLock
+from labelsmith.shyft.utils.file_utils import atomic_open, atomic_write_json
+
+logger = logging.getLogger("labelsmith")
+
+SYNC_FORMAT = 1
+BUCKETS = [f"{i:02x}" for i in range(256)]
+
+# A shift's sync state: (digest of its v2 record, digest of its Markdown log or None).
+Entry = Tuple[str, Optional[str]]
+
+
+def bucket_of(shift_id: str) -> str:
+    return hashlib.sha256(shift_id.encode()).hexdigest()[:2]
+
+
+def bucket_digest(entries: Dict[str, Entry]) -> str:
+    h = hashlib.sha256()
+    for shift_id in sorted(entries):
+        record, log = entries[shift_id]
+        h.update(f"{shift_id}\0{record}\0{log or ''}\n".encode())
+    return h.hexdigest()
+
+
+EMPTY_BUCKET = bucket_digest({})
+
+
+def root_digest(bucket_digests: Dict[str, str]) -> str:
+    h = hashlib.sha256()
+    for bucket in BUCKETS:
+        h.update(bucket_digests.get(bucket, EMPTY_BUCKET).encode())
+    return h.hexdigest()
+
+
+def leaf_digest(entry: Entry) -> str:
+    return hashlib.sha256(f"{entry[0]}\0{entry[1] or ''}".encode()).hexdigest()
+
+
+def encode_record(shift) -> bytes:
+    """Canonical bytes of a shift's v2 record; equal shifts give equal bytes."""
+    return json.dumps(Shift.from_dict(shift).to_record(), sort_keys=True, separators=(",", ":")).encode()
+
+
+def _group(entries: Dict[str, Entry]) -> Dict[str, Dict[str, Entry]]:
+    buckets: Dict[str, Dict[str, Entry]] = {}
+    for shift_id, entry in entries.items():
+        buckets.setdefault(bucket_of(shift_id), {})[shift_id] = entry
+    return buckets
+
+
+def _max_id(shift_ids) -> int:
+    return max((int(shift_id) for shift_id in shift_ids if shift_id.isdigit()), default=0)
+
+
+class SharedFolder:
+    """
+    The sync replica in a shared directory.
+
+    Layout:
+        root.json          root digest, the digest of each non-empty bucket
+                           and the highest shift ID
+        buckets/<bb>.json  shift ID -> [record digest, log digest] for the
+                           IDs whose sha256 starts with <bb>
+        records/<dd>/<digest>.json, logs/<dd>/<digest>.md
+                           content-addressed records and Markdown logs
+
+    Two levels of digests mean a sync reads root.json plus only the buckets
+    that differ, and copies only the records and logs it is missing.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def lock(self) -> FileLock:
+        return FileLock(self.root / "sync.lock", timeout=60.0)
+
+    def read_root(self) -> dict:
+        try:
+            with open(self.root / "root.json", "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"format": SYNC_FORMAT, "root": root_digest({}), "buckets": {}, "max_id": 0}
+
+    def write_root(self, bucket_digests: Dict[str, str], max_id: int) -> None:
+        bucket_digests = {b: d for b, d in sorted(bucket_digests.items()) if d != EMPTY_BUCKET}
+        atomic_write_json(
+            self.root / "root.json",
+            {"format": SYNC_FORMAT, "root": root_digest(bucket_digests), "buckets": bucket_digests, "max_id": max_id},
+        )
+
+    def read_bucket(self, bucket: str) -> Dict[str, Entry]:
+        try:
+            with open(self.root / "buckets" / f"{bucket}.json", "r") as f:
+                return {shift_id: tuple(entry) for shift_id, entry in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+
+    def write_bucket(self, bucket: str, entries: Dict[str, Entry]) -> None:
+        atomic_write_json(
+            self.root / "buckets" / f"{bucket}.json",
+            {shift_id: list(entries[shift_id]) for shift_id in sorted(entries)},
+            indent=None,
+        )
+
+    def _blob_path(self, kind: str, digest: str, suffix: str) -> Path:
+        return self.root / kind / digest[:2] / f"{digest}{suffix}"
+
+    def put_blob(self, kind: str, digest: str, suffix: str, data: bytes) -> bool:
+        path = self._blob_path(kind, digest, suffix)
+        if path.exists():
+            return False
+        with atomic_open(path, "wb") as f:
+            f.write(data)
+        return True
+
+    def get_blob(self, kind: str, digest: str, suffix: str) -> bytes:
+        data = self._blob_path(kind, digest, suffix).read_bytes()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"{kind} blob {digest} in {self.root} is corrupt.")
+        return data
+
+
+class SyncReport:
+    """What a sync changed on each side."""
+
+    def __init__(self, share: Path, dry_run: bool):
+        self.share = Path(share)
+        self.dry_run = dry_run
+        self.buckets_checked = 0
+        self.pulled: List[str] = []
+        self.pushed: List[str] = []
+        self.deleted_local: List[str] = []
+        self.deleted_remote: List[str] = []
+        # (local ID, new ID) for local shifts whose ID the remote had already used.
+        self.rekeyed: List[Tuple[str, str]] = []
+        # IDs changed on both sides, resolved by digest.
+        self.conflicts: List[str] = []
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.pulled or self.pushed or self.deleted_local or self.deleted_remote)
+
+    def format(self) -> str:
+        verb = "Would sync" if self.dry_run else "Synced"
+        lines = [
+            f"{verb} with {self.share}: {len(self.pulled)} pulled, {len(self.pushed)} pushed, "
+            f"{len(self.deleted_local)} deleted locally, {len(self.deleted_remote)} deleted remotely "
+            f"({self.buckets_checked} of {len(BUCKETS)} buckets differed)."
+        ]
+        for old, new in self.rekeyed:
+            lines.append(f"  Local shift {old} collided with a remote shift and is now {new}.")
+        for shift_id in self.conflicts:
+            lines.append(f"  Shift {shift_id} changed on both sides; kept the version with the higher digest.")
+        return "\n".join(lines)
+
+
+def _state_path(state_dir: Path, share: Path) -> Path:
+    key = hashlib.sha256(str(share.resolve()).encode()).hexdigest()[:16]
+    return Path(state_dir) / f"{key}.json"
+
+
+def _load_base(path: Path) -> Dict[str, Entry]:
+    try:
+        with open(path, "r") as f:
+            return {shift_id: tuple(entry) for shift_id, entry in json.load(f)["entries"].items()}
+    except FileNotFoundError:
+        return {}
+
+
+def _log_digests(logs_dir: Path) -> Dict[str, str]:
+    digests = {}
+    try:
+        with os.scandir(logs_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".md") and entry.is_file():
+                    with open(entry.path, "rb") as f:
+                        digests[entry.name[:-3]] = hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        pass
+    return digests
+
+
+def local_entries(shifts, logs_dir: Path = LOGS_DIR) -> Dict[str, Entry]:
+    logs = _log_digests(logs_dir)
+    return {
+        shift_id: (hashlib.sha256(encode_record(shift)).hexdigest(), logs.get(shift_id))
+        for shift_id, shift in shifts.items()
+    }
+
+
+def sync(
+    share_dir: Path,
+    data_manager,
+    logs_dir: Path = LOGS_DIR,
+    state_dir: Path = SYNC_STATE_DIR,
+    dry_run: bool = False,
+) -> SyncReport:
+    """
+    Exchange changed shifts and Markdown logs with a shared folder.
+
+    The local table, the shared folder and the state both had after the
+    last sync (the base) are merged three ways, per shift ID:
+
+    - changed on one side only: that side wins, including deletions;
+    - deleted on one side and modified on the other: the modification wins;
+    - modified on both: the entry with the higher digest wins, so every
+      machine resolves it the same way;
+    - added on both under the same ID with different content: the remote
+      keeps the ID and the local shift (and its log) moves to a new ID.
+
+    Only buckets whose digest differs between the two sides are read, so
+    the cost follows the number of changes rather than the table size.
+
+    Args:
+        share_dir (Path): The shared directory; created on first sync.
+        data_manager (DataManager): The local shifts.
+        logs_dir (Path, optional): Where the shift Markdown logs live.
+        state_dir (Path, optional): Where the per-share base state is kept.
+        dry_run (bool, optional): Plan and report without writing anything.
+
+    Returns:
+        SyncReport: What changed on each side.
+    """
+    share = SharedFolder(share_dir)
+    logs_dir = Path(logs_dir)
+    report = SyncReport(share.root, dry_run)
+    state_path = _state_path(state_dir, share.root)
+    base = _group(_load_base(state_path))
+    if not dry_run:
+        share.root.mkdir(parents=True, exist_ok=True)
+
+    with share.lock() if not dry_run else nullcontext():
+        shifts = data_manager.snapshot()
+        local = local_entries(shifts, logs_dir)
+        local_buckets = _group(local)
+        remote_root = share.read_root()
+        remote_digests = dict(remote_root["buckets"])
+        remote_buckets: Dict[str, Dict[str, Entry]] = {}
+
+        def remote_bucket(bucket: str) -> Dict[str, Entry]:
+            if bucket not in remote_buckets:
+                remote_buckets[bucket] = share.read_bucket(bucket)
+            return remote_buckets[bucket]
+
+        next_id = max(_max_id(local), int(remote_root.get("max_id", 0))) + 1
+        pulls: Dict[str, Entry] = {}
+        pushes: Dict[str, Tuple[Entry, str]] = {}  # ID -> (entry, local ID holding the content)
+        moves: Dict[str, str] = {}
+
+        for bucket in BUCKETS:
+            local_bucket = local_buckets.get(bucket, {})
+            if bucket_digest(local_bucket) == remote_digests.get(bucket, EMPTY_BUCKET):
+                continue
+            report.buckets_checked += 1
+            remote = remote_bucket(bucket)
+            base_bucket = base.get(bucket, {})
+            for shift_id in sorted(set(local_bucket) | set(remote)):
+                mine, theirs, common = local_bucket.get(shift_id), remote.get(shift_id), base_bucket.get(shift_id)
+                if mine == theirs:
+                    continue
+                if mine == common:
+                    take = "remote"
+                elif theirs == common:
+                    take = "local"
+                elif mine is None:
+                    # Deleted here, modified there: the modification wins.
+                    take = "remote"
+                elif theirs is None:
+                    take = "local"
+                elif common is None:
+                    new_id = f"{next_id:04d}"
+                    next_id += 1
+                    moves[shift_id] = new_id
+                    pushes[new_id] = (mine, shift_id)
+                    report.rekeyed.append((shift_id, new_id))
+                    take = "remote"
+                else:
+                    report.conflicts.append(shift_id)
+                    take = "remote" if leaf_digest(theirs) > leaf_digest(mine) else "local"
+                if take == "remote":
+                    pulls[shift_id] = theirs
+                else:
+                    pushes[shift_id] = (mine, shift_id)
+
+        for shift_id, entry in pulls.items():
+            (report.pulled if entry is not None else report.deleted_local).append(shift_id)
+        for shift_id, (entry, _) in pushes.items():
+            (report.pushed if entry is not None else report.deleted_remote).append(shift_id)
+        if dry_run:
+            return report
+
+        # Remote first: pushed content is read from the local IDs before any move.
+        touched = set()
+        for shift_id, (entry, source_id) in pushes.items():
+            bucket = bucket_of(shift_id)
+            touched.add(bucket)
+            if entry is None:
+                remote_bucket(bucket).pop(shift_id, None)
+                continue
+            share.put_blob("records", entry[0], ".json", encode_record(shifts[source_id]))
+            if entry[1] is not None:
+                share.put_blob("logs", entry[1], ".md", (logs_dir / f"{source_id}.md").read_bytes())
+            remote_bucket(bucket)[shift_id] = entry
+        for bucket in touched:
+            share.write_bucket(bucket, remote_buckets[bucket])
+            remote_digests[bucket] = bucket_digest(remote_buckets[bucket])
+        if touched:
+            max_id = max(int(remote_root.get("max_id", 0)), _max_id(pushes))
+            share.write_root(remote_digests, max_id)
+
+        _apply_locally(share, data_manager, shifts, logs_dir, pulls, moves)
+
+        final = dict(local)
+        for old, new in moves.items():
+            final[new] = final[old]
+        for shift_id, entry in pulls.items():
+            if entry is None:
+                final.pop(shift_id, None)
+            else:
+                final[shift_id] = entry
+        for shift_id, (entry, _) in pushes.items():
+            if entry is None:
+                final.pop(shift_id, None)
+        atomic_write_json(
+            state_path,
+            {"share": str(share.root), "entries": {shift_id: list(entry) for shift_id, entry in final.items()}},
+            indent=None,
+        )
+
+    if report.changed:
+        logger.info(report.format())
+    return report
+
+
+def _apply_locally(share: SharedFolder, data_manager, shifts, logs_dir: Path, pulls, moves) -> None:
+    puts = {}
+    for old, new in moves.items():
+        puts[new] = shifts[old]
+        old_log = logs_dir / f"{old}.md"
+        if old_log.exists():
+            os.replace(old_log, logs_dir / f"{new}.md")
+    deletes = [shift_id for shift_id, entry in pulls.items() if entry is None and shift_id in shifts]
+    for shift_id, entry in pulls.items():
+        if entry is None:
+            continue
+        puts[shift_id] = Shift.from_dict(json.loads(share.get_blob("records", entry[0], ".json")))
+        log_path = logs_dir / f"{shift_id}.md"
+        if entry[1] is not None:
+            with atomic_open(log_path, "wb") as f:
+                f.write(share.get_blob("logs", entry[1], ".md"))
+        elif log_path.exists():
+            os.remove(log_path)
+    # Deleting also removes the shifts' Markdown logs.
+    if deletes:
+        data_manager.delete_shifts(deletes)
+    if puts:
+        data_manager.add_shifts(puts)
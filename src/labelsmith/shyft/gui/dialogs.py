@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from labelsmith.shyft.core import config_manager
 from labelsmith.shyft.core.data_manager import data_manager
+from labelsmith.shyft.core.encrypted_storage import DecryptionError
 from labelsmith.shyft.utils.file_utils import get_log_files
 from labelsmith.shyft.utils.system_utils import get_modifier_key
 from labelsmith.shyft.gui.custom_widgets import DictionaryLookupText
@@ -107,18 +108,27 @@ class CalculateTotalsDialog:
         self.window.bind(f"<{get_modifier_key()}-W>", self.close_window)
 
     def create_widgets(self):
-        shifts = data_manager.get_shifts().values()
+        # DataManager keeps these totals current; nothing here walks the shifts.
+        aggregates = data_manager.aggregates
+        totals = aggregates.total
         
-        number_of_shifts = len(shifts)
-        total_hours_worked = sum(float(shift["Duration (hrs)"]) for shift in shifts)
-        total_gross_pay = sum(float(shift["Gross pay"]) for shift in shifts)
-        total_tasks_completed = sum(int(shift.get("Tasks completed", 0)) for shift in shifts)
+        number_of_shifts = totals.shifts
+        total_hours_worked = totals.hours
+        total_gross_pay_cents = totals.gross_pay_cents
+        total_gross_pay = totals.gross_pay
+        total_tasks_completed = totals.tasks
         
-        tax_liability = total_gross_pay * self.tax_rate
-        net_income = total_gross_pay - tax_liability
+        tax_liability_cents = round(total_gross_pay_cents * self.tax_rate)
+        tax_liability = tax_liability_cents / 100
+        net_income = (total_gross_pay_cents - tax_liability_cents) / 100
+
+        notebook = ttk.Notebook(self.window)
+        notebook.pack(expand=True, fill="both")
+        totals_frame = ttk.Frame(notebook)
+        notebook.add(totals_frame, text="Totals")
 
         columns = ("Description", "Value")
-        self.totals_tree = ttk.Treeview(self.window, columns=columns, show="headings")
+        self.totals_tree = ttk.Treeview(totals_frame, columns=columns, show="headings")
         self.totals_tree.heading("Description", text="Description", anchor="w")
         self.totals_tree.heading("Value", text="Value", anchor="w")
         self.totals_tree.column("Description", anchor="w", width=250)
@@ -132,10 +142,35 @@ class CalculateTotalsDialog:
         self.totals_tree.insert("", "end", values=(f"Estimated Tax Liability ({self.tax_rate:.2%})", f"${tax_liability:.2f}"))
         self.totals_tree.insert("", "end", values=("Estimated Net Income", f"${net_income:.2f}"))
 
+        for title, heading, groups in (
+            ("By Project", "Project ID", aggregates.by_project()),
+            ("By Model", "Model ID", aggregates.by_model()),
+            ("By Week", "Week", aggregates.by_week()),
+        ):
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text=title)
+            self.create_breakdown(frame, heading, groups)
+
         # Add tax rate change button
         self.change_tax_rate_button = ttk.Button(self.window, text="Change Tax Rate", command=self.change_tax_rate)
         self.change_tax_rate_button.pack(pady=10)
 
+    def create_breakdown(self, parent, heading, groups):
+        columns = (heading, "Shifts", "Hours", "Tasks", "Gross Pay")
+        tree = ttk.Treeview(parent, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col, anchor="w")
+            tree.column(col, anchor="w" if col == heading else "e", width=100)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(expand=True, fill="both")
+        for name, totals in groups.items():
+            tree.insert("", "end", values=(
+                name or "N/A", totals.shifts, f"{totals.hours:.2f}", totals.tasks, f"${totals.gross_pay:.2f}"
+            ))
+        return tree
+
     def change_tax_rate(self):
         new_rate = simpledialog.askfloat("Change Tax Rate", "Enter new tax rate (as a decimal):", 
                                          minvalue=0.0, maxvalue=1.0, initialvalue=self.tax_rate)
@@ -148,3 +183,24 @@ class CalculateTotalsDialog:
 
     def close_window(self, event):
         self.window.destroy()
+
+def unlock_data(parent):
+    """
+    Ask for the passphrase of encrypted storage until it unlocks.
+
+    Args:
+        parent: The (hidden) root window the prompt belongs to.
+
+    Returns:
+        bool: True once the data is unlocked, False if the user cancelled.
+    """
+    message = "Enter the passphrase for your Shyft data:"
+    while data_manager.locked:
+        passphrase = simpledialog.askstring("Unlock Shyft", message, show="*", parent=parent)
+        if passphrase is None:
+            return False
+        try:
+            data_manager.unlock(passphrase)
+        except DecryptionError as e:
+            message = f"{e}\n\nEnter the passphrase for your Shyft data:"
+    return True
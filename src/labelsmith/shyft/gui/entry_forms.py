@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from labelsmith.shyft.core.data_manager import data_manager
+from labelsmith.shyft.core.shift import parse_cents
 from labelsmith.shyft.utils.time_utils import validate_time_format, calculate_duration, format_to_two_decimals
 from labelsmith.shyft.utils.system_utils import get_modifier_key
 from labelsmith.shyft.gui.custom_widgets import IndependentAskString
@@ -80,6 +81,9 @@ class ManualEntryForm:
             int(data["Tasks completed"])
         except ValueError:
             raise ValueError("Invalid input for 'Hourly rate' or 'Tasks completed'. Please enter numerical values.")
+        overlaps = data_manager.find_overlaps(data["Date"], data["In (hh:mm)"], data["Out (hh:mm)"])
+        if overlaps:
+            raise ValueError(f"This shift overlaps existing shift(s) {', '.join(overlaps)}.")
 
     def close_window(self, event=None):
         self.window.destroy()
@@ -156,6 +160,94 @@ class EditShiftForm:
             int(data["Tasks completed"])
         except ValueError:
             raise ValueError("Invalid input for numerical fields. Please enter valid numbers.")
+        overlaps = data_manager.find_overlaps(
+            data["Date"], data["In (hh:mm)"], data["Out (hh:mm)"], exclude=self.shift_id
+        )
+        if overlaps:
+            raise ValueError(f"This shift overlaps existing shift(s) {', '.join(overlaps)}.")
+
+    def close_window(self, event=None):
+        self.window.grab_release()
+        self.window.destroy()
+
+class BulkEditForm:
+    """Apply the same field changes to several selected shifts at once."""
+
+    def __init__(self, parent, shift_ids, callback):
+        self.parent = parent
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Edit {len(shift_ids)} Shifts")
+        self.shift_ids = list(shift_ids)
+        self.callback = callback
+        self.create_widgets()
+        self.window.grab_set()
+        self.window.bind(f"<{get_modifier_key()}-w>", self.close_window)
+        self.window.bind(f"<{get_modifier_key()}-W>", self.close_window)
+        self.window.bind("<Return>", self.submit)
+        self.window.protocol("WM_DELETE_WINDOW", self.close_window)
+
+    def create_widgets(self):
+        self.entry_vars = {}
+        fields = ["Model ID", "Project ID", "Hourly rate"]
+
+        ttk.Label(
+            self.window, text="Leave a field blank to keep each shift's current value."
+        ).pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+
+        for field in fields:
+            row = ttk.Frame(self.window)
+            label = ttk.Label(row, width=15, text=field, anchor="w")
+            entry_var = tk.StringVar()
+            if field in ("Model ID", "Project ID"):
+                entry_var.trace_add(
+                    "write", lambda *_, var=entry_var: var.set(var.get().upper())
+                )
+            self.entry_vars[field] = entry_var
+            entry = ttk.Entry(row, textvariable=entry_var)
+            row.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+            label.pack(side=tk.LEFT)
+            entry.pack(side=tk.RIGHT, expand=tk.YES, fill=tk.X)
+
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
+
+        ttk.Button(button_frame, text="Cancel", command=self.close_window).pack(side=tk.LEFT, padx=5)
+        self.submit_button = ttk.Button(button_frame, text="Submit", command=self.submit)
+        self.submit_button.pack(side=tk.RIGHT, padx=5)
+
+    def submit(self, event=None):
+        try:
+            changes = self.validate_entries({field: var.get().strip() for field, var in self.entry_vars.items()})
+            if not changes:
+                raise ValueError("Enter at least one field to change.")
+            shifts = data_manager.get_shifts()
+            updates = {}
+            for shift_id in self.shift_ids:
+                shift = shifts[shift_id]
+                shift_changes = dict(changes)
+                # A new rate reprices the shift from its recorded duration.
+                if "hourly_rate_cents" in changes and shift.duration_s is not None:
+                    shift_changes["gross_pay_cents"] = round(changes["hourly_rate_cents"] * shift.duration_s / 3600)
+                updates[shift_id] = shift.replace(**shift_changes)
+            data_manager.update_shifts(updates)
+            self.close_window()
+            self.callback(list(updates))
+            messagebox.showinfo("Success", f"{len(updates)} shifts updated successfully.")
+        except (ValueError, KeyError) as e:
+            messagebox.showerror("Error", str(e))
+
+    def validate_entries(self, data):
+        changes = {}
+        if data["Model ID"]:
+            changes["model_id"] = data["Model ID"]
+        if data["Project ID"]:
+            changes["project_id"] = data["Project ID"]
+        if data["Hourly rate"]:
+            cents = parse_cents(data["Hourly rate"])
+            if cents is None or cents < 0:
+                raise ValueError("Invalid input for 'Hourly rate'. Please enter a non-negative number.")
+            changes["hourly_rate_cents"] = cents
+        return changes
 
     def close_window(self, event=None):
         self.window.grab_release()
@@ -4,7 +4,7 @@ from labelsmith.shyft.core import config_manager, nltk_manager
 from labelsmith.shyft.core.autologger import Autologger
 from labelsmith.shyft.core.data_manager import data_manager, logger
 from labelsmith.shyft.gui.menu import setup_menu
-from labelsmith.shyft.gui.entry_forms import ManualEntryForm, EditShiftForm
+from labelsmith.shyft.gui.entry_forms import ManualEntryForm, EditShiftForm, BulkEditForm
 from labelsmith.shyft.gui.dialogs import ViewLogsDialog, CalculateTotalsDialog
 from labelsmith.shyft.gui.timer_window import TimerWindow
 from labelsmith.shyft.utils.system_utils import prevent_sleep, allow_sleep, get_modifier_key
@@ -76,6 +76,7 @@ class ShyftGUI:
                 "Gross pay",
             ),
             show="headings",
+            selectmode="extended",
         )
         for col in self.tree["columns"]:
             self.tree.heading(col, text=col, anchor="w")
@@ -121,20 +122,13 @@ class ShyftGUI:
         setup_menu(self)
 
     def refresh_view(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        self.tree.delete(*self.tree.get_children())
 
-        sorted_keys = sorted(data_manager.get_shifts().keys(), key=lambda x: int(x), reverse=True)
-
-        for id in sorted_keys:
-            shift = data_manager.get_shifts()[id]
-            self.tree.insert("", "end", iid=id, values=(
-                id, shift.get("Date", "N/A"), shift.get("Model ID", "N/A"),
-                shift.get("Project ID", "N/A"), shift.get("In (hh:mm)", "N/A"),
-                shift.get("Out (hh:mm)", "N/A"), shift.get("Duration (hrs)", "N/A"),
-                shift.get("Tasks completed", "N/A"), shift.get("Hourly rate", "N/A"),
-                shift.get("Gross pay", "N/A")
-            ))
+        # Only the loaded (recent) months; with partitioned storage the sealed
+        # months stay on disk until View > Show Older Shifts asks for them.
+        shifts = data_manager.get_shifts(history=False)
+        for id in data_manager.shift_ids(descending=True, history=False):
+            self.tree.insert("", "end", iid=id, values=self.row_values(id, shifts[id]))
 
         first_item = self.tree.get_children()
         if first_item:
@@ -143,6 +137,29 @@ class ShyftGUI:
 
         logger.debug("Tree view populated with updated data.")
 
+    def load_history(self):
+        if not data_manager.history_loaded:
+            data_manager.load_history()
+            self.refresh_view()
+
+    @staticmethod
+    def row_values(id, shift):
+        return (
+            id, shift.get("Date", "N/A"), shift.get("Model ID", "N/A"),
+            shift.get("Project ID", "N/A"), shift.get("In (hh:mm)", "N/A"),
+            shift.get("Out (hh:mm)", "N/A"), shift.get("Duration (hrs)", "N/A"),
+            shift.get("Tasks completed", "N/A"), shift.get("Hourly rate", "N/A"),
+            shift.get("Gross pay", "N/A")
+        )
+
+    def update_rows(self, ids):
+        """Redraw just the given rows in place, keeping order and selection."""
+        shifts = data_manager.get_shifts()
+        for id in ids:
+            if self.tree.exists(id):
+                self.tree.item(id, values=self.row_values(id, shifts[id]))
+        logger.debug(f"Tree view updated {len(ids)} rows.")
+
     def manual_entry(self, event=None):
         ManualEntryForm(self.root, self.refresh_view)
 
@@ -151,9 +168,12 @@ class ShyftGUI:
         if not selected_item:
             messagebox.showerror("Error", "Please select a shift to edit.")
             return
+        if len(selected_item) > 1:
+            BulkEditForm(self.root, selected_item, self.update_rows)
+            return
         selected_id = selected_item[0]
         EditShiftForm(self.root, selected_id, self.refresh_view)
-        
+
 
     def delete_shift(self, event=None):
         selected_item = self.tree.selection()
@@ -163,6 +183,17 @@ class ShyftGUI:
         selected_id = selected_item[0]
         
         def on_confirm():
+            if len(selected_item) > 1:
+                try:
+                    data_manager.delete_shifts(selected_item)
+                    # The rest of the table is unchanged; drop the rows in one call.
+                    self.tree.delete(*selected_item)
+                except Exception as e:
+                    messagebox.showerror("Error", f"An error occurred while deleting the shifts: {str(e)}")
+                    logger.error(f"Failed to delete {len(selected_item)} shifts: {str(e)}")
+                finally:
+                    self.root.after(100, self.regain_focus)
+                return
             try:
                 data_manager.delete_shift(selected_id)
                 self.refresh_view()
@@ -198,7 +229,11 @@ class ShyftGUI:
         dialog.grab_set()
         dialog.resizable(False, False)
 
-        label = ttk.Label(dialog, text="Are you sure you want to delete the selected shift?")
+        if len(selected_item) > 1:
+            prompt = f"Are you sure you want to delete the {len(selected_item)} selected shifts?"
+        else:
+            prompt = "Are you sure you want to delete the selected shift?"
+        label = ttk.Label(dialog, text=prompt)
         label.pack(pady=10)
 
         button_frame = ttk.Frame(dialog)
@@ -259,6 +294,12 @@ class ShyftGUI:
     def on_quit(self, event=None):
         if self.caffeinate_process:
             allow_sleep(self.caffeinate_process)
+        try:
+            data_manager.flush()
+        except Exception as e:
+            if not messagebox.askyesno("Error", f"Failed to save pending changes: {str(e)}\n\nQuit anyway?"):
+                return
+        data_manager.close()
         self.root.quit()
         logger.info("Application quit.")
 
@@ -2,9 +2,10 @@ import tkinter as tk
 from tkinter import colorchooser, ttk, messagebox
 from labelsmith.shyft.core import config_manager
 from labelsmith.shyft.core.config_manager import load_config, save_config
+from labelsmith.shyft.core.data_manager import data_manager
 from labelsmith.shyft.utils.plotting import Plotting
 
-plotter = Plotting ()
+plotter = Plotting(data_manager)
 config = load_config()
 
 def setup_menu(gui):
@@ -38,6 +39,7 @@ def setup_view_menu(gui):
         command=gui.toggle_timer_topmost,
         variable=gui.timer_topmost_var,
     )
+    gui.view_menu.add_command(label="Show Older Shifts", command=gui.load_history)
     gui.menu_bar.add_cascade(label="View", menu=gui.view_menu)
 
 def setup_settings_menu(gui):
@@ -1,7 +1,10 @@
 from . import (
     error_handler,
+    file_lock,
     file_utils,
+    json_stream,
     plotting,
+    render_cache,
     system_utils,
     theme_manager,
     time_utils
@@ -9,8 +12,11 @@ from . import (
 
 __all__ = [
     "error_handler",
+    "file_lock",
     "file_utils",
+    "json_stream",
     "plotting",
+    "render_cache",
     "system_utils",
     "theme_manager",
     "time_utils"
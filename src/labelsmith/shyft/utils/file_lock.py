@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+import logging
+
+logger = logging.getLogger("labelsmith")
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class LockTimeout(Exception):
+    """Raised when a FileLock can't be acquired within its timeout."""
+
+
+class FileLock:
+    """
+    Advisory lock on a file, shared between processes.
+
+    Uses `fcntl.flock` on POSIX and `msvcrt.locking` on Windows (which has no
+    shared mode, so shared locks are exclusive there). Within a process the
+    lock is re-entrant per thread and other threads wait on an internal
+    RLock; only the outermost acquisition touches the OS lock.
+
+    Args:
+        path (Path): The lock file; created if missing.
+        shared (bool, optional): Take a shared (reader) lock instead of an
+            exclusive (writer) lock. Defaults to False.
+        timeout (float, optional): Seconds to wait before raising
+            LockTimeout; None waits forever. Defaults to 10.
+    """
+
+    def __init__(self, path: Path, shared: bool = False, timeout: Optional[float] = 10.0):
+        self.path = Path(path)
+        self.shared = shared
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        if not self._thread_lock.acquire(timeout=-1 if self.timeout is None else self.timeout):
+            raise LockTimeout(f"Timed out waiting for {self.path}")
+        if self._depth == 0:
+            try:
+                self._acquire_os_lock()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._release_os_lock()
+        self._thread_lock.release()
+
+    def _acquire_os_lock(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        delay = 0.005
+        while True:
+            try:
+                if os.name == "nt":
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(fd, (fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+                self._fd = fd
+                return
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Timed out waiting for {self.path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+
+    def _release_os_lock(self) -> None:
+        fd, self._fd = self._fd, None
+        try:
+            if os.name == "nt":
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -1,10 +1,22 @@
+import json
 import os
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger("labelsmith")
 
+def _read_umask() -> int:
+    # os.umask can only be read by setting it; do that once, at import, before
+    # any writer threads exist, rather than racing them on every write.
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+_UMASK = _read_umask()
+
 def get_log_files(log_dir: Path) -> List[str]:
     """
     Get a list of log files in the specified directory.
@@ -28,4 +40,81 @@ def get_log_files(log_dir: Path) -> List[str]:
         return []
     except Exception as e:
         logger.error(f"Error while getting log files: {e}")
-        return []
\ No newline at end of file
+        return []
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w", newline: Optional[str] = None):
+    """
+    Open a temporary file that atomically replaces `path` when the block exits.
+
+    The data is written to a temporary file in the same directory, flushed and
+    fsynced, then moved over the target with `os.replace`, so readers never
+    observe a partially written file. If the block raises, the target is left
+    untouched.
+
+    Args:
+        path (Path): The destination file.
+        mode (str, optional): "w" for text or "wb" for binary. Defaults to "w".
+        newline (str, optional): Passed to `open` for text files (use "" for csv).
+
+    Yields:
+        The open temporary file object.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, newline=newline) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates files as 0600; keep the permissions a plain open() would give.
+        if path.exists():
+            mode_bits = path.stat().st_mode & 0o777
+            # Replacing a read-only file fails on Windows.
+            os.chmod(path, mode_bits | 0o200)
+        else:
+            mode_bits = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode_bits)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def atomic_write_json(path: Path, obj, indent: int = 4, default=None) -> None:
+    """
+    Serialize an object to JSON and atomically replace the target file.
+
+    Args:
+        path (Path): The destination file.
+        obj: The JSON-serializable object to write.
+        indent (int, optional): Indentation passed to `json.dump`. Defaults to 4.
+        default (Callable, optional): Fallback encoder passed to `json.dump`.
+    """
+    with atomic_open(path, "w") as f:
+        json.dump(obj, f, indent=indent, default=default)
+
+def shred_file(path: Path, chunk_size: int = 1024 * 1024) -> None:
+    """
+    Overwrite a file with zeros, fsync it and delete it.
+
+    This is best effort only. Copy-on-write filesystems, SSD wear levelling
+    and backups can still keep the old blocks.
+
+    Args:
+        path (Path): The file to destroy.
+        chunk_size (int, optional): Bytes zeroed per write.
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    with open(path, "r+b") as f:
+        zeros = bytes(min(chunk_size, size))
+        remaining = size
+        while remaining > 0:
+            remaining -= f.write(zeros[:remaining])
+        f.flush()
+        os.fsync(f.fileno())
+    os.remove(path)
@@ -0,0 +1,133 @@
+import gzip
+import json
+import re
+from json.decoder import scanstring
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkedBuffer:
+    """A sliding text window over a file, refilled on demand."""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so memory stays bounded by one record plus a chunk.
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number cut off at the window edge still parses; make sure it wasn't.
+            if end >= len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def decode_key(self) -> str:
+        self.expect('"')
+        while True:
+            try:
+                key, end = scanstring(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            self.pos = end
+            return key
+
+
+def iter_shift_records(
+    path: Path,
+    header: Optional[Dict[str, Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[str, dict]]:
+    """
+    Stream (shift ID, shift) pairs out of the "data" object of a data file.
+
+    The file is read in fixed-size chunks and each shift record is decoded on
+    its own, so the raw text is never held in memory as a whole and the full
+    parse tree is never built alongside it.
+
+    Args:
+        path (Path): The JSON data file to read. Files ending in `.gz` are
+            decompressed on the fly.
+        header (dict, optional): If given, top-level keys other than "data"
+            (e.g. a schema version) are decoded into it.
+        chunk_size (int, optional): Characters read per refill.
+
+    Yields:
+        Tuple[str, dict]: Shift ID and shift record, in file order.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a valid data file.
+    """
+    decoder = json.JSONDecoder()
+    opener = gzip.open if Path(path).suffix == ".gz" else open
+    with opener(path, "rt") as f:
+        stream = _ChunkedBuffer(f, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.decode_key()
+            stream.expect(":")
+            if key == "data":
+                stream.expect("{")
+                if stream.peek() == "}":
+                    stream.pos += 1
+                else:
+                    while True:
+                        shift_id = stream.decode_key()
+                        stream.expect(":")
+                        yield shift_id, stream.decode(decoder)
+                        if stream.peek() == ",":
+                            stream.pos += 1
+                            continue
+                        stream.expect("}")
+                        break
+            else:
+                value = stream.decode(decoder)
+                if header is not None:
+                    header[key] = value
+            if stream.peek() == ",":
+                stream.pos += 1
+                continue
+            stream.expect("}")
+            return
@@ -10,7 +10,8 @@ import mpld3
 from mpld3 import plugins
 from typing import Dict, List, Union, Tuple, Optional
 from pathlib import Path
-import json
+import atexit
+import shutil
 import tempfile
 import threading
 import webbrowser
@@ -20,55 +21,98 @@ from tkinter import simpledialog, messagebox, ttk
 import datetime
 from datetime import datetime
 from labelsmith.shyft.constants import APP_DATA_DIR, DATA_FILE_PATH
+from labelsmith.shyft.utils.render_cache import RenderCache, render_key
 
 logger = logging.getLogger("labelsmith")
 
 class Plotting:
-    def __init__(self):
+    def __init__(self, data_manager=None):
+        # shyft.utils imports this module while shyft.core is still loading
+        # (core uses file_utils, json_stream, file_lock), so the analytics
+        # stack, which imports core, is imported on first use instead.
+        from labelsmith.shyft.core.config_manager import load_config
+        from labelsmith.shyft.core.generation import ChangeWatcher
+        from labelsmith.shyft.core.storage import EncryptedStorage, backend_name
+        from labelsmith.utils.trends import TrendEngine
+
         self.data_file = DATA_FILE_PATH
-        self.df = self._load_data()
+        self.data_manager = data_manager
+        self.live = None
+        self.trends = TrendEngine()
+        if data_manager is not None:
+            encrypted = getattr(data_manager.storage, "encrypted", False)
+        else:
+            encrypted = backend_name(load_config()) == EncryptedStorage.name
+        if encrypted:
+            # Rendered pages show pay in the clear, so with encrypted storage
+            # they live only for this session, in a private temporary directory.
+            cache_dir = Path(tempfile.mkdtemp(prefix="shyft-plots-"))
+            atexit.register(shutil.rmtree, cache_dir, ignore_errors=True)
+            self.render_cache = RenderCache(cache_dir)
+        else:
+            self.render_cache = RenderCache()
+        if data_manager is None:
+            self._watcher = ChangeWatcher(data_path=self.data_file)
+            self._df = self._load_data()
+            self.trends.reset_daily(self.daily())
+
+    def _follow(self) -> None:
+        # Follow the manager's edits row by row instead of re-reading the
+        # data, starting with the first plot rather than when the menu is
+        # built: registering replays the whole history (sealed months
+        # included) into both observers, and every later edit updates them.
+        if self.data_manager is None or self.live is not None:
+            return
+        from labelsmith.utils.columnar import LiveFrame
+
+        self.live = LiveFrame()
+        self.data_manager.add_observer(self.live)
+        self.data_manager.add_observer(self.trends)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if self.data_manager is None:
+            return self._df
+        self._follow()
+        return self.live.frame()
+
+    def reload_if_changed(self) -> bool:
+        """Reload the data if another process committed a write since the last load."""
+        if self.data_manager is not None:
+            self._follow()
+            return False
+        if not self._watcher.poll():
+            return False
+        self._df = self._load_data()
+        self.trends.reset_daily(self.daily())
+        return True
+
+    def daily(self) -> pd.DataFrame:
+        """Tasks, average time per task, hours and pay per Date."""
+        if self.data_manager is not None:
+            self._follow()
+            return self.live.daily()
+        from labelsmith.utils.columnar import daily_frame
+
+        return daily_frame(self.df)
 
     def _load_data(self) -> pd.DataFrame:
+        from labelsmith.shyft.core.encrypted_storage import DecryptionError
+        from labelsmith.utils.columnar import empty_frame, load_configured_frame
+
         try:
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
-            df = pd.DataFrame.from_dict(data['data'], orient='index')
-            
-            df = df.assign(
-                Date=pd.to_datetime(df['Date']),
-                Duration_hrs=pd.to_numeric(df['Duration (hrs)'], errors='coerce'),
-                Hourly_rate=pd.to_numeric(df['Hourly rate'], errors='coerce'),
-                Gross_pay=pd.to_numeric(df['Gross pay'], errors='coerce'),
-                Tasks_completed=pd.to_numeric(df['Tasks completed'], errors='coerce').fillna(0).astype(int)
-            )
-            
-            df['Avg time per task (min)'] = df.apply(self._calculate_avg_time_per_task, axis=1)
-            
-            return df.sort_values('Date')
+            # From the configured backend, not data.json, which only the
+            # JSON backend keeps current.
+            return load_configured_frame()
+        except DecryptionError:
+            raise
         except Exception as e:
             logger.error(f"Error loading data: {e}")
-            return pd.DataFrame()
-
-    @staticmethod
-    def _calculate_avg_time_per_task(row: pd.Series) -> float:
-        if row['Tasks_completed'] > 0 and row['Duration_hrs'] > 0:
-            return (row['Duration_hrs'] * 60) / row['Tasks_completed']
-        else:
-            return float('nan')
+            return empty_frame()
 
     def productivity_earnings_trend(self, window: int = 7) -> pd.DataFrame:
-        trend = self.df.groupby('Date').agg({
-            'Tasks_completed': 'sum',
-            'Avg time per task (min)': 'mean',
-            'Gross_pay': 'sum'
-        }).reset_index()
-        trend = trend.sort_values('Date')
-        trend = trend.assign(
-            Rolling_Tasks=trend['Tasks_completed'].rolling(window=window, min_periods=1).mean(),
-            Rolling_Avg_Time=trend['Avg time per task (min)'].rolling(window=window, min_periods=1).mean(),
-            Rolling_Earnings=trend['Gross_pay'].rolling(window=window, min_periods=1).mean()
-        )
-        return trend
+        self._follow()
+        return self.trends.trend(window)
 
     def plot_interactive_trend(self, 
                                save_path: Optional[Union[str, Path]] = None, 
@@ -78,43 +122,49 @@ class Plotting:
                                figsize: Tuple[int, int] = (1240, 780),
                                auto_open: bool = True,
                                metric: str = 'tasks') -> str:
-        def generate_plot():
-            nonlocal save_path
-            trend = self.productivity_earnings_trend(window)
-            
-            if start_date:
-                trend = trend[trend['Date'] >= pd.to_datetime(start_date)]
-            if end_date:
-                trend = trend[trend['Date'] <= pd.to_datetime(end_date)]
+        self.reload_if_changed()
+        trend = self.productivity_earnings_trend(window)
+        if start_date:
+            trend = trend[trend['Date'] >= pd.to_datetime(start_date)]
+        if end_date:
+            trend = trend[trend['Date'] <= pd.to_datetime(end_date)]
+
+        # Same rows and parameters give the same page: reuse it.
+        key = render_key(trend, window=window, metric=metric, start_date=start_date,
+                         end_date=end_date, figsize=list(figsize))
+        page = self.render_cache.get(key)
+        html = None
 
+        def generate_plot():
+            nonlocal html
             logger.debug(f"Columns in trend DataFrame: {trend.columns.tolist()}")
-            if 'Gross_pay' not in trend.columns:
-                logger.error("Column 'Gross_pay' is missing from the trend DataFrame.")
+            if 'Gross pay' not in trend.columns:
+                logger.error("Column 'Gross pay' is missing from the trend DataFrame.")
                 return
 
             fig = Figure(figsize=(figsize[0]/100, figsize[1]/100))
             ax = fig.add_subplot(111)
 
-            min_earnings = trend['Gross_pay'].min()
-            max_earnings = trend['Gross_pay'].max()
+            min_earnings = trend['Gross pay'].min()
+            max_earnings = trend['Gross pay'].max()
             
             if metric == 'tasks':
-                y_column = 'Tasks_completed'
-                rolling_column = 'Rolling_Tasks'
+                y_column = 'Tasks completed'
+                rolling_column = 'Rolling Tasks'
                 y_label = 'Tasks Completed'
                 tooltip_label = 'Daily Tasks'
             elif metric == 'time':
                 y_column = 'Avg time per task (min)'
-                rolling_column = 'Rolling_Avg_Time'
+                rolling_column = 'Rolling Avg Time'
                 y_label = 'Average Time per Task (minutes)'
                 tooltip_label = 'Avg Time per Task'
             else:
                 raise ValueError("Invalid metric. Choose 'tasks' or 'time'.")
 
-            valid_data = trend.dropna(subset=[y_column, rolling_column, 'Gross_pay'])
+            valid_data = trend.dropna(subset=[y_column, rolling_column, 'Gross pay'])
             
             scatter = ax.scatter(valid_data['Date'], valid_data[y_column], 
-                                c=valid_data['Gross_pay'], cmap='viridis', 
+                                c=valid_data['Gross pay'], cmap='viridis', 
                                 s=50, alpha=0.8,
                                 vmin=min_earnings, vmax=max_earnings)
             
@@ -156,63 +206,61 @@ class Plotting:
             tooltip = plugins.PointHTMLTooltip(
                 scatter,
                 labels=[f"Date: {d:%Y-%m-%d}<br>{tooltip_label}: {t:.1f}<br>Rolling Avg: {r:.1f}<br>Earnings: ${e:.2f}" 
-                        for d, t, r, e in zip(valid_data['Date'], valid_data[y_column], valid_data[rolling_column], valid_data['Gross_pay'])],
+                        for d, t, r, e in zip(valid_data['Date'], valid_data[y_column], valid_data[rolling_column], valid_data['Gross pay'])],
                 voffset=10,
                 hoffset=10
             )
             plugins.connect(fig, tooltip)
 
-            if not save_path:
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.html') as tmp:
-                    save_path = tmp.name
+            html = mpld3.fig_to_html(fig)
+            html = html.replace('<div id="', f'<div style="width: {figsize[0]}px; height: {figsize[1]}px;" id="')
+
+        if page is None:
+            plot_thread = threading.Thread(target=generate_plot)
+            plot_thread.start()
+            plot_thread.join()  # Wait for the plotting to finish
+            if html is None:
+                return str(save_path)
+            page = self.render_cache.put(key, html)
+        else:
+            logger.debug(f"Reusing cached plot {page}")
 
+        if save_path:
             if isinstance(save_path, str):
                 save_path = APP_DATA_DIR / save_path
+            shutil.copyfile(page, save_path)
+        else:
+            save_path = page
 
-            html = mpld3.fig_to_html(fig)
-            html = html.replace('<div id="', f'<div style="width: {figsize[0]}px; height: {figsize[1]}px;" id="')
-            
-            with open(save_path, 'w') as f:
-                f.write(html)
-            
-            logger.info(f"Interactive plot saved to: {save_path}")
-            
-            if auto_open:
-                webbrowser.open('file://' + str(save_path.resolve()))
+        logger.info(f"Interactive plot saved to: {save_path}")
+
+        if auto_open:
+            webbrowser.open('file://' + str(Path(save_path).resolve()))
 
-        plot_thread = threading.Thread(target=generate_plot)
-        plot_thread.start()
-        plot_thread.join()  # Wait for the plotting to finish
-        
         return str(save_path)
 
     def calculate_efficiency_metrics(self) -> Dict[str, float]:
-        daily_metrics = self.df.groupby('Date').agg({
-            'Tasks_completed': 'sum',
-            'Avg time per task (min)': 'mean',
-            'Duration_hrs': 'sum',
-            'Gross_pay': 'sum'
-        })
+        daily_metrics = self.daily()
         
         return {
-            'Avg Tasks per Hour': (daily_metrics['Tasks_completed'] / daily_metrics['Duration_hrs']).mean(),
+            'Avg Tasks per Hour': (daily_metrics['Tasks completed'] / daily_metrics['Duration (hrs)']).mean(),
             'Avg Time per Task (min)': daily_metrics['Avg time per task (min)'].mean(),
-            'Avg Earnings per Hour': (daily_metrics['Gross_pay'] / daily_metrics['Duration_hrs']).mean(),
-            'Best Day (Tasks)': daily_metrics['Tasks_completed'].max(),
+            'Avg Earnings per Hour': (daily_metrics['Gross pay'] / daily_metrics['Duration (hrs)']).mean(),
+            'Best Day (Tasks)': daily_metrics['Tasks completed'].max(),
             'Best Day (Efficiency)': daily_metrics['Avg time per task (min)'].min(),
-            'Best Day (Earnings)': daily_metrics['Gross_pay'].max()
+            'Best Day (Earnings)': daily_metrics['Gross pay'].max()
         }
 
     def generate_report(self) -> Dict[str, Union[float, int]]:
         efficiency_metrics = self.calculate_efficiency_metrics()
         return {
-            'Total Hours Worked': self.df['Duration_hrs'].sum(),
-            'Total Tasks Completed': self.df['Tasks_completed'].sum(),
-            'Total Gross Pay': self.df['Gross_pay'].sum(),
-            'Average Hourly Rate': self.df['Hourly_rate'].mean(),
-            'Overall Avg Tasks Per Hour': self.df['Tasks_completed'].sum() / self.df['Duration_hrs'].sum(),
+            'Total Hours Worked': self.df['Duration (hrs)'].sum(),
+            'Total Tasks Completed': self.df['Tasks completed'].sum(),
+            'Total Gross Pay': self.df['Gross pay'].sum(),
+            'Average Hourly Rate': self.df['Hourly rate'].mean(),
+            'Overall Avg Tasks Per Hour': self.df['Tasks completed'].sum() / self.df['Duration (hrs)'].sum(),
             'Overall Avg Time per Task (min)': self.df['Avg time per task (min)'].mean(),
-            'Overall Earnings Per Task': self.df['Gross_pay'].sum() / self.df['Tasks_completed'].sum(),
+            'Overall Earnings Per Task': self.df['Gross pay'].sum() / self.df['Tasks completed'].sum(),
             'Average Daily Tasks per Hour': efficiency_metrics['Avg Tasks per Hour'],
             'Average Daily Time per Task (min)': efficiency_metrics['Avg Time per Task (min)'],
             'Average Daily Earnings per Hour': efficiency_metrics['Avg Earnings per Hour'],
@@ -221,10 +269,8 @@ class Plotting:
             'Best Day (Earnings)': efficiency_metrics['Best Day (Earnings)']
         }
 
-    @staticmethod
-    def plot_productivity_default():
-        plotter = Plotting()
-        plotter.plot_interactive_trend(window=7, metric='time')
+    def plot_productivity_default(self):
+        self.plot_interactive_trend(window=7, metric='time')
 
     # class ProductivityPlotDialog(tk.Toplevel):
     #     def __init__(self, parent):
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+import pandas as pd
+from labelsmith.shyft.constants import PLOT_CACHE_DIR
+from labelsmith.shyft.utils.file_utils import atomic_open
+
+logger = logging.getLogger("labelsmith")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Bump when the rendering code changes, so old pages aren't served.
+RENDER_VERSION = 1
+
+
+def render_key(data: pd.DataFrame, **params) -> str:
+    """
+    Content address of a rendered plot: a hash of the plotted rows (values,
+    not identity, so an edit that doesn't change them still hits) and of
+    the render parameters.
+
+    Args:
+        data (pd.DataFrame): The rows the plot is drawn from.
+        **params: Everything else that affects the output (window, metric,
+            date range, figure size, ...). Must be JSON-serializable.
+
+    Returns:
+        str: A hex digest, usable as a file name.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"version": RENDER_VERSION, "columns": list(map(str, data.columns)), **params},
+                             sort_keys=True, default=str).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Rendered plot pages on disk, one `<key>.html` per render.
+
+    A hit refreshes the file's mtime, which doubles as its last-use time;
+    each store then evicts least recently used pages until the directory
+    fits in `max_bytes`.
+    """
+
+    def __init__(self, directory: Path = PLOT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.html"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached page for `key`, or None."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key: str, html: str) -> Path:
+        """Store a rendered page and return its path."""
+        path = self._path(key)
+        with atomic_open(path, "w") as f:
+            f.write(html)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Remove least recently used pages until the cache fits in max_bytes.
+
+        Args:
+            keep (Path, optional): A page never to remove, e.g. the one just
+                written.
+
+        Returns:
+            int: The number of pages removed.
+        """
+        pages = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".html") and entry.is_file():
+                st = entry.stat()
+                pages.append((st.st_mtime_ns, st.st_size, Path(entry.path)))
+        total = sum(size for _, size, _ in pages)
+        removed = 0
+        for _, size, path in sorted(pages):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            logger.debug(f"Evicted {removed} cached plots from {self.directory}.")
+        return removed
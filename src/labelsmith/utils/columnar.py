@@ -0,0 +1,552 @@
+# labelsmith/utils/columnar.py
+import json
+import logging
+import os
+import shutil
+import uuid
+from functools import lru_cache
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from labelsmith.shyft.constants import COLUMN_CACHE_DIR, DATA_FILE_PATH, GENERATION_FILE_PATH, LOCK_FILE_PATH
+from labelsmith.shyft.core.config_manager import load_config
+from labelsmith.shyft.core.generation import WriteGuard, read_generation
+from labelsmith.shyft.core.shift import (
+    DATE,
+    DURATION,
+    GROSS_PAY,
+    HOURLY_RATE,
+    MODEL_ID,
+    PROJECT_ID,
+    TASKS_COMPLETED,
+    V1_COLUMN_SCALES,
+    Shift,
+)
+from labelsmith.shyft.core.storage import JsonStorage, backend_name, create_storage
+from labelsmith.shyft.utils.file_lock import FileLock
+from labelsmith.shyft.utils.file_utils import atomic_write_json
+
+logger = logging.getLogger("labelsmith")
+
+AVG_TIME_PER_TASK = "Avg time per task (min)"
+
+# The one frame layout every analytics reader uses, indexed by shift ID.
+SCHEMA: Dict[str, str] = {
+    DATE: "datetime64[ns]",
+    MODEL_ID: "object",
+    PROJECT_ID: "object",
+    DURATION: "float64",
+    HOURLY_RATE: "float64",
+    GROSS_PAY: "float64",
+    TASKS_COMPLETED: "int64",
+    AVG_TIME_PER_TASK: "float64",
+}
+
+
+def empty_frame() -> pd.DataFrame:
+    """Return a frame with no rows but every schema column, correctly typed."""
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in SCHEMA.items()})
+
+
+def _numeric(values) -> np.ndarray:
+    try:
+        # Ints, floats, numeric strings and None (-> NaN) all convert in C.
+        return np.array(values, dtype="float64")
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype="float64", copy=True)
+
+
+def _dates(values) -> np.ndarray:
+    try:
+        # Well-formed YYYY-MM-DD strings (and None -> NaT) parse in C.
+        return np.array(values, dtype="datetime64[D]").astype("datetime64[ns]")
+    except (TypeError, ValueError):
+        dates = pd.to_datetime(pd.Series(values, dtype=object), format="%Y-%m-%d", errors="coerce")
+        return dates.to_numpy(dtype="datetime64[ns]")
+
+
+def _frame(columns: Dict[str, np.ndarray], ids: np.ndarray) -> pd.DataFrame:
+    # Explicit dtypes keep ID columns object (not inferred as strings), and
+    # copy=False leaves the arrays, memory maps included, where they are.
+    index = pd.Index(ids, dtype=object)
+    return pd.DataFrame(
+        {name: pd.Series(columns[name], index=index, dtype=SCHEMA[name], copy=False) for name in SCHEMA},
+        index=index,
+        copy=False,
+    )
+
+
+def build_frame(records: Mapping[str, Mapping]) -> pd.DataFrame:
+    """
+    Build the analytics frame from raw shift records (v1 or v2 layout).
+
+    Each field is pulled out with one pass over the records and then
+    converted column-wise; v2 seconds and cents are scaled to hours and
+    dollars, falling back to the v1 decimal field only for the records
+    that have no v2 value. The average time per task is NaN unless both
+    tasks and duration are positive.
+
+    Args:
+        records (Mapping): Shift ID -> record, as in the "data" object of a
+            data file.
+
+    Returns:
+        pd.DataFrame: One row per shift in SCHEMA layout, sorted by Date.
+    """
+    if not records:
+        return empty_frame()
+    ids = list(records.keys())
+    rows = list(records.values())
+
+    def column(key, positions=None):
+        if positions is None:
+            return [row.get(key) for row in rows]
+        return [rows[i].get(key) for i in positions]
+
+    frame = {
+        DATE: _dates(column(DATE)),
+        MODEL_ID: np.array(column(MODEL_ID), dtype=object),
+        PROJECT_ID: np.array(column(PROJECT_ID), dtype=object),
+    }
+    for v2_column, v1_column, divisor in V1_COLUMN_SCALES:
+        raw = column(v2_column)
+        values = _numeric(raw) / divisor
+        legacy = [i for i in np.flatnonzero(np.isnan(values)).tolist() if raw[i] is None]
+        if legacy:
+            values[legacy] = _numeric(column(v1_column, legacy))
+        frame[v1_column] = values
+    tasks = _numeric(column(TASKS_COMPLETED))
+    tasks[np.isnan(tasks)] = 0
+    tasks = frame[TASKS_COMPLETED] = tasks.astype("int64")
+
+    minutes = frame[DURATION] * 60
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frame[AVG_TIME_PER_TASK] = np.where((tasks > 0) & (minutes > 0), minutes / tasks, np.nan)
+
+    order = np.argsort(frame[DATE], kind="stable")
+    return _frame({name: values[order] for name, values in frame.items()}, np.array(ids, dtype=object)[order])
+
+
+CACHE_VERSION = 2
+MANIFEST = "manifest.json"
+
+# Cache file stem -> frame column. Numeric columns are stored as they are;
+# the ID columns as int32 codes into a small label array (-1 for missing).
+_ARRAY_FILES = {
+    "date": DATE,
+    "hours": DURATION,
+    "rate": HOURLY_RATE,
+    "pay": GROSS_PAY,
+    "tasks": TASKS_COMPLETED,
+    "avg_task_min": AVG_TIME_PER_TASK,
+}
+_CODED_FILES = {"model": MODEL_ID, "project": PROJECT_ID}
+
+
+def source_stamp(data_file: Path, generation_path: Optional[Path] = None) -> dict:
+    """
+    What a cache of `data_file` must match: the backend and the generation
+    its WriteGuard committed, plus the file's size and mtime for writes made
+    without the guard (restores, migrations, hand edits).
+
+    Only JSON storage is cached, so the backend is always "json"; it is
+    recorded so a cache can never be mistaken for a build from another one.
+    """
+    data_file = Path(data_file)
+    if generation_path is None:
+        generation_path = data_file.with_name(GENERATION_FILE_PATH.name)
+    st = os.stat(data_file)
+    return {
+        "backend": JsonStorage.name,
+        "generation": read_generation(generation_path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+class ColumnCache:
+    """
+    The analytics frame saved as one `.npy` file per column, so a warm start
+    maps the arrays (`np.load(mmap_mode="r")`) instead of parsing data.json.
+    Mapped read-only, the pages are shared by every process reading them.
+
+    Each build goes to a fresh subdirectory and `manifest.json`, replaced
+    atomically, names the current one along with the storage generation
+    and data file stat it was built from (see source_stamp). A reader
+    therefore sees a complete build or none, and a stamp mismatch means
+    rebuild. Only JSON storage is cached: the other backends don't keep
+    data.json current, and encrypted data must stay encrypted on disk.
+    """
+
+    def __init__(self, directory: Path = COLUMN_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def load(self, stamp: dict) -> Optional[pd.DataFrame]:
+        """Return the cached frame if it was built from `stamp`, else None."""
+        try:
+            with open(self.directory / MANIFEST, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != CACHE_VERSION or manifest.get("source") != stamp:
+                return None
+            build = self.directory / manifest["build"]
+            rows = manifest["rows"]
+
+            def array(stem):
+                values = np.load(build / f"{stem}.npy", mmap_mode="r")
+                if len(values) != rows:
+                    raise ValueError(f"{stem}.npy has {len(values)} rows, expected {rows}")
+                return values
+
+            columns = {column: array(stem) for stem, column in _ARRAY_FILES.items()}
+            for stem, column in _CODED_FILES.items():
+                labels = np.load(build / f"{stem}_labels.npy").astype(object)
+                # Code -1 picks the trailing None.
+                columns[column] = np.append(labels, None)[array(f"{stem}_codes")]
+            ids = array("ids").astype(object)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Column cache in {self.directory} unusable: {e}")
+            return None
+        return _frame(columns, ids)
+
+    def store(self, frame: pd.DataFrame, stamp: dict) -> None:
+        """Save `frame` as the cache for `stamp`, replacing any older build."""
+        name = f"{stamp['generation']}-{uuid.uuid4().hex[:8]}"
+        build = self.directory / name
+        build.mkdir(parents=True)
+        np.save(build / "ids.npy", np.array(frame.index, dtype=str))
+        for stem, column in _ARRAY_FILES.items():
+            np.save(build / f"{stem}.npy", frame[column].to_numpy(dtype=SCHEMA[column]))
+        for stem, column in _CODED_FILES.items():
+            codes, labels = pd.factorize(frame[column].to_numpy(dtype=object))
+            np.save(build / f"{stem}_codes.npy", codes.astype(np.int32))
+            np.save(build / f"{stem}_labels.npy", np.array([str(label) for label in labels], dtype=str))
+        atomic_write_json(
+            self.directory / MANIFEST,
+            {"version": CACHE_VERSION, "source": stamp, "rows": len(frame), "build": name},
+            indent=None,
+        )
+        # Processes still mapping an old build keep their pages until they
+        # close it; where the OS refuses the delete, the next store retries.
+        for entry in self.directory.iterdir():
+            if entry.is_dir() and entry.name != name:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+def load_frame(
+    data_file: Union[str, Path],
+    lock_file: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Load the analytics frame for a JSON data file. The app's own data may
+    live in another backend; use load_configured_frame for that.
+
+    The column cache is checked first, under the shared lock so the stamp
+    and the file contents agree; on a miss the file is parsed and the cache
+    rebuilt for the next reader.
+
+    Args:
+        data_file (str or Path): The JSON data file.
+        lock_file (Path, optional): The lock guarding it; defaults to the
+            lock file next to `data_file`.
+        cache_dir (Path, optional): Where the column cache lives; defaults
+            to the cache directory next to `data_file`.
+        use_cache (bool, optional): Set False to always parse the file.
+
+    Returns:
+        pd.DataFrame: See build_frame. Numeric columns of a cached frame are
+        read-only memory maps.
+    """
+    data_file = Path(data_file)
+    if lock_file is None:
+        lock_file = data_file.with_name(LOCK_FILE_PATH.name)
+    cache = ColumnCache(cache_dir if cache_dir is not None else data_file.with_name(COLUMN_CACHE_DIR.name))
+    with FileLock(lock_file, shared=True):
+        stamp = source_stamp(data_file)
+        if use_cache:
+            frame = cache.load(stamp)
+            if frame is not None:
+                return frame
+        with open(data_file, "r") as f:
+            data = json.load(f)
+    frame = build_frame(data["data"])
+    if use_cache:
+        try:
+            cache.store(frame, stamp)
+        except OSError as e:
+            logger.warning(f"Could not write the column cache in {cache.directory}: {e}")
+    return frame
+
+
+def load_configured_frame(config=None, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Load the analytics frame from the storage backend the config selects.
+
+    Plain JSON storage goes through load_frame and its column cache. Every
+    other backend is read through its storage class, including sealed
+    partitions, and is not cached: the journal's latest writes aren't in
+    data.json yet, the database backends don't keep data.json current, and
+    encrypted shifts must not be written out in the clear. Encrypted
+    storage needs $SHYFT_PASSPHRASE and raises DecryptionError without it.
+
+    Args:
+        config (configparser.ConfigParser, optional): Defaults to the app config.
+        use_cache (bool, optional): Set False to always parse data.json.
+
+    Returns:
+        pd.DataFrame: See build_frame.
+    """
+    config = load_config() if config is None else config
+    if backend_name(config) == JsonStorage.name:
+        return load_frame(DATA_FILE_PATH, LOCK_FILE_PATH, use_cache=use_cache)
+    storage = create_storage(config, guard=WriteGuard())
+    try:
+        shifts = storage.load()
+        load_cold = getattr(storage, "load_cold", None)
+        if load_cold is not None:
+            shifts.update(load_cold())
+    finally:
+        storage.close()
+    return shift_frame({shift_id: Shift.from_dict(record) for shift_id, record in shifts.items()})
+
+
+@lru_cache(maxsize=8192)
+def _day(value) -> np.datetime64:
+    try:
+        return np.datetime64(value, "D").astype("datetime64[ns]")
+    except (TypeError, ValueError):
+        return np.datetime64("NaT", "ns")
+
+
+def shift_row(shift) -> tuple:
+    """One shift's values in SCHEMA order; the same arithmetic as build_frame."""
+    hours = np.nan if shift.duration_s is None else shift.duration_s / 3600
+    rate = np.nan if shift.hourly_rate_cents is None else shift.hourly_rate_cents / 100
+    pay = np.nan if shift.gross_pay_cents is None else shift.gross_pay_cents / 100
+    tasks = shift.tasks_completed or 0
+    avg = hours * 60 / tasks if tasks > 0 and hours * 60 > 0 else np.nan
+    return (_day(shift.date), shift.model_id, shift.project_id, hours, rate, pay, tasks, avg)
+
+
+def shift_columns(shifts, columns: Iterable[str]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Pull numeric fields of every shift into float arrays (NaN where a field
+    is missing), one attribute pass per column.
+
+    Args:
+        shifts (Mapping): Shift ID -> Shift.
+        columns (Iterable[str]): The Shift attributes to extract.
+
+    Returns:
+        Tuple: The shift IDs, and a column name -> array mapping in the same order.
+    """
+    ids = list(shifts.keys())
+    records = list(shifts.values())
+    return ids, {column: _column(records, column) for column in columns}
+
+
+def _column(records, name: str) -> np.ndarray:
+    getter = attrgetter(name)
+    try:
+        # Fast path: every value present, straight from the iterator.
+        return np.fromiter(map(getter, records), dtype=np.int64, count=len(records)).astype(float)
+    except TypeError:
+        # Some are None; float conversion of a list maps those to NaN.
+        return np.array(list(map(getter, records)), dtype=float)
+
+
+def _shift_arrays(shifts):
+    # Column-wise extraction from Shift records: the IDs, the SCHEMA
+    # columns, the raw date strings and the integer fields as floats.
+    ids, numeric = shift_columns(shifts, ("duration_s", "hourly_rate_cents", "gross_pay_cents", "tasks_completed"))
+    records = list(shifts.values())
+    dates = [shift.date for shift in records]
+    hours = numeric["duration_s"] / 3600
+    tasks = numeric["tasks_completed"]
+    tasks[np.isnan(tasks)] = 0
+    tasks = tasks.astype("int64")
+    minutes = hours * 60
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg = np.where((tasks > 0) & (minutes > 0), minutes / tasks, np.nan)
+    columns = {
+        DATE: _dates(dates),
+        MODEL_ID: np.array(list(map(attrgetter("model_id"), records)), dtype=object),
+        PROJECT_ID: np.array(list(map(attrgetter("project_id"), records)), dtype=object),
+        DURATION: hours,
+        HOURLY_RATE: numeric["hourly_rate_cents"] / 100,
+        GROSS_PAY: numeric["gross_pay_cents"] / 100,
+        TASKS_COMPLETED: tasks,
+        AVG_TIME_PER_TASK: avg,
+    }
+    return ids, columns, dates, numeric
+
+
+def shift_frame(shifts) -> pd.DataFrame:
+    """
+    Build the analytics frame from in-memory Shift records (e.g. a
+    DataManager snapshot), column-wise.
+
+    Returns:
+        pd.DataFrame: One row per shift in SCHEMA layout, sorted by Date.
+    """
+    ids, columns, _, _ = _shift_arrays(shifts)
+    order = np.argsort(columns[DATE], kind="stable")
+    return _frame({name: values[order] for name, values in columns.items()}, np.array(ids, dtype=object)[order])
+
+
+def daily_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Group a frame by Date: tasks, hours and pay summed, time per task averaged."""
+    return frame.groupby(DATE).agg({
+        TASKS_COMPLETED: "sum",
+        AVG_TIME_PER_TASK: "mean",
+        DURATION: "sum",
+        GROSS_PAY: "sum",
+    })
+
+
+# Per-day running sums behind LiveFrame.daily(): shifts, tasks, sum and
+# count of the per-shift average time per task, seconds, cents.
+_DAY_FIELDS = ("shifts", "tasks", "avg_sum", "avg_count", "duration_s", "gross_pay_cents")
+
+
+class LiveFrame:
+    """
+    The analytics frame for a DataManager's shifts, kept current by the
+    manager like AggregateCube.
+
+    Rows live in preallocated column arrays, one slot per shift, so adding,
+    editing or deleting a shift writes one slot and adjusts one or two
+    per-day sums. daily() (the Date groupby the trend plots and efficiency
+    metrics read) is built from those sums in O(days); frame() gathers the
+    live slots with one vectorized take. Both are cached until the next
+    change.
+    """
+
+    def __init__(self):
+        self.reset({})
+
+    def reset(self, shifts) -> None:
+        ids, columns, dates, numeric = _shift_arrays(shifts)
+        tasks, avg = columns[TASKS_COMPLETED], columns[AVG_TIME_PER_TASK]
+        n = len(ids)
+        capacity = max(64, 2 * n)
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in SCHEMA.items()}
+        for name, values in columns.items():
+            self._columns[name][:n] = values
+        self._ids = np.empty(capacity, dtype=object)
+        self._ids[:n] = ids
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[:n] = True
+        self._slots: Dict[str, int] = dict(zip(ids, range(n)))
+        self._free: list = []
+        self._size = n
+
+        sums = pd.DataFrame(
+            {
+                "shifts": np.ones(n, dtype="int64"),
+                "tasks": tasks,
+                "avg_sum": np.nan_to_num(avg),
+                "avg_count": ~np.isnan(avg),
+                "duration_s": np.nan_to_num(numeric["duration_s"]).astype("int64"),
+                "gross_pay_cents": np.nan_to_num(numeric["gross_pay_cents"]).astype("int64"),
+            }
+        ).groupby(pd.Series(dates, dtype=object)).sum()
+        self._days: Dict[str, list] = {
+            day: [int(v) if field != "avg_sum" else float(v) for field, v in zip(_DAY_FIELDS, row)]
+            for day, row in zip(sums.index, sums.itertuples(index=False))
+        }
+        self._frame = None
+        self._daily = None
+
+    def _count_day(self, shift, avg: float, sign: int) -> None:
+        if shift.date is None:
+            return
+        sums = self._days.get(shift.date)
+        if sums is None:
+            sums = self._days[shift.date] = [0, 0, 0.0, 0, 0, 0]
+        sums[0] += sign
+        sums[1] += sign * (shift.tasks_completed or 0)
+        if avg == avg:
+            sums[2] += sign * avg
+            sums[3] += sign
+        sums[4] += sign * (shift.duration_s or 0)
+        sums[5] += sign * (shift.gross_pay_cents or 0)
+        if sums[0] == 0:
+            del self._days[shift.date]
+        elif sums[3] == 0:
+            # Drop float residue once no averages are left.
+            sums[2] = 0.0
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._alive)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+        self._ids = np.concatenate([self._ids, np.empty(capacity - len(self._ids), dtype=object)])
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+
+    def put(self, shift_id: str, old, new) -> None:
+        if old is not None:
+            self._count_day(old, shift_row(old)[-1], -1)
+        slot = self._slots.get(shift_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                if self._size == len(self._alive):
+                    self._grow()
+                slot = self._size
+                self._size += 1
+            self._slots[shift_id] = slot
+            self._ids[slot] = shift_id
+            self._alive[slot] = True
+        row = shift_row(new)
+        for column, value in zip(self._columns.values(), row):
+            column[slot] = value
+        self._count_day(new, row[-1], 1)
+        self._frame = self._daily = None
+
+    def delete(self, shift_id: str, old) -> None:
+        slot = self._slots.pop(shift_id, None)
+        if slot is None:
+            return
+        self._count_day(old, shift_row(old)[-1], -1)
+        self._alive[slot] = False
+        self._ids[slot] = None
+        self._free.append(slot)
+        self._frame = self._daily = None
+
+    def frame(self) -> pd.DataFrame:
+        """The current shifts in SCHEMA layout, sorted by Date."""
+        if self._frame is None:
+            live = np.flatnonzero(self._alive[: self._size])
+            order = live[np.argsort(self._columns[DATE][live], kind="stable")]
+            self._frame = _frame({name: column[order] for name, column in self._columns.items()}, self._ids[order])
+        return self._frame
+
+    def daily(self) -> pd.DataFrame:
+        """
+        Per-day totals, as daily_frame(frame()) would give them: tasks,
+        hours and pay summed, average time per task averaged over the
+        shifts that have one. Indexed by Date, ascending.
+        """
+        if self._daily is None:
+            days = list(self._days)
+            sums = np.array([self._days[day] for day in days], dtype="float64").reshape(len(days), len(_DAY_FIELDS))
+            sums = pd.DataFrame(sums, columns=list(_DAY_FIELDS), index=pd.Index(_dates(days), name=DATE))
+            # Differently written strings can name the same day; unparseable ones drop out.
+            sums = sums[sums.index.notna()].groupby(level=0).sum()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._daily = pd.DataFrame(
+                    {
+                        TASKS_COMPLETED: sums["tasks"].astype("int64"),
+                        AVG_TIME_PER_TASK: sums["avg_sum"] / sums["avg_count"].where(sums["avg_count"] > 0),
+                        DURATION: sums["duration_s"] / 3600,
+                        GROSS_PAY: sums["gross_pay_cents"] / 100,
+                    }
+                )
+        return self._daily
@@ -25,23 +25,50 @@ if not Path(CRYPTEX_DATA_DIR).exists():
     archive_directory = cryptex_data_directory / "archive"
     origins_directory = cryptex_data_directory / "origins"
     Path.mkdir(cryptex_data_directory, parents=True, exist_ok=True)
-    Path.mkdir(archive_directory)
-    Path.mkdir(origins_directory)
+    Path.mkdir(archive_directory, exist_ok=True)
+    Path.mkdir(origins_directory, exist_ok=True)
+
+
+KDF_ITERATIONS = 100000
 
 
 # Function to generate a key from the passphrase
-def generate_key_from_passphrase(passphrase, salt=b"salt_"):
+def generate_key_from_passphrase(passphrase, salt=b"salt_", iterations=KDF_ITERATIONS):
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt,
-        iterations=100000,
+        iterations=iterations,
         backend=default_backend(),
     )
     key = base64.urlsafe_b64encode(kdf.derive(passphrase.encode()))
     return key
 
 
+class RecordCipher:
+    """
+    Encrypts and decrypts many small records with one derived key.
+
+    The PBKDF2 derivation runs once, when the cipher is created, instead of
+    once per call as in `process_file`; each record then costs a single
+    Fernet (AES-CBC + HMAC) operation. Use a random salt per data store.
+    """
+
+    def __init__(self, passphrase, salt, iterations=KDF_ITERATIONS):
+        self.fernet = Fernet(generate_key_from_passphrase(passphrase, salt, iterations))
+
+    @staticmethod
+    def new_salt():
+        return os.urandom(16)
+
+    def encrypt(self, data):
+        return self.fernet.encrypt(data)
+
+    def decrypt(self, token):
+        """Decrypt a token; raises cryptography.fernet.InvalidToken on a wrong key or tampering."""
+        return self.fernet.decrypt(token)
+
+
 # Function to encrypt or decrypt data
 def process_file(input_file_path, output_file_path, passphrase, is_encryption):
     key = generate_key_from_passphrase(passphrase)
@@ -9,40 +9,47 @@ from mpld3 import plugins
 from mpld3 import plugins
 from typing import Dict, List, Union, Tuple, Optional
 from pathlib import Path
-import json
 import appdirs
 import os
 import tempfile
 import webbrowser
 import logging
 from datetime import datetime
+from labelsmith.shyft.constants import DATA_FILE_PATH, GENERATION_FILE_PATH, LOCK_FILE_PATH
+from labelsmith.shyft.core.generation import ChangeWatcher
+from labelsmith.utils.columnar import daily_frame, load_configured_frame, load_frame
+from labelsmith.utils.trends import TrendEngine
 
 class ShyftMetrics:
-    def __init__(self, data_file: Union[str, Path]):
-        self.data_file = Path(data_file)
+    def __init__(self, data_file: Optional[Union[str, Path]] = None):
+        # Without a file, read the app's data from whichever backend it's configured to use.
+        self.data_file = Path(data_file) if data_file is not None else None
+        watched = self.data_file or DATA_FILE_PATH
+        # The lock and generation files sit next to the data file they guard.
+        self.lock_file = watched.with_name(LOCK_FILE_PATH.name)
+        self._watcher = ChangeWatcher(watched.with_name(GENERATION_FILE_PATH.name), watched)
+        self.trends = TrendEngine()
         self.df = self._load_data()
         self.app_name = "Labelsmith"
         self.app_author = "kosmolebryce"
 
-    def _load_data(self) -> pd.DataFrame:
-        with open(self.data_file, 'r') as f:
-            data = json.load(f)
-        df = pd.DataFrame.from_dict(data['data'], orient='index')
-        df['Date'] = pd.to_datetime(df['Date'])
-        df['Duration (hrs)'] = pd.to_numeric(df['Duration (hrs)'], errors='coerce')
-        df['Hourly rate'] = pd.to_numeric(df['Hourly rate'], errors='coerce')
-        df['Gross pay'] = pd.to_numeric(df['Gross pay'], errors='coerce')
-        df['Tasks completed'] = pd.to_numeric(df['Tasks completed'], errors='coerce').fillna(0).astype(int)
-        
-        df['Avg time per task (min)'] = df.apply(self._calculate_avg_time_per_task, axis=1)
-        
-        return df.sort_values('Date')
+    def reload_if_changed(self) -> bool:
+        """Reload the data if a writer committed a new generation since the last load."""
+        if not self._watcher.poll():
+            return False
+        self.df = self._load_data()
+        return True
 
-    def _calculate_avg_time_per_task(self, row: pd.Series) -> float:
-        if row['Tasks completed'] > 0 and row['Duration (hrs)'] > 0:
-            return (row['Duration (hrs)'] * 60) / row['Tasks completed']
+    def _load_data(self) -> pd.DataFrame:
+        if self.data_file is None:
+            df = load_configured_frame()
         else:
-            return float('nan')
+            df = load_frame(self.data_file, self.lock_file)
+        # The per-day frame is grouped once here; the trend windows and the
+        # efficiency metrics all read it.
+        self.daily = daily_frame(df)
+        self.trends.reset_daily(self.daily)
+        return df
 
     def get_data_dir(self) -> Path:
         data_dir = Path(appdirs.user_data_dir(self.app_name, self.app_author))
@@ -50,16 +57,7 @@ class ShyftMetrics:
         return data_dir
 
     def productivity_earnings_trend(self, window: int = 7) -> pd.DataFrame:
-        trend = self.df.groupby('Date').agg({
-            'Tasks completed': 'sum',
-            'Avg time per task (min)': 'mean',
-            'Gross pay': 'sum'
-        }).reset_index()
-        trend = trend.sort_values('Date')
-        trend['Rolling Tasks'] = trend['Tasks completed'].rolling(window=window, min_periods=1).mean()
-        trend['Rolling Avg Time'] = trend['Avg time per task (min)'].rolling(window=window, min_periods=1).mean()
-        trend['Rolling Earnings'] = trend['Gross pay'].rolling(window=window, min_periods=1).mean()
-        return trend
+        return self.trends.trend(window)
 
     def plot_interactive_trend(self, 
                                save_path: Optional[Union[str, Path]] = None, 
@@ -164,13 +162,8 @@ class ShyftMetrics:
         return str(save_path)
 
     def calculate_efficiency_metrics(self) -> Dict[str, float]:
-        daily_metrics = self.df.groupby('Date').agg({
-            'Tasks completed': 'sum',
-            'Avg time per task (min)': 'mean',
-            'Duration (hrs)': 'sum',
-            'Gross pay': 'sum'
-        })
-        
+        daily_metrics = self.daily
+
         return {
             'Avg Tasks per Hour': (daily_metrics['Tasks completed'] / daily_metrics['Duration (hrs)']).mean(),
             'Avg Time per Task (min)': daily_metrics['Avg time per task (min)'].mean(),
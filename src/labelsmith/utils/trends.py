@@ -0,0 +1,187 @@
+# labelsmith/utils/trends.py
+from bisect import bisect_left
+from typing import Dict, Iterable, List
+import numpy as np
+import pandas as pd
+from labelsmith.utils.columnar import AVG_TIME_PER_TASK, DATE, GROSS_PAY, TASKS_COMPLETED, shift_frame, shift_row
+
+DEFAULT_WINDOWS = (7, 14, 30, 90)
+
+# Daily column -> its rolling mean, as productivity_earnings_trend names them.
+ROLLING_COLUMNS = {
+    TASKS_COMPLETED: "Rolling Tasks",
+    AVG_TIME_PER_TASK: "Rolling Avg Time",
+    GROSS_PAY: "Rolling Earnings",
+}
+
+
+class TrendEngine:
+    """
+    Daily buckets and their rolling means for several window sizes at once.
+
+    Windows count day rows, not calendar days, and a day's missing average
+    time per task is skipped rather than counted, exactly as
+    `daily.rolling(window, min_periods=1).mean()` does. All windows are
+    computed from the same cumulative sums in one pass over the days.
+
+    Kept current by DataManager like AggregateCube: a shift on an existing
+    day recomputes that day's row and the next (largest window - 1) rows of
+    every rolling series; a new latest day costs the same. Only a day
+    inserted into, or removed from, the middle of the history shifts every
+    later window and recomputes from there on.
+    """
+
+    def __init__(self, windows: Iterable[int] = DEFAULT_WINDOWS):
+        self.windows: List[int] = sorted(set(windows))
+        self._clear()
+
+    def _clear(self) -> None:
+        self._keys: List[int] = []  # day, as datetime64[ns] integers, ascending
+        # Per day: shifts, tasks, sum and count of per-shift average time
+        # per task, pay in cents.
+        self._buckets: List[list] = []
+        self._rolling: Dict[int, Dict[str, List[float]]] = {
+            window: {column: [] for column in ROLLING_COLUMNS} for window in self.windows
+        }
+
+    def _values(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        buckets = np.array(self._buckets[start:stop], dtype="float64").reshape(-1, 5)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg = np.where(buckets[:, 3] > 0, buckets[:, 2] / buckets[:, 3], np.nan)
+        return {TASKS_COMPLETED: buckets[:, 1], AVG_TIME_PER_TASK: avg, GROSS_PAY: buckets[:, 4] / 100}
+
+    def _recompute(self, start: int, stop: int, windows: Iterable[int] = None) -> None:
+        """Refresh rows [start, stop) of the rolling series for `windows` (default all)."""
+        windows = self.windows if windows is None else list(windows)
+        stop = min(stop, len(self._keys))
+        if start >= stop or not windows:
+            return
+        # Every window ending in [start, stop) lies within [base, stop).
+        base = max(0, start - max(windows) + 1)
+        for column, values in self._values(base, stop).items():
+            present = ~np.isnan(values)
+            sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+            counts = np.concatenate(([0], np.cumsum(present)))
+            ends = np.arange(start, stop) - base + 1
+            for window in windows:
+                begins = np.maximum(ends - window, 0)
+                count = counts[ends] - counts[begins]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    means = np.where(count > 0, (sums[ends] - sums[begins]) / count, np.nan)
+                self._rolling[window][column][start:stop] = means.tolist()
+
+    def reset(self, shifts) -> None:
+        frame = shift_frame(shifts)
+        avg = frame[AVG_TIME_PER_TASK]
+        sums = pd.DataFrame({
+            "shifts": 1,
+            "tasks": frame[TASKS_COMPLETED],
+            "avg_sum": avg.fillna(0.0),
+            "avg_count": avg.notna().astype("int64"),
+            "pay_cents": frame[GROSS_PAY].fillna(0) * 100,
+        }).groupby(frame[DATE]).sum()
+        days = {
+            key: [int(shifts), int(tasks), avg_sum, int(avg_count), round(pay_cents)]
+            for key, shifts, tasks, avg_sum, avg_count, pay_cents in zip(
+                sums.index.to_numpy(dtype="datetime64[ns]").astype("int64").tolist(), *map(list, sums.T.to_numpy())
+            )
+        }
+        self._load(days)
+
+    def reset_daily(self, daily: pd.DataFrame) -> None:
+        """
+        Load pre-grouped days (Date index with tasks, average time per task
+        and pay, as from daily_frame) instead of following a DataManager.
+        """
+        daily = daily[daily.index.notna()]
+        days = {}
+        for day, tasks, avg, pay in zip(
+            daily.index.to_numpy(dtype="datetime64[ns]").astype("int64").tolist(),
+            daily[TASKS_COMPLETED].tolist(),
+            daily[AVG_TIME_PER_TASK].tolist(),
+            daily[GROSS_PAY].tolist(),
+        ):
+            has_avg = avg == avg
+            # Integer cents, as reset() and put() keep them, so the rolling sums
+            # don't depend on which path seeded the engine.
+            days[day] = [1, tasks, avg if has_avg else 0.0, int(has_avg), 0 if pay != pay else round(pay * 100)]
+        self._load(days)
+
+    def _load(self, days: Dict[int, list]) -> None:
+        self._clear()
+        self._keys = sorted(days)
+        self._buckets = [days[key] for key in self._keys]
+        for series in self._rolling.values():
+            for column in series:
+                series[column] = [np.nan] * len(self._keys)
+        self._recompute(0, len(self._keys))
+
+    @staticmethod
+    def _add_to_bucket(bucket: list, shift, row: tuple, sign: int) -> None:
+        bucket[0] += sign
+        bucket[1] += sign * (shift.tasks_completed or 0)
+        if row[-1] == row[-1]:
+            bucket[2] += sign * row[-1]
+            bucket[3] += sign
+        bucket[4] += sign * (shift.gross_pay_cents or 0)
+        if bucket[3] == 0:
+            bucket[2] = 0.0
+
+    def _apply(self, shift, sign: int) -> None:
+        row = shift_row(shift)
+        if np.isnat(row[0]):
+            return
+        key = int(row[0].astype("int64"))
+        position = bisect_left(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            self._keys.insert(position, key)
+            self._buckets.insert(position, [0, 0, 0.0, 0, 0])
+            for series in self._rolling.values():
+                for values in series.values():
+                    values.insert(position, np.nan)
+            self._add_to_bucket(self._buckets[position], shift, row, sign)
+            self._recompute(position, len(self._keys))
+            return
+        self._add_to_bucket(self._buckets[position], shift, row, sign)
+        if self._buckets[position][0] == 0:
+            del self._keys[position]
+            del self._buckets[position]
+            for series in self._rolling.values():
+                for values in series.values():
+                    del values[position]
+            self._recompute(position, len(self._keys))
+        else:
+            self._recompute(position, position + self.windows[-1])
+
+    def put(self, shift_id: str, old, new) -> None:
+        if old is not None:
+            self._apply(old, -1)
+        self._apply(new, 1)
+
+    def delete(self, shift_id: str, old) -> None:
+        self._apply(old, -1)
+
+    def add_window(self, window: int) -> None:
+        """Start maintaining another window size, computed once over the history."""
+        if window in self._rolling:
+            return
+        self.windows = sorted(self.windows + [window])
+        self._rolling[window] = {column: [np.nan] * len(self._keys) for column in ROLLING_COLUMNS}
+        self._recompute(0, len(self._keys), [window])
+
+    def trend(self, window: int = 7) -> pd.DataFrame:
+        """
+        The daily totals and their `window`-day rolling means, in the layout
+        productivity_earnings_trend returns: one row per Date, ascending.
+        """
+        self.add_window(window)
+        values = self._values(0, len(self._keys))
+        trend = pd.DataFrame({
+            DATE: np.array(self._keys, dtype="int64").view("datetime64[ns]"),
+            TASKS_COMPLETED: values[TASKS_COMPLETED].astype("int64"),
+            AVG_TIME_PER_TASK: values[AVG_TIME_PER_TASK],
+            GROSS_PAY: values[GROSS_PAY],
+        })
+        for column, rolling in ROLLING_COLUMNS.items():
+            trend[rolling] = np.array(self._rolling[window][column], dtype="float64")
+        return trend
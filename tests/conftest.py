@@ -0,0 +1,23 @@
+import os
+import tempfile
+
+# labelsmith resolves its data directory (and loads data.json into the
+# module-level DataManager) on import; point it at a scratch directory so
+# the suite never reads or writes a real user's data.
+os.environ["XDG_DATA_HOME"] = tempfile.mkdtemp(prefix="labelsmith-tests-")
+
+
+def shift_record(date="2024-05-01", model="M1", project="P1", time_in="09:00", time_out="10:00",
+                 hours="1.00", rate="20.00", pay="20.00", tasks=4):
+    """A v1-layout shift record, as the GUI entry forms write them."""
+    return {
+        "Date": date,
+        "Model ID": model,
+        "Project ID": project,
+        "In (hh:mm)": time_in,
+        "Out (hh:mm)": time_out,
+        "Duration (hrs)": hours,
+        "Hourly rate": rate,
+        "Gross pay": pay,
+        "Tasks completed": tasks,
+    }
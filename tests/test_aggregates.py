@@ -0,0 +1,71 @@
+import random
+
+from labelsmith.shyft.core.aggregates import iso_week
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.storage import JsonStorage
+from tests.conftest import shift_record
+
+
+def _random_record(rng):
+    return shift_record(
+        date=rng.choice([None, "not a date", "2024-01-01", "2024-05-01", "2024-05-06", "2024-12-30"]),
+        model=rng.choice([None, "M1", "M2"]),
+        project=rng.choice(["P1", "P2", "P3"]),
+        hours=rng.choice([None, "0.50", "1.25", "7.75"]),
+        pay=rng.choice([None, "n/a", "12.34", "310.00"]),
+        tasks=rng.choice([None, 0, 3, 9]),
+    )
+
+
+def _brute_force(shifts, group):
+    totals = {}
+    for shift in shifts.values():
+        name = group(shift)
+        row = totals.setdefault(name, [0, 0, 0, 0])
+        row[0] += 1
+        row[1] += shift.duration_s or 0
+        row[2] += shift.gross_pay_cents or 0
+        row[3] += shift.tasks_completed or 0
+    return {name: tuple(row) for name, row in totals.items()}
+
+
+def _as_tuples(rollup):
+    return {name: (t.shifts, t.duration_s, t.gross_pay_cents, t.tasks) for name, t in rollup.items()}
+
+
+def test_cube_matches_a_scan_after_random_edits(tmp_path):
+    rng = random.Random(0)
+    manager = DataManager(storage=JsonStorage(tmp_path / "data.json"))
+    manager.add_shifts({str(i): _random_record(rng) for i in range(1, 41)})
+    for step in range(300):
+        shifts = manager.get_shifts()
+        if rng.random() < 0.3 and shifts:
+            manager.delete_shift(rng.choice(sorted(shifts)))
+        else:
+            manager.add_shift(str(rng.randrange(60)), _random_record(rng))
+        if step % 50 and step != 299:
+            continue
+        shifts = manager.get_shifts()
+        cube = manager.aggregates
+        expected_total = _brute_force(shifts, lambda shift: "all").get("all", (0, 0, 0, 0))
+        assert _as_tuples({"all": cube.total})["all"] == expected_total
+        assert _as_tuples(cube.by_project()) == _brute_force(shifts, lambda shift: shift.project_id)
+        assert _as_tuples(cube.by_model()) == _brute_force(shifts, lambda shift: shift.model_id)
+        assert _as_tuples(cube.by_day()) == _brute_force(shifts, lambda shift: shift.date)
+        assert _as_tuples(cube.by_week()) == _brute_force(shifts, lambda shift: iso_week(shift.date))
+        # Emptied cells are dropped rather than left at zero.
+        assert all(cell.shifts for cell in cube.cells.values())
+
+
+def test_rollups_sort_by_name_with_missing_first(tmp_path):
+    assert iso_week("2024-12-30") == "2025-W01"
+    assert iso_week("2024-02-30") == iso_week(None) == ""
+    manager = DataManager(storage=JsonStorage(tmp_path / "data.json"))
+    manager.add_shifts({
+        "1": shift_record(model="M2"),
+        "2": shift_record(model=None),
+        "3": shift_record(model="M1", hours="2.00", pay="40.00"),
+    })
+    by_model = manager.aggregates.by_model()
+    assert list(by_model) == [None, "M1", "M2"]
+    assert by_model["M1"].hours == 2.0 and by_model["M1"].gross_pay == 40.0
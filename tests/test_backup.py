@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from labelsmith.shyft.core import backup
+from labelsmith.shyft.core.backup import (
+    CHUNK_MASK_BITS,
+    CHUNK_WINDOW,
+    MAX_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+    BackupRepository,
+    chunk_boundaries,
+)
+
+MASK = (1 << 64) - 1
+
+
+def _reference_cuts(data):
+    # The window hash rolled one byte at a time, as the docstring defines it.
+    values = [int(v) for v in backup._BYTE_VALUES]
+    top = pow(backup._HASH_BASE, CHUNK_WINDOW, 1 << 64)
+    cuts, h = [], 0
+    for i, byte in enumerate(data):
+        h = (h * backup._HASH_BASE + values[byte]) & MASK
+        if i >= CHUNK_WINDOW:
+            h = (h - values[data[i - CHUNK_WINDOW]] * top) & MASK
+        if i >= CHUNK_WINDOW - 1 and h >> (64 - CHUNK_MASK_BITS) == 0:
+            cuts.append(i + 1)
+    return cuts
+
+
+def _data(size, seed=0):
+    return random.Random(seed).randbytes(size)
+
+
+@pytest.mark.parametrize("block_size", [backup._BLOCK_SIZE, 1000, 4096])
+def test_cut_candidates_match_a_rolling_hash(monkeypatch, block_size):
+    monkeypatch.setattr(backup, "_BLOCK_SIZE", block_size)
+    data = _data(60_000)
+    assert backup._cut_candidates(data).tolist() == _reference_cuts(data)
+
+
+def test_chunks_cover_the_data_within_size_bounds():
+    data = _data(300_000, seed=1) + bytes(200_000)  # zeros never cut: forces MAX_CHUNK_SIZE splits
+    ends = chunk_boundaries(data)
+    assert ends[-1] == len(data)
+    sizes = [b - a for a, b in zip([0] + ends, ends)]
+    assert all(MIN_CHUNK_SIZE <= size <= MAX_CHUNK_SIZE for size in sizes[:-1])
+    assert 0 < sizes[-1] <= MAX_CHUNK_SIZE
+    assert chunk_boundaries(b"") == []
+    assert chunk_boundaries(b"x" * 100) == [100]
+
+
+def test_an_insert_only_changes_nearby_chunks():
+    data = _data(400_000, seed=2)
+    edited = data[:150_000] + b"inserted bytes" + data[150_000:]
+
+    def chunks(blob):
+        ends = chunk_boundaries(blob)
+        return {blob[a:b] for a, b in zip([0] + ends, ends)}
+
+    before, after = chunks(data), chunks(edited)
+    assert len(after - before) <= 2
+    assert len(before & after) >= len(before) - 2
+
+
+def test_backup_dedupes_and_restores(tmp_path):
+    source = tmp_path / "Shyft"
+    (source / "logs").mkdir(parents=True)
+    (source / "columns").mkdir()
+    data = _data(200_000, seed=3)
+    (source / "data.json").write_bytes(data)
+    (source / "logs" / "0001.md").write_text("log")
+    (source / "columns" / "cache.npy").write_bytes(b"derived")
+    (source / "data.lock").write_bytes(b"")
+
+    repo = BackupRepository(tmp_path / "backups")
+    first = repo.backup(source)
+    assert first.files == 2  # the cache directory and lock file are skipped
+
+    (source / "data.json").write_bytes(data[:100_000] + b"edit" + data[100_000:])
+    second = repo.backup(source)
+    assert second.changed_files == 1
+    assert second.new_chunks <= 2
+    assert repo.verify().ok
+
+    target = tmp_path / "restored"
+    repo.restore(target=target, snapshot_id=first.snapshot_id)
+    assert (target / "data.json").read_bytes() == data
+    assert (target / "logs" / "0001.md").read_text() == "log"
+    assert not (target / "columns").exists()
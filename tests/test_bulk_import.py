@@ -0,0 +1,90 @@
+import csv
+import json
+
+import pytest
+
+from labelsmith.shyft.core.bulk_import import IMPORT_FIELDS, import_shifts
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.storage import JsonStorage
+from tests.conftest import shift_record
+
+ROWS = [
+    ["2024-05-01", "m1", "p1", "09:00", "10:30", "20", "4"],
+    ["2024-05-02", "M1", "P2", "23:30", "00:15", "18.50", "2"],
+    ["2024-13-01", "M1", "P1", "9:00", "10:00", "-1", "1.5"],
+    ["2024-05-03", "", "P1", "09:00", "25:00", "20", "3"],
+    ["2024-05-04", "M2", "P1", "08:00", "08:45", "30", "0"],
+]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DataManager(storage=JsonStorage(tmp_path / "data.json"))
+    manager.add_shift("0007", shift_record())
+    return manager
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(IMPORT_FIELDS)
+        writer.writerows(rows)
+    return path
+
+
+def test_csv_import_validates_and_allocates_ids(tmp_path, manager):
+    saves = []
+    real_save = manager.storage.save
+    manager.storage.save = lambda shifts: saves.append(len(shifts)) or real_save(shifts)
+
+    report = import_shifts(_write_csv(tmp_path / "shifts.csv", ROWS), manager, batch_size=2)
+    assert (report.rows, report.imported, report.rejected) == (5, 3, 2)
+    assert (report.first_id, report.last_id) == ("0008", "0010")
+    # One write for the whole file.
+    assert saves == [4]
+
+    assert sorted(report.errors) == report.errors
+    assert {(line, field) for line, field, _ in report.errors} == {
+        (4, "Date"),
+        (4, "In (hh:mm)"),
+        (4, "Hourly rate"),
+        (4, "Tasks completed"),
+        (5, "Model ID"),
+        (5, "Out (hh:mm)"),
+    }
+
+    shifts = manager.get_shifts()
+    assert (shifts["0008"].model_id, shifts["0008"].project_id) == ("M1", "P1")
+    assert (shifts["0008"].duration_s, shifts["0008"].gross_pay_cents) == (5400, 3000)
+    # Out before In runs past midnight.
+    assert (shifts["0009"].duration_s, shifts["0009"].gross_pay_cents) == (2700, 1388)
+    assert shifts["0010"].to_record()["Tasks completed"] == 0
+
+
+def test_jsonl_import_reports_bad_lines(tmp_path, manager):
+    path = tmp_path / "shifts.jsonl"
+    row, other = (json.dumps(dict(zip(IMPORT_FIELDS, values))) for values in (ROWS[0], ROWS[4]))
+    lines = [row, "{not json", "[1, 2]", "", other]
+    path.write_text("\n".join(lines) + "\n")
+    report = import_shifts(path, manager)
+    assert (report.rows, report.imported) == (4, 2)
+    assert [(line, message) for line, _, message in report.errors] == [
+        (2, "is not valid JSON (Expecting property name enclosed in double quotes)"),
+        (3, "is not a JSON object"),
+    ]
+    assert sorted(manager.get_shifts()) == ["0007", "0008", "0009"]
+
+
+@pytest.mark.parametrize("options", [{"dry_run": True}, {"strict": True}])
+def test_dry_run_and_strict_import_nothing(tmp_path, manager, options):
+    generation = manager.generation
+    report = import_shifts(_write_csv(tmp_path / "shifts.csv", ROWS), manager, **options)
+    assert report.rejected == 2
+    assert report.imported == (3 if options.get("dry_run") else 0)
+    assert manager.generation == generation
+    assert list(manager.get_shifts()) == ["0007"]
+
+
+def test_unknown_format_is_rejected(tmp_path, manager):
+    with pytest.raises(ValueError):
+        import_shifts(tmp_path / "shifts.xlsx", manager)
@@ -0,0 +1,162 @@
+import configparser
+import json
+import random
+import shutil
+
+import pandas as pd
+import pytest
+
+from labelsmith.shyft.constants import APP_DATA_DIR, COLUMN_CACHE_DIR, DATA_FILE_PATH, GENERATION_FILE_PATH
+from labelsmith.shyft.core.encrypted_storage import PASSPHRASE_ENV, DecryptionError
+from labelsmith.shyft.core.shift import DATE, Shift
+from labelsmith.shyft.core.storage import JournalStorage
+from labelsmith.shyft.core.sqlite_storage import SQLiteStorage
+from labelsmith.utils.columnar import (
+    LiveFrame,
+    build_frame,
+    daily_frame,
+    load_configured_frame,
+    load_frame,
+    source_stamp,
+)
+from tests.conftest import shift_record
+
+
+def _config(backend):
+    config = configparser.ConfigParser()
+    config["Storage"] = {"backend": backend}
+    return config
+
+
+@pytest.fixture
+def app_data():
+    # The configured backends use the app's own paths (a scratch directory
+    # in tests); start each test from an empty one.
+    shutil.rmtree(APP_DATA_DIR, ignore_errors=True)
+    APP_DATA_DIR.mkdir(parents=True)
+    DATA_FILE_PATH.write_text(json.dumps({"data": {"1": shift_record(), "2": shift_record(date="2024-05-02")}}))
+    yield APP_DATA_DIR
+    shutil.rmtree(APP_DATA_DIR, ignore_errors=True)
+
+
+def test_json_backend_uses_data_file(app_data):
+    frame = load_configured_frame(_config("json"))
+    assert sorted(frame.index) == ["1", "2"]
+    assert (COLUMN_CACHE_DIR / "manifest.json").exists()
+
+
+def test_journal_backend_replays_the_journal(app_data):
+    storage = JournalStorage()
+    shifts = storage.load()
+    shifts["3"] = Shift.from_dict(shift_record(date="2024-05-03", tasks=7))
+    storage.put(shifts, "3")
+    storage.close()
+
+    # data.json alone is stale; the configured backend is not.
+    assert sorted(load_frame(DATA_FILE_PATH).index) == ["1", "2"]
+    frame = load_configured_frame(_config("journal"))
+    assert sorted(frame.index) == ["1", "2", "3"]
+    assert frame.loc["3", "Tasks completed"] == 7
+
+
+def test_sqlite_backend_reads_the_database(app_data):
+    storage = SQLiteStorage()
+    shifts = storage.load()
+    del shifts["1"]
+    shifts["2"] = Shift.from_dict(shift_record(date="2024-05-02", pay="99.00"))
+    storage.save(shifts)
+    storage.close()
+
+    frame = load_configured_frame(_config("sqlite"))
+    expected = build_frame({"2": shift_record(date="2024-05-02", pay="99.00")})
+    assert list(frame.index) == ["2"]
+    assert frame.equals(expected)
+    assert not COLUMN_CACHE_DIR.exists()
+
+
+def test_locked_encrypted_backend_fails_loudly(app_data, monkeypatch):
+    monkeypatch.delenv(PASSPHRASE_ENV, raising=False)
+    with pytest.raises(DecryptionError):
+        load_configured_frame(_config("encrypted"))
+
+    monkeypatch.setenv(PASSPHRASE_ENV, "secret")
+    frame = load_configured_frame(_config("encrypted"))
+    assert sorted(frame.index) == ["1", "2"]
+    assert not DATA_FILE_PATH.exists()
+    assert not COLUMN_CACHE_DIR.exists()
+
+
+def test_column_cache_follows_the_storage_generation(tmp_path, monkeypatch):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"data": {"1": shift_record()}}))
+    generation = tmp_path / GENERATION_FILE_PATH.name
+    generation.write_text(json.dumps({"generation": 1}))
+
+    stamp = source_stamp(data_file)
+    assert stamp["backend"] == "json" and stamp["generation"] == 1
+    assert "1" in load_frame(data_file).index
+    parses = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: parses.append(f.name) or real_load(f))
+
+    # A warm start maps the cached columns instead of parsing data.json.
+    assert list(load_frame(data_file).index) == ["1"]
+    assert str(data_file) not in parses
+
+    # A commit elsewhere publishes a new generation; data.json is re-read.
+    generation.write_text(json.dumps({"generation": 2}))
+    assert list(load_frame(data_file).index) == ["1"]
+    assert str(data_file) in parses
+    manifest = json.loads((tmp_path / COLUMN_CACHE_DIR.name / "manifest.json").read_text())
+    assert manifest["source"] == source_stamp(data_file)
+
+
+def _random_record(rng):
+    hours = rng.choice([None, "0.00", "0.50", "1.25", "2.00", "7.75"])
+    rate = rng.choice([None, "15.00", "20.00", "42.50"])
+    return shift_record(
+        date=rng.choice([None, "2024-04-30", "2024-05-01", "2024-05-02", "2024-05-10", "2024-06-01"]),
+        model=rng.choice([None, "M1", "M2"]),
+        project=rng.choice(["P1", "P2", "P3"]),
+        hours=hours,
+        rate=rate,
+        pay=rng.choice([None, "0.00", "12.34", "20.00", "310.00"]),
+        tasks=rng.choice([None, 0, 1, 4, 9]),
+    )
+
+
+def _assert_matches(live, records):
+    expected = build_frame(records)
+    frame = live.frame()
+    assert frame[DATE].dropna().is_monotonic_increasing
+    # Shifts on the same Date may come in either order; an empty
+    # empty_frame() has a RangeIndex rather than an ID index.
+    exact = bool(records)
+    pd.testing.assert_frame_equal(frame.sort_index(), expected.sort_index(), check_index_type=exact)
+    pd.testing.assert_frame_equal(live.daily(), daily_frame(expected), check_freq=False, check_index_type=exact)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_live_frame_matches_build_frame(seed):
+    rng = random.Random(seed)
+    records = {}
+    live = LiveFrame()
+    for step in range(400):
+        action = rng.random()
+        if action < 0.02:
+            live.reset({shift_id: Shift.from_dict(record) for shift_id, record in records.items()})
+        elif action < 0.3 and records:
+            shift_id = rng.choice(sorted(records))
+            live.delete(shift_id, Shift.from_dict(records.pop(shift_id)))
+        else:
+            # New IDs (growing past the preallocated slots) and edits.
+            shift_id = str(rng.randrange(200))
+            old = records.get(shift_id)
+            records[shift_id] = _random_record(rng)
+            live.put(shift_id, None if old is None else Shift.from_dict(old), Shift.from_dict(records[shift_id]))
+        if step % 25 == 0:
+            _assert_matches(live, records)
+    _assert_matches(live, records)
+    for shift_id in sorted(records):
+        live.delete(shift_id, Shift.from_dict(records.pop(shift_id)))
+    _assert_matches(live, records)
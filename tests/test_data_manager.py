@@ -0,0 +1,194 @@
+import threading
+
+import pytest
+
+from labelsmith.shyft.core import data_manager
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.storage import JsonStorage
+from tests.conftest import shift_record
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DataManager(storage=JsonStorage(tmp_path / "data.json"))
+    manager.add_shifts({str(i): shift_record(date=f"2024-05-{i:02d}") for i in range(1, 11)})
+    return manager
+
+
+def test_missing_shift_raises_key_error(manager):
+    generation = manager.generation
+    with pytest.raises(KeyError):
+        manager.update_shift("99", shift_record())
+    with pytest.raises(KeyError):
+        manager.delete_shift("99")
+    assert manager.generation == generation
+    assert len(manager.get_shifts()) == 10
+
+
+def test_concurrent_update_and_delete(manager):
+    errors = []
+    barrier = threading.Barrier(2)
+
+    def run(action):
+        barrier.wait()
+        try:
+            action()
+        except KeyError as e:
+            errors.append(e)
+
+    for shift_id in map(str, range(1, 11)):
+        threads = [
+            threading.Thread(target=run, args=(lambda: manager.delete_shift(shift_id),)),
+            threading.Thread(target=run, args=(lambda: manager.update_shift(shift_id, shift_record(tasks=9)),)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # Whichever ran second either updated a live shift or found it gone.
+    assert manager.get_shifts() == {}
+    assert all("not found" in str(e) for e in errors)
+    assert manager.ids.max_id in (None, 0)
+
+
+def test_snapshot_is_shared_until_the_next_change(manager):
+    snapshot = manager.snapshot()
+    assert manager.snapshot() is snapshot
+    assert snapshot.is_current
+    before = dict(snapshot)
+
+    manager.update_shift("1", shift_record(tasks=9))
+    manager.delete_shift("2")
+    manager.add_shift("11", shift_record(date="2024-05-11"))
+    # The copy-on-write table left the snapshot as it was.
+    assert not snapshot.is_current
+    assert dict(snapshot) == before
+    assert snapshot["1"].tasks_completed == 4 and "2" in snapshot and "11" not in snapshot
+
+    latest = manager.snapshot()
+    assert latest is not snapshot and latest.is_current
+    assert latest["1"].tasks_completed == 9 and "2" not in latest and "11" in latest
+
+
+def test_snapshot_readers_run_alongside_writes(manager):
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = manager.snapshot()
+            try:
+                # Iterating a snapshot never sees the table change size.
+                assert sum(1 for _ in snapshot.items()) == len(snapshot)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    try:
+        for i in range(11, 111):
+            manager.add_shift(str(i), shift_record(date="2024-05-11"))
+            manager.delete_shift(str(i - 5))
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+    assert errors == []
+    assert sorted(manager.snapshot(), key=int) == [str(i) for i in [*range(1, 6), *range(106, 111)]]
+
+
+def test_table_is_copied_at_most_once_per_held_snapshot(manager):
+    copies = 0
+
+    def write(shift_id):
+        nonlocal copies
+        table = manager.get_shifts()
+        manager.add_shift(shift_id, shift_record())
+        copies += manager.get_shifts() is not table
+
+    # With no snapshot held, writes go straight to the table.
+    write("11")
+    manager.snapshot()
+    write("12")
+    assert copies == 0
+
+    # A held snapshot costs one copy, not one per write.
+    snapshot = manager.snapshot()
+    for shift_id in ("13", "14", "15"):
+        write(shift_id)
+    assert copies == 1 and len(snapshot) == 12
+
+    # Iterating holds the snapshot even when the caller doesn't.
+    shift_ids = iter(manager.snapshot())
+    del snapshot
+    next(shift_ids)
+    write("16")
+    assert copies == 2 and sum(1 for _ in shift_ids) == 14
+
+    # Snapshots dropped before the write cost nothing.
+    for shift_id in range(17, 67):
+        taken = manager.snapshot()
+        if shift_id % 2:
+            del taken
+        write(str(shift_id))
+        taken = None
+    assert copies == 2 + 25
+
+
+class Recorder:
+    """An observer that logs the notifications it gets."""
+
+    def __init__(self, events):
+        self.events = events
+
+    def reset(self, shifts):
+        self.events.append("reset")
+
+    def put(self, shift_id, old, new):
+        self.events.append(("put", shift_id, old.project_id))
+
+    def delete(self, shift_id, old):
+        self.events.append(("delete", shift_id))
+
+
+def test_bulk_update_is_one_change(manager):
+    saves, events = [], []
+    real_save = manager.storage.save
+    manager.storage.save = lambda shifts: saves.append(dict(shifts)) or real_save(shifts)
+    manager.add_observer(Recorder(events))
+    events.clear()
+    generation = manager.generation
+
+    updates = {shift_id: manager.get_shifts()[shift_id].replace(project_id="P9") for shift_id in ("2", "4", "6")}
+    manager.update_shifts(updates)
+    assert manager.generation == generation + 1
+    assert len(saves) == 1 and saves[0]["4"].project_id == "P9"
+    assert events == [("put", shift_id, "P1") for shift_id in ("2", "4", "6")]
+    assert [shift_id for shift_id, _ in manager.query(project="P9")] == ["2", "4", "6"]
+
+    # One missing ID rejects the whole batch.
+    with pytest.raises(KeyError):
+        manager.update_shifts({"1": shift_record(tasks=9), "99": shift_record()})
+    assert manager.get_shifts()["1"].tasks_completed == 4
+    assert manager.generation == generation + 1 and len(saves) == 1
+
+
+def test_bulk_delete_removes_shifts_and_logs(manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(data_manager, "LOGS_DIR", tmp_path / "logs")
+    (tmp_path / "logs").mkdir()
+    for shift_id in ("3", "5", "7"):
+        (tmp_path / "logs" / f"{shift_id}.md").write_text("log")
+    generation = manager.generation
+
+    with pytest.raises(KeyError):
+        manager.delete_shifts(["3", "99"])
+    assert len(manager.get_shifts()) == 10
+
+    manager.delete_shifts(["3", "5", "3", "8"])
+    assert manager.generation == generation + 1
+    assert sorted(manager.get_shifts(), key=int) == ["1", "2", "4", "6", "7", "9", "10"]
+    assert [p.name for p in (tmp_path / "logs").iterdir()] == ["7.md"]
+    assert [shift_id for shift_id, _ in manager.query(end="2024-05-05")] == ["1", "2", "4"]
@@ -0,0 +1,145 @@
+import json
+import sqlite3
+
+import pytest
+
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.encrypted_storage import PASSPHRASE_ENV, DecryptionError, EncryptedStorage
+from labelsmith.shyft.core.generation import WriteGuard, read_generation
+from tests.conftest import shift_record
+
+PASSPHRASE = "correct horse"
+
+
+@pytest.fixture(autouse=True)
+def no_env_passphrase(monkeypatch):
+    monkeypatch.delenv(PASSPHRASE_ENV, raising=False)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"data": {"1": shift_record(), "2": shift_record(date="2024-05-02")}}))
+    return path
+
+
+def _storage(tmp_path, data_file, passphrase=None):
+    return EncryptedStorage(tmp_path / "data.sqlite3", import_path=data_file, passphrase=passphrase)
+
+
+def _unlocked_manager(tmp_path, data_file):
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    manager.unlock(PASSPHRASE)
+    return manager
+
+
+def test_starts_locked_without_prompting(tmp_path, data_file):
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    assert manager.locked
+    assert manager.get_shifts() == {}
+    # Nothing was read yet, so the plaintext is still there.
+    assert data_file.exists()
+    with pytest.raises(DecryptionError):
+        manager.add_shift("3", shift_record())
+    with pytest.raises(DecryptionError):
+        manager.save_data()
+
+    manager.unlock(PASSPHRASE)
+    assert not manager.locked
+    assert sorted(manager.get_shifts()) == ["1", "2"]
+    manager.close()
+
+
+def test_env_passphrase_unlocks(tmp_path, data_file, monkeypatch):
+    _unlocked_manager(tmp_path, data_file).close()
+    monkeypatch.setenv(PASSPHRASE_ENV, PASSPHRASE)
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    assert not manager.locked
+    assert len(manager.get_shifts()) == 2
+    manager.close()
+
+
+def test_wrong_passphrase_stays_locked(tmp_path, data_file, monkeypatch):
+    _unlocked_manager(tmp_path, data_file).close()
+
+    monkeypatch.setenv(PASSPHRASE_ENV, "wrong")
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    assert manager.locked
+    assert manager.get_shifts() == {}
+
+    with pytest.raises(DecryptionError):
+        manager.unlock("also wrong")
+    assert manager.locked
+    with pytest.raises(DecryptionError):
+        manager.add_shifts({"3": shift_record()})
+
+    manager.unlock(PASSPHRASE)
+    assert len(manager.get_shifts()) == 2
+    manager.close()
+
+
+def test_undecryptable_record_aborts_load(tmp_path, data_file):
+    _unlocked_manager(tmp_path, data_file).close()
+    with sqlite3.connect(tmp_path / "data.sqlite3") as conn:
+        conn.execute("UPDATE shifts SET token = ? WHERE id = '2'", (b"not a token",))
+
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    with pytest.raises(DecryptionError):
+        manager.unlock(PASSPHRASE)
+    assert manager.locked
+    assert manager.get_shifts() == {}
+    with pytest.raises(DecryptionError):
+        manager.add_shift("3", shift_record())
+    manager.close()
+
+    # The good record was not overwritten by an empty table.
+    with sqlite3.connect(tmp_path / "data.sqlite3") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM shifts").fetchone()[0] == 2
+
+
+def test_import_shreds_plaintext(tmp_path, data_file):
+    columns = tmp_path / "columns" / "1-abcd"
+    columns.mkdir(parents=True)
+    (columns / "pay.npy").write_bytes(b"plaintext pay")
+    plots = tmp_path / "plots"
+    plots.mkdir()
+    (plots / "page.html").write_text("<html>$20.00</html>")
+
+    manager = _unlocked_manager(tmp_path, data_file)
+    assert not data_file.exists()
+    assert not any(path.is_file() for path in (tmp_path / "columns").rglob("*"))
+    assert not any(plots.iterdir())
+    manager.close()
+
+    # The import is recorded; the shifts come from the database from now on.
+    manager = _unlocked_manager(tmp_path, data_file)
+    assert sorted(manager.get_shifts()) == ["1", "2"]
+    manager.close()
+
+
+def test_updates_persist(tmp_path, data_file):
+    manager = _unlocked_manager(tmp_path, data_file)
+    manager.update_shift("1", shift_record(tasks=9))
+    manager.close()
+
+    storage = _storage(tmp_path, data_file, passphrase=lambda: PASSPHRASE)
+    assert storage.load()["1"].tasks_completed == 9
+    storage.close()
+
+
+def test_non_numeric_ids_are_encrypted(tmp_path, data_file):
+    manager = _unlocked_manager(tmp_path, data_file)
+    manager.add_shift("imported-a", shift_record(date="2024-02-02"))
+    manager.add_shifts({"imported-b": shift_record(date="2024-02-03")})
+    storage = _storage(tmp_path, data_file, passphrase=lambda: PASSPHRASE)
+    assert set(storage.load()) == {"1", "2", "imported-a", "imported-b"}
+
+
+def test_first_use_without_data_file_takes_the_write_guard(tmp_path):
+    guard = WriteGuard(tmp_path / "data.lock", tmp_path / "data.generation")
+    storage = EncryptedStorage(
+        tmp_path / "data.sqlite3", import_path=tmp_path / "missing.json", passphrase=lambda: PASSPHRASE, guard=guard
+    )
+    assert storage.load() == {}
+    # Unlocking a new store and recording the empty import are both guarded writes.
+    assert read_generation(guard.generation_path) == 2
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+from array import array
+
+import pytest
+
+from labelsmith.shyft.core.bulk_import import import_shifts
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core import sqlite_storage
+from labelsmith.shyft.core.export import export_shifts, iter_export_rows
+from labelsmith.shyft.core.shift import Shift
+from labelsmith.shyft.core.sqlite_storage import SQLiteStorage
+from labelsmith.shyft.core.storage import JsonStorage
+from tests.conftest import shift_record
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DataManager(storage=JsonStorage(tmp_path / "data.json"))
+    timed = Shift.from_dict(shift_record(date="2024-05-01", hours="0.25")).replace(
+        task_durations=array("I", [300, 630])
+    )
+    manager.add_shifts({
+        "3": shift_record(date="2024-05-02", project="P2"),
+        "1": timed,
+        "2": shift_record(date="2024-05-03", model="M2", pay="n/a"),
+        "10": shift_record(date="2024-05-01", rate="25.50", pay="25.50"),
+    })
+    return manager
+
+
+def _export(manager, file_format="csv", **kwargs):
+    out = io.StringIO(newline="")
+    count = export_shifts(out, manager, file_format, **kwargs)
+    return count, out.getvalue()
+
+
+def test_csv_rows_follow_date_and_id_order(manager):
+    count, text = _export(manager)
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert count == len(rows) == 4
+    assert [row["Shift ID"] for row in rows] == ["1", "10", "3", "2"]
+    assert rows[1]["Hourly rate"] == "25.50"
+    assert rows[0]["Duration (hrs)"] == "0.25"
+    # Values that never parsed are exported as they were entered.
+    assert rows[3]["Gross pay"] == "n/a"
+
+
+def test_jsonl_rows_are_v2_records(manager):
+    count, text = _export(manager, "jsonl", start="2024-05-02", model="M1")
+    rows = [json.loads(line) for line in text.splitlines()]
+    assert count == 1
+    assert rows == [{"Shift ID": "3", **manager.get_shifts()["3"].to_record()}]
+
+
+def test_task_rows(manager):
+    _, text = _export(manager, tasks=True, end="2024-05-01")
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [(row["Shift ID"], row["Task"], row["Task duration (s)"], row["Task duration (hh:mm)"])
+            for row in rows] == [("1", "1", "300", "00:05"), ("1", "2", "630", "00:10"), ("10", "", "", "")]
+
+    _, text = _export(manager, "jsonl", tasks=True, project="P1", end="2024-05-01")
+    rows = [json.loads(line) for line in text.splitlines()]
+    assert "Task durations (s)" not in rows[0]
+    assert [row["Task"] for row in rows] == [1, 2, ""]
+
+
+def test_csv_export_can_be_imported(manager, tmp_path):
+    path = tmp_path / "export.csv"
+    with open(path, "w", newline="") as f:
+        export_shifts(f, manager, project="P1", end="2024-05-01")
+    target = DataManager(storage=JsonStorage(tmp_path / "target.json"))
+    report = import_shifts(path, target)
+    assert (report.imported, report.errors) == (2, [])
+    source = [manager.get_shifts()[shift_id] for shift_id in ("1", "10")]
+    imported = [target.get_shifts()[shift_id] for shift_id in ("0001", "0002")]
+    for a, b in zip(source, imported):
+        for attr in ("date", "model_id", "time_in", "time_out", "hourly_rate_cents", "tasks_completed"):
+            assert getattr(a, attr) == getattr(b, attr)
+
+
+def test_unknown_format_is_rejected(manager):
+    with pytest.raises(ValueError):
+        export_shifts(io.StringIO(), manager, "xlsx")
+
+
+def test_rows_stream_from_the_table_as_export_started(manager, monkeypatch):
+    monkeypatch.setattr(manager, "query", None)
+    rows = iter_export_rows(manager)
+    assert next(rows)["Shift ID"] == "1"
+    # Edits made mid-export don't tear it: the rest comes from the same table.
+    manager.delete_shift("3")
+    manager.update_shift("2", shift_record(date="2024-05-03", tasks=9))
+    manager.add_shift("11", shift_record(date="2024-05-02"))
+    rest = list(rows)
+    assert [row["Shift ID"] for row in rest] == ["10", "3", "2"]
+    assert rest[-1]["Tasks completed"] == "4"
+
+
+def test_sqlite_rows_are_read_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_storage, "QUERY_BATCH_SIZE", 2)
+    manager = DataManager(storage=SQLiteStorage(tmp_path / "data.sqlite3", import_path=None))
+    manager.add_shifts({str(i): shift_record(date=f"2024-05-{i % 7 + 1:02d}") for i in range(1, 12)})
+    count, text = _export(manager, "jsonl", start="2024-05-02")
+    rows = [json.loads(line) for line in text.splitlines()]
+    assert count == 10
+    assert [row["Shift ID"] for row in rows] == [shift_id for shift_id, _ in manager.query(start="2024-05-02")]
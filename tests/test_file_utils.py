@@ -0,0 +1,57 @@
+import os
+import stat
+
+import pytest
+
+from labelsmith.shyft.utils.file_utils import atomic_open, atomic_write_json, shred_file
+
+
+def test_atomic_write_json_replaces_target(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write_json(path, {"a": 1})
+    atomic_write_json(path, {"a": 2})
+    assert path.read_text() == '{\n    "a": 2\n}'
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_failed_write_leaves_target_untouched(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("original")
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write("partial")
+            raise RuntimeError("boom")
+    assert path.read_text() == "original"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+def test_permissions_match_plain_open(tmp_path):
+    plain = tmp_path / "plain"
+    plain.write_text("")
+    path = tmp_path / "new"
+    with atomic_open(path) as f:
+        f.write("x")
+    assert stat.S_IMODE(path.stat().st_mode) == stat.S_IMODE(plain.stat().st_mode)
+
+    os.chmod(path, 0o640)
+    with atomic_open(path) as f:
+        f.write("y")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+
+def test_shred_file(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_bytes(b"x" * 3000)
+    contents = []
+    real_remove = os.remove
+
+    def remove(target):
+        contents.append(open(target, "rb").read())
+        real_remove(target)
+
+    monkeypatch.setattr(os, "remove", remove)
+    shred_file(path, chunk_size=1024)
+    assert contents == [bytes(3000)]
+    assert not path.exists()
@@ -0,0 +1,85 @@
+import json
+import os
+
+import pytest
+
+from labelsmith.shyft.core.generation import ChangeWatcher, WriteGuard, read_generation
+from labelsmith.shyft.core.shift import Shift
+from labelsmith.shyft.core.storage import JsonStorage
+from labelsmith.shyft.utils.file_lock import FileLock, LockTimeout
+from tests.conftest import shift_record
+
+
+def _guard(tmp_path, timeout=10.0):
+    return WriteGuard(tmp_path / "data.lock", tmp_path / "data.generation", timeout=timeout)
+
+
+def test_writes_publish_one_generation_each(tmp_path):
+    guard = _guard(tmp_path)
+    assert guard.generation == 0
+    with guard.writing():
+        # A nested write publishes once, from the outermost block.
+        with guard.writing():
+            pass
+        assert read_generation(guard.generation_path) == 0
+    assert read_generation(guard.generation_path) == 1
+
+    # Another writer's generation is picked up, not overwritten.
+    other = _guard(tmp_path)
+    with other.writing():
+        pass
+    with guard.writing():
+        pass
+    assert guard.generation == read_generation(guard.generation_path) == 3
+
+    with pytest.raises(RuntimeError):
+        with guard.writing():
+            raise RuntimeError("write failed")
+    assert read_generation(guard.generation_path) == 3
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows has no shared locks")
+def test_writers_exclude_readers_and_each_other(tmp_path):
+    path = tmp_path / "data.lock"
+    # Separate FileLocks hold separate descriptors, like separate processes.
+    with FileLock(path):
+        with pytest.raises(LockTimeout):
+            FileLock(path, timeout=0.05).acquire()
+        with pytest.raises(LockTimeout):
+            FileLock(path, shared=True, timeout=0.05).acquire()
+    with FileLock(path, shared=True), FileLock(path, shared=True, timeout=0.05):
+        with pytest.raises(LockTimeout):
+            FileLock(path, timeout=0.05).acquire()
+
+
+def test_reading_inside_a_write_does_not_deadlock(tmp_path):
+    guard = _guard(tmp_path, timeout=0.5)
+    with guard.writing():
+        with guard.reading():
+            pass
+
+
+def test_watcher_reports_commits_from_other_writers(tmp_path):
+    data_path = tmp_path / "data.json"
+    guard = _guard(tmp_path)
+    storage = JsonStorage(data_path, guard=guard)
+    watcher = ChangeWatcher(guard.generation_path, data_path)
+    assert watcher.poll() is False
+
+    storage.save({"1": Shift.from_dict(shift_record())})
+    assert watcher.poll() is True
+    assert watcher.generation == 1
+    assert watcher.poll() is False
+
+    # Rewriting the generation file with the same number is not a change.
+    guard.generation_path.write_text(json.dumps({"generation": 1, "pid": 0}))
+    assert watcher.poll() is False
+
+
+def test_watcher_falls_back_to_the_data_file(tmp_path):
+    data_path = tmp_path / "data.json"
+    watcher = ChangeWatcher(tmp_path / "data.generation", data_path)
+    assert watcher.poll() is False
+    data_path.write_text("{}")
+    assert watcher.poll() is True
+    assert watcher.poll() is False
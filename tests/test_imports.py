@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+ENTRY_POINTS = [
+    "labelsmith",
+    "labelsmith.shyft.Shyft",
+    "labelsmith.shyft.cli",
+    "labelsmith.shyft.__main__",
+    "labelsmith.utils.metrics",
+]
+
+
+def _import_fresh(module):
+    # A fresh interpreter per module: an import cycle only shows up when the
+    # module is the first thing imported. Every labelsmith import runs the
+    # package __init__s first, so these cover the submodules too.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(SRC), os.environ.get("PYTHONPATH", "")]))
+    return subprocess.run(
+        [sys.executable, "-c", f"import {module}"], env=env, capture_output=True, text=True, timeout=120
+    )
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_imports_cleanly(module):
+    result = _import_fresh(module)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,72 @@
+import random
+from datetime import date
+
+from labelsmith.shyft.core.indexes import ShiftIdIndex, ShiftIndex
+from labelsmith.shyft.core.shift import Shift
+from tests.conftest import shift_record
+
+DATES = ["2024-01-05", "2024-01-06", "2024-02-10", "2024-03-01", None]
+MODELS = ["M1", "M2", None]
+PROJECTS = ["P1", "P2", "P3"]
+
+
+def _random_shift(rng):
+    return Shift.from_dict(shift_record(date=rng.choice(DATES), model=rng.choice(MODELS), project=rng.choice(PROJECTS)))
+
+
+def _scan(shifts, start=None, end=None, model=None, project=None):
+    def matches(shift):
+        day = shift.date or ""
+        return (
+            (start is None or day >= str(start))
+            and (end is None or day <= str(end))
+            and (model is None or shift.model_id == model)
+            and (project is None or shift.project_id == project)
+        )
+
+    keys = sorted((shift.date or "", int(shift_id), shift_id) for shift_id, shift in shifts.items() if matches(shift))
+    return [key[2] for key in keys]
+
+
+def test_shift_index_matches_a_scan_after_random_edits():
+    rng = random.Random(4)
+    shifts = {str(i): _random_shift(rng) for i in range(1, 60)}
+    index = ShiftIndex()
+    index.reset(shifts)
+    for _ in range(400):
+        shift_id = str(rng.randint(1, 80))
+        if shift_id in shifts and rng.random() < 0.3:
+            index.delete(shift_id, shifts.pop(shift_id))
+        else:
+            new = _random_shift(rng)
+            index.put(shift_id, shifts.get(shift_id), new)
+            shifts[shift_id] = new
+
+        start = rng.choice([None, "2024-01-06", date(2024, 2, 1)])
+        end = rng.choice([None, "2024-01-06", "2024-02-29"])
+        model = rng.choice([None] + MODELS)
+        project = rng.choice([None] + PROJECTS)
+        assert index.query(start, end, model, project) == _scan(shifts, start, end, model, project)
+
+
+def test_shift_id_index_orders_numerically_and_tracks_max():
+    index = ShiftIdIndex()
+    index.reset({"2": None, "10": None, "9": None})
+    assert index.ordered() == ["2", "9", "10"]
+    assert index.max_id == 10
+
+    index.put("11", None, object())
+    index.put("10", object(), object())  # an update doesn't add a second entry
+    assert index.ordered(descending=True) == ["11", "10", "9", "2"]
+    assert index.max_id == 11
+
+    index.delete("11", None)
+    assert index.max_id == 10
+    assert index.neighbors("9") == ("2", "10")
+    assert index.neighbors("5") == ("2", "9")
+    assert index.neighbors("10") == ("9", None)
+
+    for shift_id in ("2", "9", "10"):
+        index.delete(shift_id, None)
+    assert index.max_id == 0
+    assert len(index) == 0
@@ -0,0 +1,72 @@
+import pytest
+
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.integrity import verify_and_repair, verify_shifts
+from labelsmith.shyft.core.shift import DURATION, GROSS_PAY, Shift
+from labelsmith.shyft.core.storage import JsonStorage
+from tests.conftest import shift_record
+
+
+def _timed(**fields):
+    # As the autologger logs them: Duration is the timer's elapsed time.
+    record = shift_record(**fields)
+    record["Task durations"] = {str(i): {"Duration (hh:mm)": "00:10"} for i in range(1, 5)}
+    return record
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DataManager(storage=JsonStorage(tmp_path / "data.json"))
+    manager.add_shifts({
+        # Timer ran 09:00:59 to 10:01:00; In/Out lose the seconds.
+        "1": shift_record(time_in="09:00", time_out="10:01", hours="1.00", pay="20.01"),
+        # Same, logged by the autologger.
+        "2": _timed(time_in="09:00", time_out="10:01", hours="1.00", pay="20.01"),
+        # Autologger shift with half an hour paused: In/Out span 2 hours.
+        "3": _timed(time_in="09:00", time_out="11:00", hours="1.50", pay="30.00"),
+        # Autologger shift whose pay doesn't match its own duration.
+        "4": _timed(time_in="09:00", time_out="11:00", hours="1.50", pay="99.00"),
+        # Hand-edited Duration and pay that disagree with In/Out.
+        "5": shift_record(time_in="09:00", time_out="10:00", hours="2.00", pay="40.00"),
+        # Before schema v2 hours had two decimals: 09:00-09:20 is 0.33.
+        "6": shift_record(time_in="09:00", time_out="09:20", hours="0.33", pay="6.67"),
+    })
+    return manager
+
+
+def test_minute_resolution_is_not_drift(manager):
+    report, fixes = verify_shifts(manager.snapshot())
+    assert report.checked == 6
+    assert sorted(fixes) == ["4", "5"]
+    assert fixes["4"] == {"gross_pay_cents": 3000}
+    assert fixes["5"] == {"duration_s": 3600, "gross_pay_cents": 2000}
+    assert ("5", DURATION, 7200, 3600) in report.mismatches
+    assert not any(shift_id == "4" and field == DURATION for shift_id, field, _, _ in report.mismatches)
+
+
+def test_repair_keeps_timer_durations(manager):
+    before = dict(manager.get_shifts())
+    report = verify_and_repair(manager, repair=True)
+    assert report.repaired == 2
+
+    shifts = manager.get_shifts()
+    for shift_id in ("1", "2", "3", "6"):
+        assert shifts[shift_id] is before[shift_id]
+    assert shifts["4"].duration_s == 5400
+    assert shifts["4"].gross_pay_cents == 3000
+    assert shifts["5"].duration_s == 3600
+    assert shifts["5"].gross_pay_cents == 2000
+
+    report, fixes = verify_shifts(manager.snapshot())
+    assert fixes == {}
+
+
+def test_gross_pay_tolerance_scales_with_rate():
+    # A minute at $120/h is $2.00: still within the In/Out resolution.
+    shifts = {
+        "1": Shift.from_dict(shift_record(time_in="09:00", time_out="10:01", hours="1.00", rate="120.00", pay="120.00")),
+        "2": Shift.from_dict(shift_record(time_in="09:00", time_out="10:00", hours="1.00", rate="120.00", pay="125.00")),
+    }
+    report, fixes = verify_shifts(shifts)
+    assert sorted(fixes) == ["2"]
+    assert report.mismatches == [("2", GROSS_PAY, 12500, 12000)]
@@ -0,0 +1,49 @@
+import gzip
+import json
+
+import pytest
+
+from labelsmith.shyft.utils.json_stream import iter_shift_records
+from tests.conftest import shift_record
+
+DOCUMENT = {
+    "schema_version": 2,
+    "data": {
+        "1": shift_record(),
+        "2": {**shift_record(date="2024-05-02"), "Note": "quotes \" braces {} and é"},
+        "10": {"Duration (s)": 12345678901234567890, "Rate": 1.5e-3, "Flags": [True, False, None]},
+    },
+    "trailer": {"nested": [1, 2, 3]},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64 * 1024])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_matches_json_load(tmp_path, chunk_size, indent):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(DOCUMENT, indent=indent))
+    header = {}
+    records = list(iter_shift_records(path, header=header, chunk_size=chunk_size))
+    # Numbers cut at a chunk edge must not be decoded early.
+    assert records == list(DOCUMENT["data"].items())
+    assert header == {"schema_version": 2, "trailer": {"nested": [1, 2, 3]}}
+
+
+def test_gzip_and_empty_files(tmp_path):
+    path = tmp_path / "data.json.gz"
+    with gzip.open(path, "wt") as f:
+        json.dump(DOCUMENT, f)
+    assert dict(iter_shift_records(path, chunk_size=5)) == DOCUMENT["data"]
+
+    for text in ("{}", '{"data": {}}', ' { "schema_version" : 2 , "data" : { } } '):
+        path = tmp_path / "empty.json"
+        path.write_text(text)
+        assert list(iter_shift_records(path)) == []
+
+
+@pytest.mark.parametrize("text", ["", "[]", '{"data": {"1": {}', '{"data": {"1": {}} ,', '{"data": {"1" {}}}'])
+def test_invalid_files_raise(tmp_path, text):
+    path = tmp_path / "data.json"
+    path.write_text(text)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_shift_records(path, chunk_size=3))
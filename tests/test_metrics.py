@@ -0,0 +1,36 @@
+import json
+
+import pandas as pd
+import pytest
+
+from labelsmith.utils.columnar import build_frame
+from labelsmith.utils.metrics import ShyftMetrics
+from tests.conftest import shift_record
+
+RECORDS = {
+    "1": shift_record(date="2024-05-01", hours="2.00", pay="40.00", tasks=8),
+    "2": shift_record(date="2024-05-01", hours="1.00", pay="25.00", tasks=2),
+    "3": shift_record(date="2024-05-03", hours="0.50", pay="10.00", tasks=5),
+    "4": shift_record(date="2024-05-04", hours="3.00", pay="60.00", tasks=0),
+}
+
+
+def test_efficiency_metrics_read_the_shared_daily_frame(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"data": RECORDS}))
+    metrics = ShyftMetrics(path)
+
+    frame = build_frame(RECORDS)
+    daily = frame.groupby("Date").agg({
+        "Tasks completed": "sum",
+        "Avg time per task (min)": "mean",
+        "Duration (hrs)": "sum",
+        "Gross pay": "sum",
+    })
+    pd.testing.assert_frame_equal(metrics.daily, daily)
+    result = metrics.calculate_efficiency_metrics()
+    assert result["Avg Tasks per Hour"] == pytest.approx((10 / 3 + 10 + 0) / 3)
+    assert result["Avg Earnings per Hour"] == pytest.approx((65 / 3 + 20 + 20) / 3)
+    assert result["Best Day (Tasks)"] == 10
+    assert result["Best Day (Earnings)"] == 65
+    assert result["Best Day (Efficiency)"] == pytest.approx(6.0)
@@ -0,0 +1,158 @@
+import gzip
+import json
+
+from labelsmith.shyft.core.migrations import migrate_file, migrate_partitions, record_version, upgrade_record
+from labelsmith.shyft.core.shift import (
+    DURATION,
+    DURATION_SECONDS,
+    GROSS_PAY,
+    GROSS_PAY_CENTS,
+    HOURLY_RATE_CENTS,
+    SCHEMA_VERSION,
+    TASKS_COMPLETED,
+)
+from tests.conftest import shift_record
+
+
+def _v1_file(path, shifts):
+    path.write_text(json.dumps({"data": shifts}, indent=4))
+    return path
+
+
+def _shifts():
+    return {
+        "1": shift_record(hours="1.50", pay="30.00"),
+        "2": shift_record(date="2024-05-02", hours="0.33", rate="20.00", pay="6.67", tasks=2),
+    }
+
+
+def test_record_version():
+    v1 = shift_record()
+    assert record_version(v1, None) == 1
+    assert record_version(v1, SCHEMA_VERSION) == 1
+    v2, _, _ = upgrade_record(v1, None)
+    assert record_version(v2, None) == SCHEMA_VERSION
+    assert record_version(v2, SCHEMA_VERSION) == SCHEMA_VERSION
+
+
+def test_upgrade_record_converts_to_integers():
+    record, start, issues = upgrade_record(shift_record(hours="1.25", rate="20.00", pay="25.00", tasks="5"), None)
+    assert start == 1
+    assert issues == []
+    assert record[DURATION_SECONDS] == 4500
+    assert record[HOURLY_RATE_CENTS] == 2000
+    assert record[GROSS_PAY_CENTS] == 2500
+    assert record[TASKS_COMPLETED] == 5
+    assert DURATION not in record and GROSS_PAY not in record
+
+
+def test_upgrade_record_keeps_unconvertible_values():
+    record, _, issues = upgrade_record(shift_record(pay="n/a", tasks="many"), None)
+    assert record[GROSS_PAY] == "n/a"
+    assert record[TASKS_COMPLETED] == "many"
+    assert len(issues) == 2
+
+
+def test_upgrade_record_leaves_current_records_alone():
+    current, _, _ = upgrade_record(shift_record(), None)
+    again, start, issues = upgrade_record(dict(current), SCHEMA_VERSION)
+    assert start == SCHEMA_VERSION
+    assert again == current
+    assert issues == []
+
+
+def test_migrate_file(tmp_path):
+    path = _v1_file(tmp_path / "data.json", _shifts())
+    original = path.read_text()
+
+    report = migrate_file(path)
+    assert report.changed
+    assert (report.records, report.upgraded, report.current) == (2, 2, 0)
+    assert report.duration_s == 5400 + 1188
+    assert report.gross_pay_cents == 3667
+
+    migrated = json.loads(path.read_text())
+    assert migrated["schema_version"] == SCHEMA_VERSION
+    assert migrated["data"]["1"][DURATION_SECONDS] == 5400
+    assert migrated["data"]["2"][GROSS_PAY_CENTS] == 667
+    assert report.backup_path == tmp_path / "data.json.v1.bak"
+    assert report.backup_path.read_text() == original
+
+    # A second run finds nothing to do and leaves the file as it is.
+    written = path.read_text()
+    report = migrate_file(path)
+    assert not report.changed
+    assert report.current == 2
+    assert path.read_text() == written
+
+
+def test_migrate_file_dry_run(tmp_path):
+    path = _v1_file(tmp_path / "data.json", _shifts())
+    original = path.read_text()
+    report = migrate_file(path, dry_run=True)
+    assert report.changed
+    assert report.upgraded == 2
+    assert report.backup_path is None
+    assert path.read_text() == original
+    assert list(tmp_path.iterdir()) == [path]
+    assert "Would upgrade 2 of 2" in report.format()
+
+
+def test_migrate_file_without_backup(tmp_path):
+    path = _v1_file(tmp_path / "data.json", _shifts())
+    report = migrate_file(path, backup=False)
+    assert report.changed
+    assert report.backup_path is None
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_migrate_gzip_file(tmp_path):
+    path = tmp_path / "data.json.gz"
+    with gzip.open(path, "wt") as f:
+        json.dump({"data": _shifts()}, f)
+    migrate_file(path, backup=False)
+    with gzip.open(path, "rt") as f:
+        migrated = json.load(f)
+    assert migrated["schema_version"] == SCHEMA_VERSION
+    assert migrated["data"]["1"][GROSS_PAY_CENTS] == 3000
+
+
+def test_migrate_file_mixed_versions(tmp_path):
+    current, _, _ = upgrade_record(shift_record(), None)
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"schema_version": SCHEMA_VERSION, "data": {"1": current, "2": shift_record()}}))
+    report = migrate_file(path, backup=False)
+    assert (report.upgraded, report.current) == (1, 1)
+    migrated = json.loads(path.read_text())["data"]
+    assert migrated["1"] == migrated["2"] == current
+
+
+def test_migrate_partitions(tmp_path):
+    directory = tmp_path / "partitions"
+    directory.mkdir()
+    _v1_file(directory / "2024-04.json", {"1": shift_record(date="2024-04-30", hours="2.00", pay="40.00")})
+    _v1_file(directory / "2024-05.json", _shifts())
+    manifest = {
+        "partitions": {
+            "2024-04": {"file": "2024-04.json", "sealed": True, "count": 1, "hours": 2.0, "gross_pay": 40.0},
+            "2024-05": {"file": "2024-05.json", "sealed": False, "count": 2, "hours": 1.83, "gross_pay": 36.67},
+        }
+    }
+    (directory / "manifest.json").write_text(json.dumps(manifest))
+
+    reports = migrate_partitions(directory, dry_run=True)
+    assert [report.upgraded for report in reports] == [1, 2]
+    assert json.loads((directory / "manifest.json").read_text()) == manifest
+
+    reports = migrate_partitions(directory)
+    assert all(report.changed for report in reports)
+    entries = json.loads((directory / "manifest.json").read_text())["partitions"]
+    assert entries["2024-04"]["sealed"] is True
+    assert entries["2024-04"]["duration_s"] == 7200
+    assert entries["2024-05"]["gross_pay_cents"] == 3667
+    assert all("hours" not in entry and "gross_pay" not in entry for entry in entries.values())
+    # Partitions are migrated in place, without backups.
+    assert sorted(path.name for path in directory.iterdir()) == ["2024-04.json", "2024-05.json", "manifest.json"]
+    assert json.loads((directory / "2024-04.json").read_text())["schema_version"] == SCHEMA_VERSION
+
+    assert migrate_partitions(tmp_path / "missing") == []
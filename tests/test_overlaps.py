@@ -0,0 +1,70 @@
+import random
+
+from labelsmith.shyft.core.overlaps import IntervalTree, OverlapIndex, audit_overlaps, shift_interval
+from labelsmith.shyft.core.shift import Shift
+from tests.conftest import shift_record
+
+
+def _shift(date, time_in, time_out):
+    return Shift.from_dict(shift_record(date=date, time_in=time_in, time_out=time_out))
+
+
+def test_shift_interval_wraps_past_midnight():
+    start, end = shift_interval("2024-05-01", "23:00", "01:00")
+    assert end - start == 120
+    assert shift_interval("2024-05-02", "00:00", "00:30")[0] == start + 60
+    assert shift_interval("2024-05-01", "09:00", "09:00") == (start - 14 * 60, start - 14 * 60)
+    assert shift_interval("2024-05-01", "9:00", "10:00") is None
+    assert shift_interval("not a date", "09:00", "10:00") is None
+
+
+def test_interval_tree_matches_brute_force():
+    rng = random.Random(7)
+    tree = IntervalTree(seed=1)
+    live = set()
+    initial = {(s, s + rng.randint(0, 50), f"b{i}") for i, s in enumerate(rng.sample(range(1000), 100))}
+    tree.build(list(initial))
+    live |= initial
+    for step in range(2000):
+        if live and rng.random() < 0.4:
+            key = rng.choice(sorted(live))
+            assert tree.remove(key)
+            live.remove(key)
+            assert not tree.remove(key)
+        else:
+            start = rng.randint(0, 1000)
+            key = (start, start + rng.randint(0, 60), f"k{step}")
+            tree.insert(key)
+            live.add(key)
+        assert len(tree) == len(live)
+        start = rng.randint(0, 1000)
+        end = start + rng.randint(0, 80)
+        expected = {key for key in live if start < end and key[0] < key[1] and key[0] < end and key[1] > start}
+        assert set(tree.overlapping(start, end)) == expected
+
+
+def test_overlap_index_follows_edits():
+    index = OverlapIndex()
+    index.reset({"1": _shift("2024-05-01", "22:00", "02:00"), "2": _shift("2024-05-02", "09:00", "10:00")})
+    assert index.find("2024-05-02", "01:00", "03:00") == ["1"]
+    assert index.find("2024-05-02", "01:00", "03:00", exclude="1") == []
+    assert index.find("2024-05-02", "10:00", "11:00") == []
+
+    index.put("1", _shift("2024-05-01", "22:00", "02:00"), _shift("2024-05-01", "20:00", "21:00"))
+    assert index.find("2024-05-02", "01:00", "03:00") == []
+    index.delete("2", _shift("2024-05-02", "09:00", "10:00"))
+    assert index.find("2024-05-02", "09:30", "09:45") == []
+
+
+def test_audit_reports_each_pair_once():
+    shifts = {
+        "1": _shift("2024-05-01", "09:00", "12:00"),
+        "2": _shift("2024-05-01", "11:00", "13:00"),
+        "3": _shift("2024-05-01", "11:30", "11:45"),
+        "4": _shift("2024-05-01", "13:00", "14:00"),
+        "5": _shift("2024-05-01", "15:00", "15:00"),
+    }
+    report = audit_overlaps(shifts)
+    assert report.pairs == [("1", "2", 60), ("1", "3", 15), ("2", "3", 15)]
+    assert report.conflicting_ids == ["1", "2", "3"]
+    assert "3 overlapping pairs" in report.format()
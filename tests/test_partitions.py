@@ -0,0 +1,140 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from labelsmith.shyft.core import partitions
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.partitions import PartitionedStorage
+from tests.conftest import shift_record
+
+TODAY = datetime.now().strftime("%Y-%m-%d")
+OLD_DATES = ["2023-01-10", "2023-01-11", "2023-02-05", "2023-03-20"]
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    shifts = {str(i): shift_record(date=date) for i, date in enumerate(OLD_DATES, start=1)}
+    shifts["5"] = shift_record(date=TODAY)
+    shifts["6"] = shift_record(date=None)
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"data": shifts}))
+    return path
+
+
+def _storage(tmp_path, data_file):
+    return PartitionedStorage(tmp_path / "partitions", import_path=data_file)
+
+
+def _split(tmp_path, data_file):
+    # The first load splits data.json into partitions and keeps everything.
+    assert len(_storage(tmp_path, data_file).load()) == 6
+
+
+def test_load_reads_only_open_partitions(tmp_path, data_file, monkeypatch):
+    _split(tmp_path, data_file)
+    storage = _storage(tmp_path, data_file)
+    opened = []
+    real_read = storage._read_partition
+    monkeypatch.setattr(storage, "_read_partition", lambda key, shifts: (opened.append(key), real_read(key, shifts)))
+
+    shifts = storage.load()
+    assert set(shifts) == {"5", "6"}
+    assert storage.cold_partitions() == ["2023-01", "2023-02", "2023-03"]
+    assert sorted(opened) == sorted([TODAY[:7], "undated"])
+    assert storage.cold_summary() == {"count": 4, "duration_s": 4 * 3600, "gross_pay_cents": 4 * 2000, "tasks": 16}
+    assert storage.cold_max_shift_id() == 4
+    assert not storage.is_loaded("2023-02-05")
+    assert storage.is_loaded(TODAY)
+
+    cold = storage.load_cold()
+    assert set(cold) == {"1", "2", "3", "4"}
+    assert storage.cold_partitions() == []
+
+
+def test_writing_a_cold_partition_requires_loading(tmp_path, data_file):
+    _split(tmp_path, data_file)
+    storage = _storage(tmp_path, data_file)
+    shifts = storage.load()
+    shifts["7"] = shift_record(date="2023-01-12")
+    with pytest.raises(RuntimeError):
+        storage.put(shifts, "7")
+
+
+def test_data_manager_defers_sealed_months(tmp_path, data_file):
+    _split(tmp_path, data_file)
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    assert not manager.history_loaded
+    assert manager.get_max_shift_id() == 6
+
+    # A new shift today is written without reading the sealed months.
+    manager.add_shift("7", shift_record(date=TODAY, time_in="11:00", time_out="12:00"))
+    assert manager.find_overlaps(TODAY, "11:30", "11:45") == ["7"]
+    assert not manager.history_loaded
+    assert set(manager.get_shifts(history=False)) == {"5", "6", "7"}
+
+    # Editing an old shift reads them first, so nothing is lost.
+    manager.update_shift("2", shift_record(date="2023-01-11", tasks=9))
+    assert manager.history_loaded
+    assert len(manager.get_shifts()) == 7
+    assert manager.aggregates.total.shifts == 7
+
+    reloaded = DataManager(storage=_storage(tmp_path, data_file))
+    assert len(reloaded.get_shifts()) == 7
+    assert reloaded.get_shifts()["2"].tasks_completed == 9
+
+
+def test_range_queries_open_only_matching_partitions(tmp_path, data_file, monkeypatch):
+    _split(tmp_path, data_file)
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    opened = []
+    real_iter = partitions.iter_shift_records
+    monkeypatch.setattr(partitions, "iter_shift_records", lambda path: opened.append(path.name) or real_iter(path))
+
+    assert [shift_id for shift_id, _ in manager.query(start="2023-01-11", end="2023-02-28")] == ["2", "3"]
+    assert opened == ["2023-01.json.gz", "2023-02.json.gz"]
+    # Loaded shifts and sealed ones come back together, in Date/ID order.
+    opened.clear()
+    matches = manager.query(start="2023-03-01", model="M1")
+    assert [shift_id for shift_id, _ in matches] == ["4", "5"]
+    assert opened == ["2023-03.json.gz"]
+    assert matches[0][1].date == "2023-03-20"
+    assert manager.query(start="2023-04-01", end="2023-04-30") == []
+    assert not manager.history_loaded
+
+    loaded = DataManager(storage=_storage(tmp_path, data_file))
+    loaded.load_history()
+    for start, end in (("2023-01-01", "2023-12-31"), (None, "2023-02-05"), (None, None)):
+        assert manager.query(start, end) == loaded.query(start, end)
+
+
+def _totals(cube):
+    return [
+        {name: (t.shifts, t.duration_s, t.gross_pay_cents, t.tasks) for name, t in groups.items()}
+        for groups in ({"": cube.total}, cube.by_project(), cube.by_model(), cube.by_day(), cube.by_week())
+    ]
+
+
+def test_totals_come_from_the_manifest(tmp_path, data_file):
+    _split(tmp_path, data_file)
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    manager.add_shift("7", shift_record(date=TODAY, project="P2", time_in="11:00", time_out="12:00"))
+    totals = _totals(manager.aggregates)
+    assert not manager.history_loaded
+    assert totals[0][""] == (7, 7 * 3600, 7 * 2000, 28)
+
+    manager.load_history()
+    assert _totals(manager.aggregates) == totals
+
+
+def test_old_manifests_fall_back_to_loading(tmp_path, data_file):
+    _split(tmp_path, data_file)
+    manifest_path = tmp_path / "partitions" / "manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    for entry in manifest["partitions"].values():
+        del entry["cells"]
+    manifest_path.write_text(json.dumps(manifest))
+
+    manager = DataManager(storage=_storage(tmp_path, data_file))
+    assert manager.aggregates.total.shifts == 6
+    assert manager.history_loaded
@@ -0,0 +1,28 @@
+import pandas as pd
+
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.storage import JsonStorage
+from labelsmith.shyft.utils.plotting import Plotting
+from labelsmith.utils.columnar import daily_frame, shift_frame
+from tests.conftest import shift_record
+
+
+def test_observers_register_on_first_plot(tmp_path):
+    manager = DataManager(storage=JsonStorage(tmp_path / "data.json"))
+    manager.add_shifts({str(i): shift_record(date=f"2024-05-{i:02d}") for i in range(1, 6)})
+    observers = list(manager._observers)
+
+    plotter = Plotting(manager)
+    assert manager._observers == observers
+    assert plotter.live is None
+
+    trend = plotter.productivity_earnings_trend(3)
+    assert manager._observers == observers + [plotter.live, plotter.trends]
+    assert len(trend) == 5
+
+    # Registered once, and kept current from then on.
+    manager.add_shift("6", shift_record(date="2024-05-06"))
+    assert plotter.reload_if_changed() is False
+    assert len(manager._observers) == len(observers) + 2
+    assert len(plotter.productivity_earnings_trend(3)) == 6
+    pd.testing.assert_frame_equal(plotter.daily(), daily_frame(shift_frame(manager.get_shifts())))
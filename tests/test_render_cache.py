@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+
+from labelsmith.shyft.utils.render_cache import RenderCache, render_key
+
+TREND = pd.DataFrame({"Date": pd.to_datetime(["2024-05-01", "2024-05-02"]), "Gross pay": [20.0, 35.5]})
+
+
+def test_render_key_hashes_values_and_params():
+    key = render_key(TREND, window=7, metric="Gross pay")
+    # Equal rows in a new frame, and params in another order, hit the same page.
+    assert render_key(TREND.copy(), metric="Gross pay", window=7) == key
+    assert render_key(TREND.set_axis([10, 11]), window=7, metric="Gross pay") == key
+
+    edited = TREND.copy()
+    edited.loc[1, "Gross pay"] = 35.6
+    assert render_key(edited, window=7, metric="Gross pay") != key
+    assert render_key(TREND, window=14, metric="Gross pay") != key
+    assert render_key(TREND.rename(columns={"Gross pay": "Tasks"}), window=7, metric="Gross pay") != key
+
+
+def test_get_and_put(tmp_path):
+    cache = RenderCache(tmp_path)
+    assert cache.get("abc") is None
+    path = cache.put("abc", "<html></html>")
+    assert path == tmp_path / "abc.html"
+    assert cache.get("abc") == path
+    assert path.read_text() == "<html></html>"
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=3000)
+    for second, key in enumerate(["a", "b", "c"], start=1):
+        cache.put(key, "x" * 1000)
+        os.utime(tmp_path / f"{key}.html", ns=(second * 10**9, second * 10**9))
+    # A hit makes "a" the most recently used page, leaving "b" the least.
+    assert cache.get("a") is not None
+
+    cache.put("d", "x" * 1000)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.html", "c.html", "d.html"]
+
+    # The page just written is kept even when it alone is over the limit.
+    cache.put("big", "x" * 5000)
+    assert [p.name for p in tmp_path.iterdir()] == ["big.html"]
@@ -0,0 +1,62 @@
+import json
+from array import array
+
+from labelsmith.shyft.core.shift import (
+    DURATION,
+    GROSS_PAY,
+    TASK_DURATIONS,
+    Shift,
+    encode_shift,
+    upgrade_v1_record,
+)
+from tests.conftest import shift_record
+
+
+def _timed_record():
+    record = shift_record(hours="0.25")
+    record[TASK_DURATIONS] = {"1": {"Duration (hh:mm)": "00:05"}, "2": {"Duration (hh:mm)": "00:10"}}
+    return record
+
+
+def test_v1_and_v2_records_load_the_same():
+    record = _timed_record()
+    upgraded, issues = upgrade_v1_record(record)
+    assert issues == []
+    shift = Shift.from_dict(record)
+    assert shift.to_record() == upgraded
+    assert Shift.from_dict(upgraded).to_record() == upgraded
+    assert (shift.duration_s, shift.hourly_rate_cents, shift.gross_pay_cents) == (900, 2000, 2000)
+    assert (shift.time_in, shift.time_out, shift.tasks_completed) == (540, 600, 4)
+    assert shift.task_durations == array("I", [300, 600])
+    assert shift.extra is None
+
+
+def test_mapping_view_uses_v1_strings():
+    record = _timed_record()
+    shift = Shift.from_dict(record)
+    expected = {**record, DURATION: "0.25", "Tasks completed": "4"}
+    assert shift.to_dict() == expected
+    assert list(shift) == list(expected)
+    assert shift.get("Missing") is None
+
+
+def test_unparsed_values_and_unknown_fields_are_kept():
+    record = {**shift_record(pay="n/a", time_in="9am"), "Notes": "late start"}
+    shift = Shift.from_dict(record)
+    assert shift.gross_pay_cents is None and shift.time_in is None
+    assert shift.extra == {GROSS_PAY: "n/a", "In (hh:mm)": "9am", "Notes": "late start"}
+    assert shift[GROSS_PAY] == "n/a" and shift["Notes"] == "late start"
+    assert json.loads(json.dumps(shift, default=encode_shift)) == shift.to_record()
+
+
+def test_replace_returns_a_new_record():
+    shift = Shift.from_dict(shift_record())
+    moved = shift.replace(project_id="P2", tasks_completed=9)
+    assert (shift.project_id, shift.tasks_completed) == ("P1", 4)
+    assert (moved.project_id, moved.tasks_completed, moved.date) == ("P2", 9, "2024-05-01")
+
+
+def test_identifiers_are_interned():
+    a = Shift.from_dict(shift_record(project="".join(["P", "roject-7"])))
+    b = Shift.from_dict(json.loads(json.dumps(shift_record(project="Project-7"))))
+    assert a.project_id is b.project_id
@@ -0,0 +1,109 @@
+import random
+import sqlite3
+
+import pytest
+
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.indexes import ShiftIndex
+from labelsmith.shyft.core.sqlite_storage import SQLiteStorage
+from tests.conftest import shift_record
+
+
+def _storage(tmp_path):
+    return SQLiteStorage(tmp_path / "data.sqlite3", import_path=None)
+
+
+def _manager(tmp_path, count=50):
+    manager = DataManager(storage=_storage(tmp_path))
+    manager.add_shifts({
+        str(i): shift_record(date=f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", model=f"M{i % 3}", project=f"P{i % 4}")
+        for i in range(1, count + 1)
+    })
+    return manager
+
+
+def test_save_writes_only_changed_rows(tmp_path):
+    manager = _manager(tmp_path)
+    storage = manager.storage
+    shifts = dict(manager.get_shifts())
+    shifts["3"] = shifts["3"].replace(project_id="P9")
+    del shifts["7"]
+
+    before = storage.conn.total_changes
+    storage.save(shifts)
+    assert storage.conn.total_changes - before == 2
+
+    reloaded = _storage(tmp_path).load()
+    assert set(reloaded) == set(shifts)
+    assert reloaded["3"].project_id == "P9"
+
+
+class FailingCommit:
+    """Wraps a connection so its transactions roll back instead of committing."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+    def __enter__(self):
+        return self.conn.__enter__()
+
+    def __exit__(self, *exc):
+        self.conn.rollback()
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_failed_commit_is_retried_by_the_next_save(tmp_path):
+    manager = _manager(tmp_path)
+    storage = manager.storage
+    shifts = dict(manager.get_shifts())
+    shifts["3"] = shifts["3"].replace(project_id="P9")
+    del shifts["7"]
+
+    storage._conn = FailingCommit(storage.conn)
+    with pytest.raises(sqlite3.OperationalError):
+        storage.save(shifts)
+    storage._conn = storage._conn.conn
+    storage.save(shifts)
+
+    reloaded = _storage(tmp_path).load()
+    assert reloaded["3"].project_id == "P9"
+    assert "7" not in reloaded
+
+
+def test_non_numeric_ids_are_stored(tmp_path):
+    manager = _manager(tmp_path, count=3)
+    manager.add_shift("imported-a", shift_record(date="2024-02-02"))
+    manager.add_shifts({"imported-b": shift_record(date="2024-02-03")})
+    assert manager.storage.get_max_shift_id() == 3
+    assert set(_storage(tmp_path).load()) == {"1", "2", "3", "imported-a", "imported-b"}
+
+
+def test_bulk_update_round_trips(tmp_path):
+    manager = _manager(tmp_path)
+    manager.update_shifts({"1": shift_record(date="2025-01-01", tasks=9)})
+    manager.delete_shifts(["2", "4"])
+    reloaded = _storage(tmp_path).load()
+    assert reloaded["1"].tasks_completed == 9
+    assert "2" not in reloaded and "4" not in reloaded
+    assert len(reloaded) == 48
+
+
+def test_data_manager_query_goes_through_sqlite(tmp_path):
+    manager = _manager(tmp_path)
+    manager.update_shift("5", shift_record(date="2024-03-03", model="M1", project="P2"))
+    manager.delete_shift("6")
+
+    index = ShiftIndex()
+    index.reset(manager.get_shifts())
+    rng = random.Random(0)
+    for _ in range(50):
+        start = rng.choice([None, "2024-02-10", "2024-06-01"])
+        end = rng.choice([None, "2024-08-15", "2024-12-31"])
+        model = rng.choice([None, "M0", "M1", "M2"])
+        project = rng.choice([None, "P0", "P2", "P3"])
+        result = manager.query(start, end, model, project)
+        assert [shift_id for shift_id, _ in result] == index.query(start, end, model, project)
+        assert all(shift.to_dict() == manager.get_shifts()[shift_id].to_dict() for shift_id, shift in result)
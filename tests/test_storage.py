@@ -0,0 +1,140 @@
+import json
+import threading
+
+import pytest
+
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.shift import Shift
+from labelsmith.shyft.core.storage import JournalStorage, JsonStorage, WriteBehindSaver
+from tests.conftest import shift_record
+
+
+def _journal(tmp_path, **kwargs):
+    return JournalStorage(tmp_path / "data.json", tmp_path / "data.journal", **kwargs)
+
+
+def _shifts(n):
+    return {str(i): Shift.from_dict(shift_record(date=f"2024-05-{i:02d}")) for i in range(1, n + 1)}
+
+
+def test_journal_replays_over_snapshot(tmp_path):
+    storage = _journal(tmp_path)
+    shifts = _shifts(3)
+    storage.save(shifts)
+    assert not storage.journal_path.exists()
+
+    shifts["4"] = Shift.from_dict(shift_record(date="2024-05-04"))
+    storage.put(shifts, "4")
+    del shifts["1"]
+    storage.delete(shifts, "1")
+    storage.close()
+
+    lines = storage.journal_path.read_text().splitlines()
+    assert [json.loads(line)["op"] for line in lines] == ["put", "del"]
+    assert json.loads(storage.path.read_text())["data"].keys() == {"1", "2", "3"}
+    assert sorted(_journal(tmp_path).load()) == ["2", "3", "4"]
+
+
+def test_torn_final_record_is_ignored(tmp_path):
+    storage = _journal(tmp_path)
+    shifts = _shifts(2)
+    storage.save(shifts)
+    shifts["3"] = Shift.from_dict(shift_record())
+    storage.put(shifts, "3")
+    storage.close()
+    with open(storage.journal_path, "a") as f:
+        f.write('{"op":"put","id":"4","shi')
+    assert sorted(_journal(tmp_path).load()) == ["1", "2", "3"]
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    storage = _journal(tmp_path, compact_threshold=512)
+    shifts = {}
+    for shift_id, shift in _shifts(20).items():
+        shifts[shift_id] = shift
+        storage.put(shifts, shift_id)
+    storage.close()
+
+    # Appends made while a compaction runs stay in the live journal.
+    assert len(storage.journal_path.read_text().splitlines()) < 20
+    assert not storage.compacting_path.exists()
+    snapshot = json.loads(storage.path.read_text())["data"]
+    assert snapshot
+    assert sorted(_journal(tmp_path).load(), key=int) == [str(i) for i in range(1, 21)]
+
+
+def test_interrupted_compaction_is_replayed_in_order(tmp_path):
+    storage = _journal(tmp_path)
+    shifts = _shifts(1)
+    storage.save(shifts)
+    # A compaction that rotated the journal but never wrote its snapshot.
+    storage.compacting_path.write_text(
+        json.dumps({"op": "put", "id": "2", "shift": shift_record(tasks=1)}) + "\n"
+    )
+    storage.journal_path.write_text(
+        json.dumps({"op": "put", "id": "2", "shift": shift_record(tasks=2)}) + "\n"
+        + json.dumps({"op": "del", "id": "1"}) + "\n"
+    )
+    shifts = _journal(tmp_path).load()
+    assert sorted(shifts) == ["2"]
+    assert shifts["2"]["Tasks completed"] == 2
+
+
+def test_data_manager_round_trip(tmp_path):
+    manager = DataManager(storage=_journal(tmp_path))
+    manager.add_shift("1", shift_record())
+    manager.update_shift("1", shift_record(tasks=7))
+    manager.add_shift("2", shift_record(date="2024-05-02"))
+    manager.delete_shift("2")
+    manager.close()
+
+    manager = DataManager(storage=_journal(tmp_path))
+    assert list(manager.get_shifts()) == ["1"]
+    assert manager.get_shifts()["1"].tasks_completed == 7
+    manager.close()
+
+
+def test_write_behind_coalesces_a_burst():
+    writes = []
+    written = threading.Event()
+    saver = WriteBehindSaver(lambda shifts: (writes.append(shifts), written.set()), delay=0.05, max_delay=5.0)
+    shifts = {}
+    for i in range(50):
+        shifts = {**shifts, str(i): i}
+        saver.mark_dirty(shifts)
+    assert written.wait(5)
+    saver.close()
+    assert len(writes) == 1
+    assert len(writes[0]) == 50
+
+
+def test_write_behind_flush_and_retry():
+    writes, fail = [], [True]
+
+    def write(shifts):
+        if fail[0]:
+            raise OSError("disk full")
+        writes.append(shifts)
+
+    saver = WriteBehindSaver(write, delay=60, max_delay=60)
+    saver.mark_dirty({"1": 1})
+    with pytest.raises(OSError):
+        saver.flush()
+    # The failed state stays pending and goes out with the next flush.
+    fail[0] = False
+    saver.flush()
+    assert writes == [{"1": 1}]
+    saver.flush()
+    assert writes == [{"1": 1}]
+    saver.close()
+
+
+def test_json_write_behind_persists_on_flush(tmp_path):
+    storage = JsonStorage(tmp_path / "data.json", write_behind=True, write_delay=60)
+    manager = DataManager(storage=storage)
+    for i in range(1, 6):
+        manager.add_shift(str(i), shift_record())
+    assert not storage.path.exists()
+    manager.flush()
+    assert sorted(json.loads(storage.path.read_text())["data"], key=int) == ["1", "2", "3", "4", "5"]
+    manager.close()
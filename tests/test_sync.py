@@ -0,0 +1,126 @@
+from labelsmith.shyft.core.data_manager import DataManager
+from labelsmith.shyft.core.storage import JsonStorage
+from labelsmith.shyft.core.sync import sync
+from tests.conftest import shift_record
+
+
+class Machine:
+    """One installation: its own data file, Markdown logs and sync state."""
+
+    def __init__(self, tmp_path, name, share):
+        root = tmp_path / name
+        self.manager = DataManager(storage=JsonStorage(root / "data.json"))
+        self.logs_dir = root / "logs"
+        self.logs_dir.mkdir(parents=True)
+        self.state_dir = root / "sync"
+        self.share = share
+
+    def sync(self, dry_run=False):
+        return sync(self.share, self.manager, logs_dir=self.logs_dir, state_dir=self.state_dir, dry_run=dry_run)
+
+    def table(self):
+        return {shift_id: shift.to_dict() for shift_id, shift in self.manager.get_shifts().items()}
+
+
+def _pair(tmp_path):
+    share = tmp_path / "share"
+    a, b = Machine(tmp_path, "a", share), Machine(tmp_path, "b", share)
+    a.manager.add_shifts({f"{i:04d}": shift_record(date=f"2024-05-{i:02d}") for i in range(1, 6)})
+    (a.logs_dir / "0001.md").write_text("# notes for 0001\n")
+    a.sync()
+    b.sync()
+    return a, b
+
+
+def test_initial_sync_copies_shifts_and_logs(tmp_path):
+    a, b = _pair(tmp_path)
+    assert b.table() == a.table()
+    assert (b.logs_dir / "0001.md").read_text() == "# notes for 0001\n"
+
+    report = a.sync()
+    assert not report.changed
+    assert report.buckets_checked == 0
+
+
+def test_one_sided_edits_and_deletes_propagate(tmp_path):
+    a, b = _pair(tmp_path)
+    a.manager.update_shift("0002", shift_record(date="2024-05-02", tasks=11))
+    b.manager.delete_shift("0003")
+
+    assert a.sync().pushed == ["0002"]
+    report = b.sync()
+    assert report.pulled == ["0002"] and report.deleted_remote == ["0003"]
+    assert a.sync().deleted_local == ["0003"]
+
+    assert a.table() == b.table()
+    assert "0003" not in a.table()
+    assert a.table()["0002"]["Tasks completed"] == "11"
+
+
+def test_delete_loses_to_a_concurrent_modification(tmp_path):
+    a, b = _pair(tmp_path)
+    a.manager.delete_shift("0004")
+    b.manager.update_shift("0004", shift_record(date="2024-05-04", tasks=7))
+
+    a.sync()  # pushes the deletion
+    report = b.sync()  # the modification beats it
+    assert report.pushed == ["0004"]
+    a.sync()
+    assert a.table() == b.table()
+    assert a.table()["0004"]["Tasks completed"] == "7"
+
+    # The deletion doesn't come back once both sides agree again.
+    assert not a.sync().changed and not b.sync().changed
+
+
+def test_deletion_of_an_unchanged_shift_sticks(tmp_path):
+    a, b = _pair(tmp_path)
+    a.manager.delete_shift("0005")
+    a.sync()
+    report = b.sync()
+    assert report.deleted_local == ["0005"]
+    # B's base now lacks 0005 too, so a later sync doesn't push it back.
+    assert not b.sync().changed
+    assert "0005" not in a.table() and "0005" not in b.table()
+
+
+def test_concurrent_modifications_resolve_the_same_everywhere(tmp_path):
+    a, b = _pair(tmp_path)
+    a.manager.update_shift("0001", shift_record(date="2024-05-01", tasks=20))
+    b.manager.update_shift("0001", shift_record(date="2024-05-01", tasks=30))
+
+    a.sync()
+    report = b.sync()
+    assert report.conflicts == ["0001"]
+    a.sync()
+    assert a.table() == b.table()
+    assert a.table()["0001"]["Tasks completed"] in ("20", "30")
+
+
+def test_same_new_id_on_both_sides_rekeys_the_local_shift(tmp_path):
+    a, b = _pair(tmp_path)
+    a.manager.add_shift("0006", shift_record(date="2024-06-01", project="from-a"))
+    b.manager.add_shift("0006", shift_record(date="2024-06-02", project="from-b"))
+    (b.logs_dir / "0006.md").write_text("b's log\n")
+
+    a.sync()
+    report = b.sync()
+    assert report.rekeyed == [("0006", "0007")]
+    a.sync()
+
+    assert a.table() == b.table()
+    assert a.table()["0006"]["Project ID"] == "from-a"
+    assert a.table()["0007"]["Project ID"] == "from-b"
+    assert (a.logs_dir / "0007.md").read_text() == "b's log\n"
+    assert not (b.logs_dir / "0006.md").exists()
+
+
+def test_dry_run_changes_nothing(tmp_path):
+    a, b = _pair(tmp_path)
+    b.manager.update_shift("0002", shift_record(date="2024-05-02", tasks=5))
+    before = a.table()
+    report = b.sync(dry_run=True)
+    assert report.pushed == ["0002"]
+    assert b.sync(dry_run=True).pushed == ["0002"]
+    a.sync()
+    assert a.table() == before
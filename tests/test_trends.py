@@ -0,0 +1,136 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from labelsmith.shyft.core.shift import Shift
+from labelsmith.utils.columnar import AVG_TIME_PER_TASK, DATE, GROSS_PAY, TASKS_COMPLETED, build_frame, daily_frame
+from labelsmith.utils.trends import ROLLING_COLUMNS, TrendEngine
+from tests.conftest import shift_record
+
+# Every third day over three months, so there is room to insert days in between.
+DAYS = [d.strftime("%Y-%m-%d") for d in pd.date_range("2024-03-01", periods=30, freq="3D")]
+
+
+def _expected(records, window):
+    daily = daily_frame(build_frame(records))
+    daily = daily[daily.index.notna()]
+    expected = pd.DataFrame({
+        DATE: daily.index.to_numpy(),
+        TASKS_COMPLETED: daily[TASKS_COMPLETED].to_numpy(dtype="int64"),
+        AVG_TIME_PER_TASK: daily[AVG_TIME_PER_TASK].to_numpy(),
+        GROSS_PAY: daily[GROSS_PAY].to_numpy(),
+    })
+    for column, rolling in ROLLING_COLUMNS.items():
+        expected[rolling] = daily[column].rolling(window, min_periods=1).mean().to_numpy()
+    return expected
+
+
+def _assert_trends(engine, records, windows=None):
+    for window in windows or engine.windows:
+        pd.testing.assert_frame_equal(engine.trend(window), _expected(records, window))
+
+
+def _record(rng, date):
+    return shift_record(
+        date=date,
+        hours=rng.choice(["0.00", "0.50", "1.25", "3.00"]),
+        pay=rng.choice([None, "10.00", "25.50", "60.00"]),
+        tasks=rng.choice([0, 1, 3, 8]),
+    )
+
+
+class Engine:
+    """A TrendEngine fed like DataManager feeds it, next to the raw records."""
+
+    def __init__(self, records, windows=(3, 7)):
+        self.records = dict(records)
+        self.engine = TrendEngine(windows)
+        self.engine.reset({shift_id: Shift.from_dict(record) for shift_id, record in self.records.items()})
+
+    def put(self, shift_id, record):
+        old = self.records.get(shift_id)
+        self.records[shift_id] = record
+        self.engine.put(shift_id, None if old is None else Shift.from_dict(old), Shift.from_dict(record))
+
+    def delete(self, shift_id):
+        self.engine.delete(shift_id, Shift.from_dict(self.records.pop(shift_id)))
+
+    def check(self, windows=None):
+        _assert_trends(self.engine, self.records, windows)
+
+
+@pytest.fixture
+def engine():
+    rng = random.Random(0)
+    return Engine({str(i): _record(rng, day) for i, day in enumerate(DAYS, start=1)})
+
+
+def test_reset_matches_rolling_mean(engine):
+    engine.check([1, 3, 7, 30, 60])
+
+
+def test_days_inserted_and_deleted(engine):
+    rng = random.Random(1)
+    # A new day in the middle shifts every later window.
+    engine.put("100", _record(rng, "2024-03-05"))
+    engine.check()
+    # A second shift on that day changes just its row and the next windows.
+    engine.put("101", _record(rng, "2024-03-05"))
+    engine.check()
+    # A new latest day.
+    engine.put("102", _record(rng, "2024-07-01"))
+    engine.check()
+    # Removing the only shift of a middle day removes the day.
+    engine.delete("10")
+    engine.check()
+    # Removing the latest day.
+    engine.delete("102")
+    engine.check()
+    # Moving a shift to another day, and a shift with no date.
+    engine.put("5", _record(rng, "2024-03-02"))
+    engine.put("103", _record(rng, None))
+    engine.check()
+
+
+def test_add_window(engine):
+    engine.put("100", _record(random.Random(2), "2024-03-05"))
+    engine.engine.add_window(5)
+    assert engine.engine.windows == [3, 5, 7]
+    engine.check([5])
+    # The new window is maintained like the others from then on.
+    engine.put("101", _record(random.Random(3), "2024-03-20"))
+    engine.delete("3")
+    engine.check([3, 5, 7])
+    # trend() adds a window it hasn't seen.
+    engine.check([12])
+    assert 12 in engine.engine.windows
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_edits_match_rolling_mean(engine, seed):
+    rng = random.Random(seed)
+    for step in range(150):
+        if rng.random() < 0.35 and engine.records:
+            engine.delete(rng.choice(sorted(engine.records)))
+        else:
+            day = rng.choice(DAYS + ["2024-02-28", "2024-03-02", "2024-06-15", "2024-09-01"])
+            engine.put(str(rng.randrange(80)), _record(rng, day))
+        if step % 30 == 0:
+            engine.check()
+    engine.check([1, 3, 7, 10])
+    for shift_id in sorted(engine.records):
+        engine.delete(shift_id)
+    trend = engine.engine.trend(7)
+    assert trend.empty
+    assert np.isnan(trend[list(ROLLING_COLUMNS.values())].to_numpy()).all()
+
+
+def test_reset_daily_matches_reset(engine):
+    seeded = TrendEngine(engine.engine.windows)
+    seeded.reset_daily(daily_frame(build_frame(engine.records)))
+    assert all(type(bucket[4]) is int for bucket in seeded._buckets)
+    assert seeded._buckets == engine.engine._buckets
+    for window in engine.engine.windows:
+        pd.testing.assert_frame_equal(seeded.trend(window), engine.engine.trend(window))